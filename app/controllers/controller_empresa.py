@@ -1,17 +1,22 @@
 from fastapi import HTTPException, status
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from app.models.empresas_model import (
     Empresa, EmpresaCreate, EmpresaUpdate
 )
 from app.controllers.token import TokenPayLoad
 from app.repository import empresa_repository as repo_empresa
 from app.repository import ibdn_user_repository
+from app.repository.versoes_repository import repo_get_versoes_empresa
+from app.service.etag import montar_etag
+from app.service.serializacao import validar_lista
 
 
-def get_empresas() -> List[Empresa]:
+def get_empresas(limit: int, cursor: Optional[str] = None) -> Tuple[List[Empresa], Optional[str]]:
     try:
-        empresas_db = repo_empresa.repo_get_all_empresas()
-        return [Empresa(**empresa) for empresa in empresas_db]
+        empresas_db, proximo_cursor = repo_empresa.repo_get_all_empresas(limit, cursor)
+        return validar_lista(Empresa, empresas_db), proximo_cursor
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -54,6 +59,21 @@ def get_empresa_por_id(empresa_id: int, current_user: TokenPayLoad) -> Empresa:
         )
 
 
+def get_etag_empresa(empresa_id: int, current_user: TokenPayLoad) -> Optional[Tuple[str, Any]]:
+    # Consulta só a versão (PK + contadores); a empresa inteira é carregada
+    # apenas se o cliente não tiver a versão atual.
+    versoes = repo_get_versoes_empresa(empresa_id)
+    if not versoes:
+        return None
+    is_admin = bool(set(current_user.permissoes).intersection({"admin", "admin_master"}))
+    if not is_admin and versoes['usuario_id'] != current_user.usuario_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Você não tem permissão para acessar os dados desta empresa."
+        )
+    return montar_etag("empresa", empresa_id, versoes['atualizado_em']), versoes['atualizado_em']
+
+
 def criar_empresa(empresa_data: EmpresaCreate, current_user: TokenPayLoad) -> Dict[str, Any]:
     permissoes_usuario = set(current_user.permissoes)
     is_admin = bool(permissoes_usuario.intersection({"admin", "admin_master"}))
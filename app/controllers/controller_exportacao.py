@@ -0,0 +1,74 @@
+import csv
+import io
+from datetime import datetime
+from typing import AsyncIterator, Iterator, List, Tuple
+
+import anyio
+import orjson
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+
+from app.repository.exportacao_repository import COLUNAS_BOOLEANAS, CursorExportacao
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def _normalizador(colunas: Tuple[str, ...]):
+    booleanas = [i for i, c in enumerate(colunas) if c in COLUNAS_BOOLEANAS]
+
+    def normalizar(linha: tuple) -> list:
+        linha = list(linha)
+        for i in booleanas:
+            if linha[i] is not None:
+                linha[i] = bool(linha[i])
+        return linha
+    return normalizar
+
+
+def _ndjson(colunas: Tuple[str, ...], lotes: Iterator[List[tuple]]) -> Iterator[bytes]:
+    normalizar = _normalizador(colunas)
+    for lote in lotes:
+        yield b"".join(
+            orjson.dumps(dict(zip(colunas, normalizar(linha))), option=orjson.OPT_APPEND_NEWLINE)
+            for linha in lote)
+
+
+def _csv(colunas: Tuple[str, ...], lotes: Iterator[List[tuple]]) -> Iterator[bytes]:
+    normalizar = _normalizador(colunas)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(colunas)
+    for lote in lotes:
+        writer.writerows(normalizar(linha) for linha in lote)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+
+async def _transmitir(partes: Iterator[bytes], cursor: CursorExportacao) -> AsyncIterator[bytes]:
+    # Cada lote é lido do banco numa thread do pool; se o cliente desconectar,
+    # o gerador é fechado na hora (descartando a conexão com resultado
+    # pendente) em vez de esperar o coletor de lixo.
+    try:
+        async for parte in iterate_in_threadpool(partes):
+            yield parte
+    finally:
+        with anyio.CancelScope(shield=True):
+            await run_in_threadpool(partes.close)
+            await run_in_threadpool(cursor.fechar)
+
+
+def exportar(recurso: str, formato: str) -> StreamingResponse:
+    cursor = CursorExportacao(recurso)
+    gerar = _ndjson if formato == "ndjson" else _csv
+    nome_arquivo = f"{recurso}-{datetime.now():%Y%m%d-%H%M%S}.{formato}"
+    return StreamingResponse(
+        _transmitir(gerar(cursor.colunas, cursor.lotes()), cursor),
+        media_type=FORMATOS[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo}"'},
+    )
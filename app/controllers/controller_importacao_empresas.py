@@ -0,0 +1,200 @@
+import csv
+import io
+import os
+import re
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+import orjson
+from fastapi import UploadFile
+from mysql.connector import Error
+from pydantic import ValidationError
+
+from app.models.empresas_model import (
+    EmpresaImportacao,
+    EmpresaImportada,
+    ErroImportacao,
+    ResultadoImportacao,
+)
+from app.repository.importacao_empresas_repository import ImportadorEmpresas
+from app.repository.ramos_repository import get_ids_ramos
+from app.service.cnpj import validar_cnpjs
+
+IMPORTACAO_LOTE = int(os.getenv("IMPORTACAO_LOTE", 500))
+# Aplicado ao corpo da requisição em main.py (LimiteCorpoMiddleware): quando a
+# rota roda, o multipart já foi todo recebido e gravado em disco.
+IMPORTACAO_MAX_BYTES = int(os.getenv("IMPORTACAO_MAX_BYTES", 50 * 1024 * 1024))
+
+CAMPOS_ENDERECO = ("logradouro", "numero", "bairro", "cep", "cidade", "uf", "complemento")
+_SEPARADOR_RAMOS = re.compile(r"[;|,\s]+")
+
+# Cada item é (número da linha no arquivo, registro ou mensagem de erro de leitura).
+Registro = Tuple[int, Union[Dict[str, Any], str]]
+
+
+def _normalizar(registro: Dict[str, Any]) -> Dict[str, Any]:
+    # CSV (e NDJSON "achatado") trazem o endereço em colunas soltas e os ramos
+    # como "1;3;5"; o modelo espera `endereco` aninhado e `ramos` em lista.
+    registro = {
+        chave.strip(): valor.strip() if isinstance(valor, str) else valor
+        for chave, valor in registro.items() if chave
+    }
+    registro = {chave: valor for chave, valor in registro.items() if valor not in ("", None)}
+    if "endereco" not in registro:
+        endereco = {campo: registro.pop(campo) for campo in CAMPOS_ENDERECO if campo in registro}
+        if endereco:
+            registro["endereco"] = endereco
+    if isinstance(registro.get("ramos"), str):
+        registro["ramos"] = [r for r in _SEPARADOR_RAMOS.split(registro["ramos"]) if r]
+    return registro
+
+
+def _ler_csv(arquivo) -> Iterator[Registro]:
+    texto = io.TextIOWrapper(arquivo, encoding="utf-8-sig", newline="")
+    leitor = csv.DictReader(texto)
+    try:
+        if not leitor.fieldnames:
+            return
+        for linha in leitor:
+            yield leitor.line_num, _normalizar(linha)
+    except (csv.Error, UnicodeDecodeError) as e:
+        yield leitor.line_num, f"Arquivo CSV inválido a partir desta linha: {e}"
+    finally:
+        texto.detach()
+
+
+def _ler_ndjson(arquivo) -> Iterator[Registro]:
+    for numero, linha in enumerate(arquivo, start=1):
+        if not linha.strip():
+            continue
+        try:
+            registro = orjson.loads(linha)
+        except orjson.JSONDecodeError as e:
+            yield numero, f"JSON inválido: {e}"
+            continue
+        if not isinstance(registro, dict):
+            yield numero, "A linha não é um objeto JSON."
+            continue
+        yield numero, _normalizar(registro)
+
+
+def _formato(arquivo: UploadFile, formato: Optional[str]) -> str:
+    if formato:
+        return formato
+    nome = (arquivo.filename or "").lower()
+    tipo = (arquivo.content_type or "").lower()
+    if nome.endswith((".ndjson", ".jsonl")) or "ndjson" in tipo or "jsonl" in tipo:
+        return "ndjson"
+    return "csv"
+
+
+def _mensagens(erro: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(p) for p in e['loc'])}: {e['msg']}" for e in erro.errors()]
+
+
+class _Importacao:
+    def __init__(self, importador: ImportadorEmpresas, validar_apenas: bool):
+        self.importador = importador
+        self.validar_apenas = validar_apenas
+        self.ids_ramos = get_ids_ramos()
+        self.cnpjs_vistos: Dict[str, int] = {}
+        self.usuarios_vistos: Dict[str, int] = {}
+        self.total = 0
+        self.importadas: List[EmpresaImportada] = []
+        self.erros: List[ErroImportacao] = []
+
+    def _erro(self, linha: int, mensagens: List[str], cnpj: Optional[str] = None) -> None:
+        self.erros.append(ErroImportacao(linha=linha, cnpj=cnpj, erros=mensagens))
+
+    def processar_lote(self, registros: List[Registro]) -> None:
+        self.total += len(registros)
+        validos: List[Tuple[int, EmpresaImportacao]] = []
+        for linha, registro in registros:
+            if isinstance(registro, str):
+                self._erro(linha, [registro])
+                continue
+            try:
+                validos.append((linha, EmpresaImportacao.model_validate(registro)))
+            except ValidationError as e:
+                cnpj = registro.get("cnpj")
+                self._erro(linha, _mensagens(e), str(cnpj) if cnpj is not None else None)
+
+        cnpj_ok = validar_cnpjs([e.cnpj for _, e in validos]) if validos else []
+        candidatos: List[Tuple[int, EmpresaImportacao]] = []
+        for (linha, empresa), dv_ok in zip(validos, cnpj_ok):
+            problemas = []
+            if not dv_ok:
+                problemas.append("cnpj: dígitos verificadores inválidos")
+            ramos_invalidos = sorted(set(empresa.ramos) - self.ids_ramos)
+            if ramos_invalidos:
+                problemas.append(f"ramos: ids inexistentes {ramos_invalidos}")
+            if empresa.cnpj in self.cnpjs_vistos:
+                problemas.append(f"cnpj: repetido no arquivo (linha {self.cnpjs_vistos[empresa.cnpj]})")
+            if empresa.usuario_id in self.usuarios_vistos:
+                problemas.append(
+                    f"usuario_id: repetido no arquivo (linha {self.usuarios_vistos[empresa.usuario_id]})")
+            self.cnpjs_vistos.setdefault(empresa.cnpj, linha)
+            self.usuarios_vistos.setdefault(empresa.usuario_id, linha)
+            if problemas:
+                self._erro(linha, problemas, empresa.cnpj)
+            else:
+                candidatos.append((linha, empresa))
+        if not candidatos:
+            return
+
+        cadastrados = self.importador.cnpjs_cadastrados(e.cnpj for _, e in candidatos)
+        usuarios = [e.usuario_id for _, e in candidatos]
+        existentes = self.importador.usuarios_existentes(usuarios)
+        com_empresa = self.importador.usuarios_com_empresa(usuarios)
+
+        aprovados: List[Tuple[int, EmpresaImportacao]] = []
+        for linha, empresa in candidatos:
+            problemas = []
+            if empresa.cnpj in cadastrados:
+                problemas.append("cnpj: já cadastrado")
+            if empresa.usuario_id not in existentes:
+                problemas.append("usuario_id: usuário não encontrado")
+            elif empresa.usuario_id in com_empresa:
+                problemas.append("usuario_id: usuário já associado a uma empresa")
+            if problemas:
+                self._erro(linha, problemas, empresa.cnpj)
+            else:
+                aprovados.append((linha, empresa))
+        if not aprovados or self.validar_apenas:
+            return
+
+        try:
+            ids = self.importador.gravar_lote([e for _, e in aprovados])
+        except Error as e:
+            for linha, empresa in aprovados:
+                self._erro(linha, [f"lote não gravado: {e.msg}"], empresa.cnpj)
+            return
+        self.importadas.extend(
+            EmpresaImportada(linha=linha, id=ids[empresa.cnpj], cnpj=empresa.cnpj)
+            for linha, empresa in aprovados)
+
+    def resultado(self) -> ResultadoImportacao:
+        self.erros.sort(key=lambda e: e.linha)
+        return ResultadoImportacao(
+            total_linhas=self.total,
+            importadas=len(self.importadas),
+            com_erro=len(self.erros),
+            validar_apenas=self.validar_apenas,
+            empresas=self.importadas,
+            erros=self.erros,
+        )
+
+
+def importar_empresas(arquivo: UploadFile, formato: Optional[str] = None,
+                      validar_apenas: bool = False) -> ResultadoImportacao:
+    ler = _ler_ndjson if _formato(arquivo, formato) == "ndjson" else _ler_csv
+    importador = ImportadorEmpresas()
+    try:
+        importacao = _Importacao(importador, validar_apenas)
+        # O arquivo é lido e validado aos poucos: no máximo um lote em memória.
+        registros = ler(arquivo.file)
+        while lote := list(islice(registros, IMPORTACAO_LOTE)):
+            importacao.processar_lote(lote)
+        return importacao.resultado()
+    finally:
+        importador.fechar()
@@ -1,18 +1,17 @@
 from fastapi import HTTPException, status
 from app.controllers.token import gerar_token
-from app.repository.ibdn_user_repository import repo_get_ibdn_usuario_by_email
-from app.security.password import verify_password
+from app.repository.backend import users_repo
+from app.security.password import verify_password_async
 
 
-def login(email_route: str, senha: str):
+async def login(email_route: str, senha: str):
     if not email_route or not senha:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email e senha são obrigatórios."
         )
 
-    usuario = repo_get_ibdn_usuario_by_email(
-        email_route, include_password_hash=True)
+    usuario = await users_repo.repo_get_login_credenciais(email_route)
 
     if not usuario:
         raise HTTPException(
@@ -21,7 +20,7 @@ def login(email_route: str, senha: str):
         )
 
     senha_hash = usuario.get("senha_hash")
-    if not senha_hash or not verify_password(senha, senha_hash):
+    if not senha_hash or not await verify_password_async(senha, senha_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Credenciais inválidas."
@@ -29,13 +28,7 @@ def login(email_route: str, senha: str):
 
     usuario_id = usuario.get('id')
     empresa_id = usuario.get('empresa_id')
-    permissoes_do_usuario = []
-
-    perfil_do_usuario = usuario.get("perfil")
-    if perfil_do_usuario and perfil_do_usuario.get("permissoes"):
-        permissoes_do_usuario = [
-            p.get("nome") for p in perfil_do_usuario["permissoes"] if p.get("nome")
-        ]
+    permissoes_do_usuario = usuario.get("permissoes", [])
 
     jwt = gerar_token(
         email=email_route,
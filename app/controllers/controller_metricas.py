@@ -0,0 +1,46 @@
+import hmac
+import os
+from typing import Optional
+
+from fastapi import HTTPException, status
+
+from app.controllers.token import get_token_cache_stats
+from app.database.config import get_pool_stats
+from app.repository.ibdn_profiles_repository import get_perfis_cache_stats
+from app.repository.ramos_repository import get_ramos_cache_stats
+from app.repository.selos_repository import get_selos_cache_stats
+from app.security.password import get_password_hasher_stats
+from app.service.metricas import coletor, exportar_estatisticas
+from app.service.notificacoes_hub import get_notificacoes_hub_stats
+from app.service.scheduler import get_scheduler_stats
+
+# Vazio: /metrics aberto (proteja na rede/proxy). Definido: o coletor precisa
+# enviar "Authorization: Bearer <token>".
+METRICAS_TOKEN = os.getenv("METRICAS_TOKEN", "")
+
+
+def verificar_acesso_metricas(authorization: Optional[str]) -> None:
+    if not METRICAS_TOKEN:
+        return
+    esperado = f"Bearer {METRICAS_TOKEN}"
+    if not authorization or not hmac.compare_digest(authorization.encode(), esperado.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de métricas inválido",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+
+def gerar_metricas() -> str:
+    linhas = coletor.exportar()
+    linhas += exportar_estatisticas({
+        "db_pool": get_pool_stats(),
+        "cache_selos": get_selos_cache_stats(),
+        "cache_ramos": get_ramos_cache_stats(),
+        "cache_perfis": get_perfis_cache_stats(),
+        "cache_tokens": get_token_cache_stats(),
+        "password_hasher": get_password_hasher_stats(),
+        "notificacoes": get_notificacoes_hub_stats(),
+        "scheduler": get_scheduler_stats(),
+    })
+    return "\n".join(linhas) + "\n"
@@ -1,18 +1,91 @@
+import asyncio
+import os
+import time
 from fastapi import HTTPException, status
-from typing import Optional, List
-from app.models.notificacao_model import Notificacao, NotificacaoCreate, NotificacaoUpdate
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional, List, Tuple
+import orjson
+from app.models.notificacao_model import Notificacao, NotificacaoCreate, NotificacaoUpdate, NotificacoesNaoLidas, TicketStream
 from app.repository import notificacao_repository as repo
-from app.controllers.token import TokenPayLoad
+from app.controllers.token import TokenPayLoad, gerar_ticket_stream
+from app.repository.versoes_repository import repo_get_versoes_empresa
+from app.service.etag import montar_etag
+from app.service.notificacoes_hub import hub
+from app.service.serializacao import validar_lista
 
-def get_notificacoes_empresa(empresa_id: int, current_user: TokenPayLoad, lida: Optional[bool] = None) -> List[Notificacao]:
+def _verificar_acesso_notificacoes(empresa_id: int, current_user: TokenPayLoad) -> None:
     is_admin = "admin" in current_user.permissoes or "admin_master" in current_user.permissoes
     if not is_admin and current_user.empresa_id != empresa_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Você não tem permissão para visualizar as notificações desta empresa."
         )
-    notificacoes_db = repo.get_notificacoes_by_empresa(empresa_id, lida)
-    return [Notificacao(**notificacao) for notificacao in notificacoes_db]
+
+def get_etag_notificacoes_empresa(empresa_id: int, current_user: TokenPayLoad, lida: Optional[bool] = None, limit: int = 100, cursor: Optional[str] = None) -> Optional[str]:
+    _verificar_acesso_notificacoes(empresa_id, current_user)
+    versoes = repo_get_versoes_empresa(empresa_id)
+    if not versoes:
+        return None
+    return montar_etag("notificacoes", empresa_id, versoes['versao_notificacoes'], lida, limit, cursor)
+
+def get_notificacoes_empresa(empresa_id: int, current_user: TokenPayLoad, lida: Optional[bool] = None, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Notificacao], Optional[str]]:
+    _verificar_acesso_notificacoes(empresa_id, current_user)
+    notificacoes_db, proximo_cursor = repo.get_notificacoes_by_empresa(empresa_id, lida, limit, cursor)
+    return validar_lista(Notificacao, notificacoes_db), proximo_cursor
+
+def get_nao_lidas_empresa(empresa_id: int, current_user: TokenPayLoad) -> NotificacoesNaoLidas:
+    _verificar_acesso_notificacoes(empresa_id, current_user)
+    nao_lidas = repo.contar_nao_lidas(empresa_id)
+    if nao_lidas is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Empresa não encontrada")
+    return NotificacoesNaoLidas(id_empresa=empresa_id, nao_lidas=nao_lidas)
+
+def reconciliar_nao_lidas(empresa_id: Optional[int] = None) -> dict:
+    repo.reconciliar_contadores_nao_lidas(empresa_id)
+    return {"mensagem": "Contadores de notificações não lidas recalculados com sucesso"}
+
+# Comentário periódico: mantém a conexão viva em proxies com timeout de
+# inatividade e faz a desconexão do cliente ser percebida.
+NOTIFICACOES_HEARTBEAT = float(os.getenv("NOTIFICACOES_HEARTBEAT", 15))
+NOTIFICACOES_RETRY_MS = 5000
+
+def _evento_sse(sequencia: int, evento: dict) -> bytes:
+    return (f"id: {sequencia}\nevent: {evento.get('evento', 'mensagem')}\ndata: ".encode()
+            + orjson.dumps(evento) + b"\n\n")
+
+async def _eventos_empresa(empresa_id: int, expira_em: float) -> AsyncIterator[bytes]:
+    # O token só é verificado ao abrir o stream; ao chegar no `exp` dele a
+    # conexão é encerrada e o cliente precisa reconectar com um token novo.
+    async with hub.assinar(empresa_id) as fila:
+        yield f"retry: {NOTIFICACOES_RETRY_MS}\n\n".encode()
+        sequencia = 0
+        yield _evento_sse(sequencia, {"evento": "conectado", "id_empresa": empresa_id})
+        while True:
+            restante = expira_em - time.time()
+            if restante <= 0:
+                yield _evento_sse(sequencia + 1, {"evento": "token_expirado"})
+                return
+            try:
+                evento = await asyncio.wait_for(fila.get(), min(NOTIFICACOES_HEARTBEAT, restante))
+            except asyncio.TimeoutError:
+                if expira_em > time.time():
+                    yield b": ping\n\n"
+                continue
+            sequencia += 1
+            yield _evento_sse(sequencia, evento)
+
+def emitir_ticket_stream(empresa_id: int, current_user: TokenPayLoad) -> TicketStream:
+    _verificar_acesso_notificacoes(empresa_id, current_user)
+    ticket, expira_em = gerar_ticket_stream(current_user, empresa_id)
+    return TicketStream(ticket=ticket, expira_em=expira_em)
+
+def transmitir_notificacoes_empresa(empresa_id: int, current_user: TokenPayLoad) -> StreamingResponse:
+    _verificar_acesso_notificacoes(empresa_id, current_user)
+    return StreamingResponse(
+        _eventos_empresa(empresa_id, current_user.exp),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 def criar_notificacao_empresa(empresa_id: int, notificacao: NotificacaoCreate) -> dict:
     notificacao_id = repo.create_notificacao(empresa_id, notificacao.model_dump())
@@ -1,14 +1,19 @@
 import mysql.connector
 from fastapi import HTTPException
 from app.database.config import get_db_config
-from typing import List
+from typing import List, Optional
 from app.models.model_ramo import RamoBase,RamoCreate, RamoUpdate, RamoResponse
-from app.repository.ramos_repository import get_ramos, get_ramo_by_id,create_ramo, update_ramo,delete_ramo
+from app.repository.ramos_repository import get_ramos, get_ramo_by_id,create_ramo, update_ramo,delete_ramo, get_ramos_versao
+from app.service.etag import montar_etag
 
-def controller_get_ramos():
+def controller_get_etag_ramos(limit: int, cursor: Optional[str] = None) -> str:
+    return montar_etag("ramos", get_ramos_versao(), limit, cursor)
+
+def controller_get_ramos(limit: int, cursor: Optional[str] = None):
     try:
-        ramos = get_ramos()
-        return ramos
+        return get_ramos(limit, cursor)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=403, detail=f"Erro ao acessar banco: {e}")
     
@@ -1,8 +1,11 @@
 from fastapi import HTTPException, status
-from typing import List
-from app.models.selo_model import SeloCreate, SeloUpdate, SeloInDB, ConcederSeloRequest, SeloConcedido, SolicitarSeloRequest
+from typing import List, Optional, Tuple
+from app.models.selo_model import SeloCreate, SeloUpdate, SeloInDB, ConcederSeloRequest, SeloConcedido, SolicitarSeloRequest, ProcessarSolicitacoesLoteRequest, ProcessarSolicitacoesLoteResponse
 from app.repository import selos_repository as repo
 from app.controllers.token import TokenPayLoad
+from app.repository.versoes_repository import repo_get_versoes_empresa
+from app.service.etag import montar_etag
+from app.service.serializacao import validar_lista
 
 
 def criar_tipo_selo(data: SeloCreate) -> SeloInDB:
@@ -18,6 +21,10 @@ def listar_tipos_selo() -> List[SeloInDB]:
     return [SeloInDB(**selo) for selo in selos_db]
 
 
+def get_etag_catalogo_selos() -> str:
+    return montar_etag("selos-catalogo", repo.repo_versao_catalogo_selos())
+
+
 def conceder_selo_a_empresa(id_empresa: int, data: ConcederSeloRequest) -> dict:
     try:
         return repo.repo_conceder_selo_empresa(id_empresa, data.id_selo, data.dias_validade)
@@ -25,7 +32,7 @@ def conceder_selo_a_empresa(id_empresa: int, data: ConcederSeloRequest) -> dict:
         raise e
 
 
-def listar_selos_de_empresa(id_empresa: int, current_user: TokenPayLoad) -> List[SeloConcedido]:
+def _verificar_acesso_selos_empresa(id_empresa: int, current_user: TokenPayLoad) -> None:
     is_admin = "admin" in current_user.permissoes or "admin_master" in current_user.permissoes
     if not is_admin and current_user.empresa_id != id_empresa:
         raise HTTPException(
@@ -33,12 +40,26 @@ def listar_selos_de_empresa(id_empresa: int, current_user: TokenPayLoad) -> List
             detail="Você não tem permissão para visualizar os selos desta empresa."
         )
 
-    selos_db = repo.repo_listar_selos_da_empresa(id_empresa)
-    return [SeloConcedido(**selo) for selo in selos_db]
 
-def listar_solicitacoes_pendentes() -> List[SeloConcedido]:
-    solicitacoes_db = repo.repo_listar_solicitacoes_pendentes()
-    return [SeloConcedido(**solicitacao) for solicitacao in solicitacoes_db]
+def get_etag_selos_de_empresa(id_empresa: int, current_user: TokenPayLoad, limit: int, cursor: Optional[str] = None) -> Optional[str]:
+    _verificar_acesso_selos_empresa(id_empresa, current_user)
+    versoes = repo_get_versoes_empresa(id_empresa)
+    if not versoes:
+        return None
+    # A lista traz nome/sigla do catálogo e a razão social da empresa.
+    return montar_etag("selos-empresa", id_empresa, versoes['versao_selos'], versoes['atualizado_em'],
+                       repo.repo_versao_catalogo_selos(), limit, cursor)
+
+
+def listar_selos_de_empresa(id_empresa: int, current_user: TokenPayLoad, limit: int, cursor: Optional[str] = None) -> Tuple[List[SeloConcedido], Optional[str]]:
+    _verificar_acesso_selos_empresa(id_empresa, current_user)
+
+    selos_db, proximo_cursor = repo.repo_listar_selos_da_empresa(id_empresa, limit, cursor)
+    return validar_lista(SeloConcedido, selos_db), proximo_cursor
+
+def listar_solicitacoes_pendentes(limit: int, cursor: Optional[str] = None) -> Tuple[List[SeloConcedido], Optional[str]]:
+    solicitacoes_db, proximo_cursor = repo.repo_listar_solicitacoes_pendentes(limit, cursor)
+    return validar_lista(SeloConcedido, solicitacoes_db), proximo_cursor
 
 
 def aprovar_selo_concedido(empresa_selo_id: int) -> dict:
@@ -67,6 +88,11 @@ def recusar_selo_concedido(empresa_selo_id: int) -> dict:
         )
     return {"message": "Solicitação de selo recusada com sucesso."}
 
+def processar_solicitacoes_em_lote(data: ProcessarSolicitacoesLoteRequest) -> ProcessarSolicitacoesLoteResponse:
+    resultados = repo.repo_processar_solicitacoes_em_lote(data.ids, data.acao)
+    processados = sum(1 for r in resultados if r["resultado"] in ("aprovado", "recusado"))
+    return ProcessarSolicitacoesLoteResponse(processados=processados, resultados=resultados)
+
 def solicitar_renovacao_de_selo(empresa_selo_id: int, current_user: TokenPayLoad) -> dict:
     selo_concedido = repo.repo_get_empresa_selo_por_id(empresa_selo_id)
     if not selo_concedido:
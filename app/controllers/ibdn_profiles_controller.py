@@ -1,4 +1,4 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 from app.repository import ibdn_profiles_repository as repo_profiles
 from app.repository import ibdn_permissions_repository as repo_perms
@@ -27,8 +27,8 @@ def get_perfil(perfil_id: str) -> Optional[Dict[str, Any]]:
     return db_perfil
 
 
-def get_all_perfis(skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
-    return repo_profiles.repo_get_all_ibdn_perfis_with_permissions(skip=skip, limit=limit)
+def get_all_perfis(skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    return repo_profiles.repo_get_all_ibdn_perfis_with_permissions(skip=skip, limit=limit, cursor_token=cursor)
 
 
 def update_perfil(perfil_id: str, perfil_update_data: IbdnPerfilUpdate) -> Optional[Dict[str, Any]]:
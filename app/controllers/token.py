@@ -1,20 +1,44 @@
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, status, Depends, Path, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from pydantic import BaseModel, ValidationError
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, ValidationError
+from typing import Optional, List, Tuple
 import jwt
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta, timezone
 import os
+from app.repository.notificacao_repository import consumir_ticket_stream
+from app.service.cache import TTLCache
 
 security = HTTPBearer()
+# EventSource (SSE) no navegador não envia cabeçalhos: o stream aceita, na
+# query, apenas um ticket curto e de uso único (nunca o token de acesso, que
+# acabaria em logs de acesso, proxies e histórico do navegador).
+security_opcional = HTTPBearer(auto_error=False)
 
 SECRET_KEY = os.getenv("SECRET_KEY", "uma-chave-padrao-para-desenvolvimento")
 if SECRET_KEY == "uma-chave-padrao-para-desenvolvimento":
     print("AVISO: Usando chave secreta de desenvolvimento. Defina a variável de ambiente SECRET_KEY em produção.")
 ALGORITHM = "HS256"
+NOTIFICACOES_TICKET_TTL = int(os.getenv("NOTIFICACOES_TICKET_TTL", 30))
+# O `aud` separa os tickets dos tokens de acesso: o PyJWT recusa um token com
+# `aud` quando nenhuma audiência é esperada, e vice-versa.
+_AUDIENCIA_TICKET = "notificacoes_stream"
+
+# Tokens já verificados, indexados pelo SHA-256 do JWT; cada entrada expira no
+# `exp` do próprio token, então o cache nunca prolonga a validade de um token.
+_token_cache = TTLCache(
+    maxsize=int(os.getenv("TOKEN_CACHE_MAXSIZE", 10000)),
+    ttl=float(os.getenv("TOKEN_CACHE_TTL", 300)),
+    name="tokens"
+)
 
 
 class TokenPayLoad(BaseModel):
+    # Imutável: a mesma instância é reaproveitada entre requisições pelo cache.
+    model_config = ConfigDict(frozen=True)
+
     email: str
     usuario_id: str
     empresa_id: Optional[int] = None
@@ -44,16 +68,24 @@ def gerar_token(email: str, usuario_id: str, permissoes: List[str], empresa_id:
         'iat': datetime.now(timezone.utc),
         'exp': datetime.now(timezone.utc) + timedelta(days=1),
     }
-    jwt_token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
-    print(f"Token gerado para o usuário {email}: {jwt_token}")
-    return jwt_token
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
 
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenPayLoad:
-    token = credentials.credentials
+def get_token_cache_stats() -> dict:
+    return _token_cache.stats()
+
+
+def _usuario_do_token(token: str) -> TokenPayLoad:
+    chave = hashlib.sha256(token.encode()).digest()
+    agora = time.time()
+    token_data = _token_cache.get(chave)
+    if token_data is not None and token_data.exp > agora:
+        return token_data
     try:
         payload = verificar_token(token)
         token_data = TokenPayLoad(**payload)
+        _token_cache.set(chave, token_data, ttl=min(
+            token_data.exp - agora, _token_cache.ttl))
         return token_data
     except ValidationError as e:
         raise HTTPException(
@@ -69,19 +101,74 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         )
 
 
-def require_permission(*permissoes_necessarias: str):
-    def permission_checker(current_user: TokenPayLoad = Depends(get_current_user)) -> dict:
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> TokenPayLoad:
+    return _usuario_do_token(credentials.credentials)
+
+
+def gerar_ticket_stream(usuario: TokenPayLoad, empresa_id: int) -> Tuple[str, int]:
+    # Vale só para o stream desta empresa, por poucos segundos e nunca além do
+    # token de acesso que o emitiu; o stream encerra no `exp` desse token.
+    expira_em = min(int(time.time()) + NOTIFICACOES_TICKET_TTL, usuario.exp)
+    payload = {
+        'aud': _AUDIENCIA_TICKET,
+        'jti': uuid.uuid4().hex,
+        'empresa_id': empresa_id,
+        'usuario': usuario.model_dump(),
+        'exp': expira_em,
+    }
+    return jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM), expira_em
+
+
+def _usuario_do_ticket(ticket: str, empresa_id: int) -> TokenPayLoad:
+    try:
+        payload = jwt.decode(ticket, SECRET_KEY, algorithms=[ALGORITHM], audience=_AUDIENCIA_TICKET)
+        usuario = TokenPayLoad(**payload['usuario'])
+        jti, escopo = payload['jti'], payload['empresa_id']
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Ticket expirado")
+    except (jwt.InvalidTokenError, ValidationError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Ticket inválido")
+    if escopo != empresa_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Ticket emitido para outra empresa")
+    if not consumir_ticket_stream(jti, payload['exp']):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Ticket já utilizado")
+    return usuario
+
+
+def get_current_user_stream(
+    empresa_id: int = Path(..., gt=0),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security_opcional),
+    ticket: Optional[str] = Query(None, description="Ticket de POST /empresas/{empresa_id}/notificacoes/stream/ticket, para clientes (EventSource) que não enviam o cabeçalho Authorization.")
+) -> TokenPayLoad:
+    # Síncrona: o consumo do ticket acessa o banco e roda no threadpool.
+    if credentials is not None:
+        return _usuario_do_token(credentials.credentials)
+    if ticket:
+        return _usuario_do_ticket(ticket, empresa_id)
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Token de acesso não informado"
+    )
+
+
+def require_permission(*permissoes_necessarias: str, autenticacao=get_current_user):
+    permissoes_requeridas = frozenset(permissoes_necessarias)
+
+    def permission_checker(current_user: TokenPayLoad = Depends(autenticacao)) -> TokenPayLoad:
         permissoes_usuario = set(current_user.permissoes)
-        permissoes_requeridas = set(permissoes_necessarias)
 
         if "*" in permissoes_usuario or "admin_master" in permissoes_usuario:
-            return current_user.model_dump()
+            return current_user
 
         if permissoes_usuario.isdisjoint(permissoes_requeridas):
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Você não tem permissão para executar esta ação."
             )
-        return current_user.model_dump()
+        return current_user
 
-    return permission_checker
\ No newline at end of file
+    return permission_checker
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+
+import aiomysql
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from pymysql.err import MySQLError
+
+from app.database.config import get_db_config, get_pool_config
+from app.service.metricas import instrumentar_cursor_async, registrar_conexao
+
+load_dotenv()
+
+logger = logging.getLogger("async_pool")
+
+_async_pool = None
+_async_pool_loop = None
+_async_pool_lock = None
+
+
+def get_db_backend() -> str:
+    backend = os.getenv('DB_BACKEND', 'sync').strip().lower()
+    if backend not in ('sync', 'async'):
+        raise ValueError(
+            f"DB_BACKEND inválido: '{backend}'. Use 'sync' ou 'async'.")
+    return backend
+
+
+async def get_async_pool() -> aiomysql.Pool:
+    global _async_pool, _async_pool_loop, _async_pool_lock
+    loop = asyncio.get_running_loop()
+    # O pool do aiomysql fica preso ao event loop em que foi criado.
+    if _async_pool is not None and _async_pool_loop is loop:
+        return _async_pool
+    if _async_pool_lock is None or _async_pool_loop is not loop:
+        if _async_pool is not None:
+            _descartar_pool(_async_pool)
+        _async_pool_lock = asyncio.Lock()
+        _async_pool_loop = loop
+        _async_pool = None
+    async with _async_pool_lock:
+        if _async_pool is None:
+            config = get_db_config()
+            pool_config = get_pool_config()
+            _async_pool = await aiomysql.create_pool(
+                host=config['host'],
+                port=config['port'],
+                user=config['user'],
+                password=config['password'],
+                db=config['database'],
+                minsize=0,
+                maxsize=int(os.getenv('DB_ASYNC_POOL_SIZE', pool_config['size'])),
+                pool_recycle=int(pool_config['max_lifetime']),
+                autocommit=False,
+                charset='utf8mb4',
+            )
+    return _async_pool
+
+
+def _descartar_pool(pool: aiomysql.Pool) -> None:
+    # Pool criado em outro event loop (ex.: TestClient, reload): wait_closed()
+    # não pode ser aguardado daqui, então os sockets são fechados direto. Se o
+    # loop antigo já foi encerrado, o fechamento falha e o vazamento é logado.
+    pool.terminate()
+    conexoes = list(pool._free)
+    pool._free.clear()
+    nao_fechadas = 0
+    for conn in conexoes:
+        try:
+            conn.close()
+        except RuntimeError:
+            nao_fechadas += 1
+    if nao_fechadas:
+        logger.warning(
+            f"Pool aiomysql de um event loop anterior descartado com "
+            f"{nao_fechadas} conexão(ões) não fechada(s).")
+
+
+async def close_async_pool():
+    global _async_pool
+    if _async_pool is not None:
+        _async_pool.close()
+        await _async_pool.wait_closed()
+        _async_pool = None
+
+
+@asynccontextmanager
+async def get_async_cursor():
+    inicio = time.perf_counter()
+    try:
+        pool = await get_async_pool()
+        # Mesmo limite de espera do pool síncrono (DB_POOL_TIMEOUT) e mesmo 503.
+        conn = await asyncio.wait_for(pool.acquire(), get_pool_config()['timeout'])
+        registrar_conexao(time.perf_counter() - inicio)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail="Banco de dados indisponível no momento: tempo esgotado aguardando uma conexão do pool."
+        )
+    except MySQLError as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao conectar ao banco de dados: {str(e)}"
+        )
+    try:
+        async with conn.cursor(aiomysql.DictCursor) as cursor:
+            try:
+                yield instrumentar_cursor_async(cursor)
+                await conn.commit()
+            except BaseException:
+                # Inclui CancelledError/GeneratorExit (cliente desconectou): a
+                # conexão não pode voltar ao pool com a transação aberta.
+                await conn.rollback()
+                raise
+    finally:
+        pool.release(conn)
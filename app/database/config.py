@@ -1,36 +1,87 @@
 import os
+import threading
+import time
 from dotenv import load_dotenv
 from contextlib import contextmanager
 from fastapi import HTTPException
 from mysql.connector import Error
-import mysql.connector 
+from mysql.connector.errors import PoolError
+from app.database.pool import ConnectionPool
+from app.service.metricas import registrar_conexao
 
 load_dotenv()
 
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
 def get_db_config():
     config = {
         'host': os.getenv('DB_HOST', 'localhost'),
         'user': os.getenv('DB_USER'),
         'password': os.getenv('DB_PASSWORD'),
         'database': os.getenv('DB_NAME'),
-        'port': int(os.getenv('DB_PORT'))
+        'port': int(os.getenv('DB_PORT', 3306))
     }
     if not all([config['user'], config['password'], config['database']]):
         raise ValueError(
             "Variáveis de ambiente do banco de dados não configuradas corretamente")
     return config
 
+
+def get_pool_config():
+    return {
+        'size': int(os.getenv('DB_POOL_SIZE', 10)),
+        'timeout': float(os.getenv('DB_POOL_TIMEOUT', 10)),
+        'ping_interval': float(os.getenv('DB_POOL_PING_INTERVAL', 30)),
+        'max_lifetime': float(os.getenv('DB_POOL_MAX_LIFETIME', 1800)),
+    }
+
+
+def get_pool() -> ConnectionPool:
+    global _pool, _pool_pid
+    # Cada processo (ex.: workers do gunicorn após o fork) tem o próprio pool.
+    if _pool is None or _pool_pid != os.getpid():
+        with _pool_lock:
+            if _pool is None or _pool_pid != os.getpid():
+                _pool = ConnectionPool(get_db_config(), **get_pool_config())
+                _pool_pid = os.getpid()
+    return _pool
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None and _pool_pid == os.getpid():
+            _pool.close()
+        _pool = None
+
+
+def get_pool_stats():
+    if _pool is None or _pool_pid != os.getpid():
+        return None
+    return _pool.stats()
+
+
 def get_db_connection():
+    inicio = time.perf_counter()
     try:
-        config = get_db_config()
-        connection = mysql.connector.connect(**config)
-        return connection 
+        connection = get_pool().acquire()
+        registrar_conexao(time.perf_counter() - inicio)
+        return connection
+    except PoolError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Banco de dados indisponível no momento: {str(e)}"
+        )
     except Error as e:
         raise HTTPException(
             status_code=500,
             detail=f"Erro ao conectar ao banco de dados: {str(e)}"
         )
-    
+
+
 @contextmanager
 def get_cursor():
     connection = get_db_connection()
@@ -38,9 +89,9 @@ def get_cursor():
     try:
         yield cursor
         connection.commit()
-    except:
+    except BaseException:
         connection.rollback()
         raise
     finally:
         cursor.close()
-        connection.close()
\ No newline at end of file
+        connection.close()
@@ -0,0 +1,19 @@
+from typing import Optional
+
+
+def reconciliar_nao_lidas(cursor, empresa_id: Optional[int] = None) -> None:
+    # Recalcula empresa_contadores.notificacoes_nao_lidas a partir da tabela
+    # notificacao. Usado pela migração 6, pelos seeds e pelo repositório,
+    # depois de escritas que não mantêm o contador (seeds, SQL manual).
+    filtro = "WHERE e.id = %s" if empresa_id is not None else ""
+    cursor.execute(f"""
+        INSERT INTO empresa_contadores (id_empresa, notificacoes_nao_lidas)
+        SELECT * FROM (
+            SELECT e.id, COUNT(n.id) AS nao_lidas
+            FROM empresa e
+            LEFT JOIN notificacao n ON n.id_empresa = e.id AND n.lida = FALSE
+            {filtro}
+            GROUP BY e.id
+        ) AS contagem
+        ON DUPLICATE KEY UPDATE notificacoes_nao_lidas = contagem.nao_lidas
+    """, (empresa_id,) if empresa_id is not None else ())
@@ -0,0 +1,120 @@
+"""
+Verificação dos planos de execução das consultas dos repositórios.
+
+Roda EXPLAIN em cada consulta abaixo (importadas dos repositórios) e falha
+se alguma delas fizer full table scan (type = ALL) em uma tabela que não seja
+de catálogo. Deve ser executado contra o banco já populado pelos seeds, pois
+o otimizador leva em conta o volume de dados:
+
+    python -m app.database.seed.seed_main
+    python -m app.database.explain_check
+"""
+import re
+import sys
+from typing import Any, Dict, List, Tuple
+
+from app.database.config import get_pool
+from app.repository.empresaRamo_rapository import _RAMOS_DA_EMPRESA_QUERY
+from app.repository.empresa_repository import _build_empresas_page_query
+from app.repository.endereco_repository import _build_enderecos_page_query
+from app.repository.expiracao_selos_repository import (
+    SELECIONAR_ALERTAS,
+    SELECIONAR_EXPIRADOS,
+    parametros_alertas,
+)
+from app.repository.ibdn_user_repository import (
+    _EMPRESA_DO_USUARIO_QUERY,
+    _LOGIN_CREDENCIAIS_QUERY,
+    _build_usuarios_page_query,
+)
+from app.repository.notificacao_repository import _build_notificacoes_page_query
+from app.repository.selos_repository import (
+    _EMPRESA_SELO_POR_ID_QUERY,
+    _build_selos_empresa_page_query,
+    _build_solicitacoes_page_query,
+)
+from app.service.scheduler import ALERTA_DIAS_PADRAO, ALERTA_JANELA_MAXIMA, EXPIRACAO_LOTE
+
+# Tabelas pequenas e de tamanho limitado, onde um scan completo é aceitável.
+TABELAS_CATALOGO = {"selo", "ramo", "ibdn_perfis", "ibdn_permissoes", "ibdn_perfil_permissoes"}
+
+LIMITE = 100
+
+
+def _sem_trava(sql: str) -> str:
+    # EXPLAIN aceita FOR UPDATE, mas não há por que travar linhas aqui.
+    return re.sub(r"\s+FOR\s+UPDATE\b", "", sql, flags=re.IGNORECASE)
+
+
+def _consulta(nome: str, montada: Tuple[str, List[Any]]) -> Tuple[str, str, Tuple[Any, ...]]:
+    sql, params = montada
+    return nome, sql, tuple(params)
+
+
+# As consultas vêm dos próprios repositórios (constantes e funções que montam
+# o SQL), então o que é verificado é exatamente o que roda em produção. As
+# páginas seguintes usam valores de cursor de exemplo.
+CONSULTAS: List[Tuple[str, str, Tuple[Any, ...]]] = [
+    _consulta("empresas ativas (primeira página)", _build_empresas_page_query(LIMITE, None)),
+    _consulta("empresas ativas (página seguinte)", _build_empresas_page_query(LIMITE, [100])),
+    ("empresa por usuário", _EMPRESA_DO_USUARIO_QUERY, ("x",)),
+    _consulta("selos da empresa (primeira página)", _build_selos_empresa_page_query(1, LIMITE, None)),
+    _consulta("selos da empresa (página seguinte)",
+              _build_selos_empresa_page_query(1, LIMITE, ["2030-01-01", 100])),
+    _consulta("solicitações pendentes (primeira página)", _build_solicitacoes_page_query(LIMITE, None)),
+    _consulta("solicitações pendentes (página seguinte)",
+              _build_solicitacoes_page_query(LIMITE, ["2024-01-01", 100])),
+    _consulta("notificações da empresa", _build_notificacoes_page_query(1, None, LIMITE, None)),
+    _consulta("notificações da empresa por leitura", _build_notificacoes_page_query(1, False, LIMITE, None)),
+    _consulta("notificações da empresa (página seguinte)",
+              _build_notificacoes_page_query(1, None, LIMITE, ["2024-01-01 00:00:00", 100])),
+    _consulta("endereços da empresa", _build_enderecos_page_query(1, LIMITE, None)),
+    ("ramos da empresa", _RAMOS_DA_EMPRESA_QUERY, (1,)),
+    _consulta("usuários (primeira página)", _build_usuarios_page_query(LIMITE, 0, None)),
+    _consulta("usuários (página seguinte)", _build_usuarios_page_query(LIMITE, 0, ["M", "x"])),
+    ("credenciais de login", _LOGIN_CREDENCIAIS_QUERY, ("admin@ibdn.org.br",)),
+    ("selos expirados (scheduler)", _sem_trava(SELECIONAR_EXPIRADOS), (EXPIRACAO_LOTE,)),
+    ("selos a alertar (scheduler)", _sem_trava(SELECIONAR_ALERTAS),
+     parametros_alertas(ALERTA_DIAS_PADRAO, ALERTA_JANELA_MAXIMA) + (EXPIRACAO_LOTE,)),
+    ("selo concedido por id", _EMPRESA_SELO_POR_ID_QUERY, (1,)),
+]
+
+
+def verificar_planos(cursor) -> List[Dict[str, Any]]:
+    problemas = []
+    for nome, sql, params in CONSULTAS:
+        cursor.execute("EXPLAIN " + sql, params)
+        for linha in cursor.fetchall():
+            tabela = linha.get("table")
+            if linha.get("type") == "ALL" and tabela not in TABELAS_CATALOGO:
+                problemas.append({
+                    "consulta": nome,
+                    "tabela": tabela,
+                    "linhas_estimadas": linha.get("rows"),
+                    "extra": linha.get("Extra"),
+                })
+    return problemas
+
+
+def main() -> int:
+    conn = get_pool().acquire()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        problemas = verificar_planos(cursor)
+    finally:
+        cursor.close()
+        conn.close()
+
+    if not problemas:
+        print(f"OK: {len(CONSULTAS)} consultas verificadas, nenhum full table scan.")
+        return 0
+
+    print("FALHA: consultas com full table scan:")
+    for p in problemas:
+        print(f"  - {p['consulta']}: tabela '{p['tabela']}' "
+              f"(~{p['linhas_estimadas']} linhas) {p['extra'] or ''}")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+import logging
+from typing import List, Tuple
+
+# Índices secundários derivados das consultas dos repositórios, um conjunto
+# por migração. Um conjunto publicado não muda mais: índices novos entram em
+# uma nova lista, aplicada por uma nova migração em migrations.py.
+Indice = Tuple[str, str, str]
+
+# Migração 2.
+INDEXES_V2: List[Indice] = [
+    # selos_repository.repo_listar_solicitacoes_pendentes:
+    #   WHERE status IN (...) ORDER BY data_emissao, id
+    ("empresa_selo", "idx_empresa_selo_status_emissao", "status, data_emissao"),
+    # selos_repository.repo_listar_selos_da_empresa:
+    #   WHERE id_empresa = ? ORDER BY data_expiracao DESC, id DESC
+    ("empresa_selo", "idx_empresa_selo_empresa_expiracao", "id_empresa, data_expiracao"),
+    # notificacao_repository.get_notificacoes_by_empresa com filtro `lida`:
+    #   WHERE id_empresa = ? AND lida = ? ORDER BY data_envio DESC, id DESC
+    ("notificacao", "idx_notificacao_empresa_lida_envio", "id_empresa, lida, data_envio"),
+    # ... e sem o filtro `lida`
+    ("notificacao", "idx_notificacao_empresa_envio", "id_empresa, data_envio"),
+    # empresa_repository.repo_get_all_empresas: WHERE ativo = TRUE ORDER BY id
+    ("empresa", "idx_empresa_ativo", "ativo"),
+    # ibdn_user_repository.repo_get_all_ibdn_usuarios: ORDER BY nome, id
+    ("ibdn_usuarios", "idx_ibdn_usuarios_nome", "nome"),
+]
+
+# Migração 4.
+INDEXES_V4: List[Indice] = [
+    # expiracao_selos_repository (scheduler):
+    #   WHERE status = 'Ativo' AND data_expiracao < / BETWEEN ...
+    ("empresa_selo", "idx_empresa_selo_status_expiracao", "status, data_expiracao"),
+]
+
+
+def ensure_indexes(cursor, logger: logging.Logger, indices: List[Indice]) -> int:
+    """Cria, dentre `indices`, os que ainda não existem (idempotente)."""
+    logger = logger or logging.getLogger('database_setup')
+    cursor.execute(
+        "SELECT DISTINCT TABLE_NAME, INDEX_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE()"
+    )
+    existentes = {(row[0], row[1]) for row in _rows_as_tuples(cursor.fetchall())}
+
+    criados = 0
+    for tabela, nome, colunas in indices:
+        if (tabela, nome) in existentes:
+            continue
+        logger.info(f"Criando índice {nome} em {tabela} ({colunas})...")
+        cursor.execute(f"CREATE INDEX `{nome}` ON `{tabela}` ({colunas})")
+        criados += 1
+
+    logger.info(f"{len(indices)} índice(s) verificado(s) ({criados} criado(s)).")
+    return criados
+
+
+def _rows_as_tuples(rows):
+    for row in rows:
+        yield tuple(row.values()) if isinstance(row, dict) else tuple(row)
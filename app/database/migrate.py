@@ -0,0 +1,34 @@
+"""
+Aplica as migrações pendentes do banco de dados ou mostra a versão atual.
+
+    python -m app.database.migrate          # aplica (equivale a `up`)
+    python -m app.database.migrate status   # versão atual x esperada
+"""
+import sys
+
+from app.database.migrations import migrate, schema_status
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    comando = argv[0] if argv else "up"
+
+    if comando == "up":
+        aplicadas = migrate()
+        print(f"Migrações aplicadas: {aplicadas}.")
+        return 0
+
+    if comando == "status":
+        atual, esperada = schema_status()
+        if atual is None:
+            print(f"Tabela schema_version inexistente; versão esperada: {esperada}.")
+            return 1
+        print(f"Versão atual: {atual}; versão esperada: {esperada}.")
+        return 0 if atual >= esperada else 1
+
+    print(f"Comando desconhecido: {comando}. Use 'up' ou 'status'.")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
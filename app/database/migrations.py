@@ -0,0 +1,207 @@
+import logging
+from typing import Callable, List, Optional, Tuple
+
+from mysql.connector import Error
+
+from app.database.config import get_pool
+from app.database.contadores import reconciliar_nao_lidas
+from app.database.indexes import INDEXES_V2, INDEXES_V4, ensure_indexes
+from app.database.tables import (
+    create_database_if_not_exists,
+    create_initial_data,
+    create_tables,
+    ensure_admin_master,
+    setup_logging,
+)
+
+def _coluna_existe(cursor, tabela: str, coluna: str) -> bool:
+    cursor.execute(
+        "SELECT COUNT(*) AS existe FROM information_schema.COLUMNS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+        (tabela, coluna))
+    return bool(cursor.fetchone()['existe'])
+
+
+def indices_consultas_repositorios(cursor, logger: logging.Logger):
+    ensure_indexes(cursor, logger, INDEXES_V2)
+
+
+def indice_status_expiracao(cursor, logger: logging.Logger):
+    ensure_indexes(cursor, logger, INDEXES_V4)
+
+
+def versoes_para_cache_http(cursor, logger: logging.Logger):
+    # Versões baratas de consultar para os ETags: data da última alteração da
+    # empresa e contadores de alteração das listas de selos e notificações.
+    if not _coluna_existe(cursor, "empresa", "atualizado_em"):
+        logger.info("Adicionando coluna empresa.atualizado_em...")
+        cursor.execute(
+            "ALTER TABLE empresa ADD COLUMN atualizado_em TIMESTAMP(6) NOT NULL "
+            "DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)")
+    logger.info("Criando/Verificando tabela: empresa_contadores...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS empresa_contadores (
+            id_empresa INT PRIMARY KEY,
+            versao_selos BIGINT NOT NULL DEFAULT 0,
+            versao_notificacoes BIGINT NOT NULL DEFAULT 0,
+            FOREIGN KEY (id_empresa) REFERENCES empresa(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB;
+    """)
+
+
+def contador_notificacoes_nao_lidas(cursor, logger: logging.Logger):
+    if not _coluna_existe(cursor, "empresa_contadores", "notificacoes_nao_lidas"):
+        logger.info("Adicionando coluna empresa_contadores.notificacoes_nao_lidas...")
+        cursor.execute(
+            "ALTER TABLE empresa_contadores ADD COLUMN notificacoes_nao_lidas INT NOT NULL DEFAULT 0")
+    logger.info("Calculando notificações não lidas por empresa...")
+    reconciliar_nao_lidas(cursor)
+
+
+def tabela_scheduler_execucao(cursor, logger: logging.Logger):
+    # Início da última execução de cada job agendado, compartilhado entre
+    # workers: quem obtém o lock consulta aqui se o tick já foi atendido.
+    logger.info("Criando/Verificando tabela: scheduler_execucao...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS scheduler_execucao (
+            nome VARCHAR(64) PRIMARY KEY,
+            ultima_execucao DATETIME(6) NOT NULL
+        ) ENGINE=InnoDB;
+    """)
+
+
+def tabela_tickets_stream_usados(cursor, logger: logging.Logger):
+    # Tickets de uso único do stream SSE já consumidos, compartilhados entre
+    # workers; as linhas vencidas são apagadas a cada consumo.
+    logger.info("Criando/Verificando tabela: stream_ticket_usado...")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stream_ticket_usado (
+            jti CHAR(32) PRIMARY KEY,
+            expira_em DATETIME NOT NULL,
+            INDEX idx_stream_ticket_usado_expira_em (expira_em)
+        ) ENGINE=InnoDB;
+    """)
+
+
+# Cada migração recebe (cursor, logger) e precisa ser idempotente: se o
+# processo cair entre o DDL e o registro em schema_version, ela roda de novo.
+# Nunca altere uma migração já publicada; acrescente uma nova ao final.
+MIGRATIONS: List[Tuple[int, str, Callable]] = [
+    (1, "tabelas iniciais", create_tables),
+    (2, "índices secundários das consultas dos repositórios", indices_consultas_repositorios),
+    (3, "perfis, permissões, ramos e selos iniciais", create_initial_data),
+    (4, "índice de status/expiração de empresa_selo", indice_status_expiracao),
+    (5, "empresa.atualizado_em e tabela empresa_contadores", versoes_para_cache_http),
+    (6, "contador de notificações não lidas por empresa", contador_notificacoes_nao_lidas),
+    (7, "tabela scheduler_execucao", tabela_scheduler_execucao),
+    (8, "tabela stream_ticket_usado", tabela_tickets_stream_usados),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+MIGRATION_LOCK_NAME = "ibdn_schema_migrations"
+MIGRATION_LOCK_TIMEOUT = 60
+
+SCHEMA_VERSION_DDL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INT PRIMARY KEY,
+        descricao VARCHAR(255) NOT NULL,
+        aplicado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB;
+"""
+
+
+def _versao_atual(cursor) -> Optional[int]:
+    cursor.execute(
+        "SELECT COUNT(*) AS existe FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'schema_version'"
+    )
+    if not cursor.fetchone()['existe']:
+        return None
+    cursor.execute("SELECT MAX(version) AS versao FROM schema_version")
+    return cursor.fetchone()['versao'] or 0
+
+
+def migrate(logger: logging.Logger = None) -> int:
+    logger = logger or setup_logging()
+    create_database_if_not_exists()
+
+    conn = get_pool().acquire()
+    cursor = conn.cursor(dictionary=True)
+    aplicadas = 0
+    try:
+        # Vários workers/instâncias podem subir ao mesmo tempo; só um migra.
+        cursor.execute("SELECT GET_LOCK(%s, %s) AS obtido",
+                       (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))
+        if not cursor.fetchone()['obtido']:
+            raise RuntimeError(
+                "Não foi possível obter o lock de migração do banco de dados.")
+        try:
+            cursor.execute(SCHEMA_VERSION_DDL)
+            versao = _versao_atual(cursor)
+            logger.info(
+                f"Schema na versão {versao}; última versão disponível: {LATEST_VERSION}.")
+
+            for numero, descricao, aplicar in MIGRATIONS:
+                if numero <= versao:
+                    continue
+                logger.info(f"Aplicando migração {numero}: {descricao}...")
+                aplicar(cursor, logger)
+                cursor.execute(
+                    "INSERT INTO schema_version (version, descricao) VALUES (%s, %s)",
+                    (numero, descricao))
+                conn.commit()
+                aplicadas += 1
+
+            ensure_admin_master(cursor, logger)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (MIGRATION_LOCK_NAME,))
+            cursor.fetchall()
+    except Error as e:
+        logger.error(f"Erro durante a migração do banco de dados: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+    logger.info(f"Migração concluída ({aplicadas} aplicada(s)).")
+    return aplicadas
+
+
+def schema_status() -> Tuple[Optional[int], int]:
+    conn = get_pool().acquire()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        return _versao_atual(cursor), LATEST_VERSION
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def check_schema_version(logger: logging.Logger = None) -> bool:
+    # Chamado na subida da API: uma única consulta, sem DDL.
+    logger = logger or logging.getLogger('database_setup')
+    conn = get_pool().acquire()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT MAX(version) AS versao FROM schema_version")
+        versao = cursor.fetchone()['versao'] or 0
+    except Error as e:
+        logger.warning(
+            f"Não foi possível verificar a versão do schema ({e}). "
+            "Execute `python -m app.database.migrate`.")
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+
+    if versao < LATEST_VERSION:
+        logger.warning(
+            f"Schema do banco na versão {versao}, mas a aplicação espera a "
+            f"{LATEST_VERSION}. Execute `python -m app.database.migrate`.")
+        return False
+    return True
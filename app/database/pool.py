@@ -0,0 +1,231 @@
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector.errors import OperationalError, PoolError
+
+from app.service.metricas import instrumentar_cursor
+
+
+class PooledConnection:
+    """
+    Handle de uma conexão emprestada do pool.
+
+    Delega tudo para a conexão MySQL real; `close()` devolve a conexão ao
+    pool em vez de encerrá-la. Uma conexão marcada com `invalidate()` (ou
+    cujo rollback falhou) é descartada na devolução e reaberta no próximo uso.
+    """
+
+    def __init__(self, pool: "ConnectionPool", cnx, criada_em: float):
+        self._pool = pool
+        self._cnx = cnx
+        self._criada_em = criada_em
+        self._descartar = False
+
+    def __getattr__(self, name: str) -> Any:
+        cnx = self.__dict__.get("_cnx")
+        if cnx is None:
+            raise OperationalError(msg="Conexão já devolvida ao pool.")
+        return getattr(cnx, name)
+
+    def is_connected(self) -> bool:
+        # O handle continua "conectado" até ser devolvido; o link físico é
+        # verificado pelo pool no checkout, sem um ping a cada chamada.
+        return self._cnx is not None
+
+    def cursor(self, *args, **kwargs):
+        cnx = self._cnx
+        if cnx is None:
+            raise OperationalError(msg="Conexão já devolvida ao pool.")
+        return instrumentar_cursor(cnx.cursor(*args, **kwargs))
+
+    def invalidate(self) -> None:
+        self._descartar = True
+
+    def rollback(self) -> None:
+        try:
+            self._cnx.rollback()
+        except Error:
+            self._descartar = True
+            raise
+
+    def close(self) -> None:
+        cnx = self._cnx
+        if cnx is None:
+            return
+        self._cnx = None
+        self._pool._release(cnx, self._criada_em, self._descartar)
+
+    def __enter__(self) -> "PooledConnection":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def __del__(self):
+        cnx = self.__dict__.get("_cnx")
+        if cnx is not None:
+            self._cnx = None
+            self._pool._release(cnx, self._criada_em, True, vazada=True)
+
+
+class ConnectionPool:
+    """
+    Pool de conexões MySQL thread-safe compartilhado por toda a aplicação.
+
+    As conexões são abertas sob demanda até `size`; quando todas estão em uso
+    o chamador espera até `timeout` segundos antes de receber um PoolError.
+    Conexões ociosas há mais de `ping_interval` segundos passam por um ping
+    antes de serem entregues e conexões mais velhas que `max_lifetime` são
+    recicladas.
+    """
+
+    def __init__(self, db_config: Dict[str, Any], size: int = 10, timeout: float = 10.0,
+                 ping_interval: float = 30.0, max_lifetime: float = 1800.0):
+        if size < 1:
+            raise ValueError("O tamanho do pool deve ser maior que zero.")
+        self.db_config = dict(db_config)
+        self.size = size
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        self.max_lifetime = max_lifetime
+
+        self._cond = threading.Condition()
+        self._ociosas = deque()
+        self._abertas = 0
+        self._em_uso = 0
+        self._fechado = False
+
+        self._pico_em_uso = 0
+        self._aquisicoes = 0
+        self._esgotamentos = 0
+        self._timeouts = 0
+        self._espera_total = 0.0
+        self._espera_max = 0.0
+        self._recicladas = 0
+        self._falhas_health_check = 0
+        self._vazadas = 0
+
+    def _connect(self):
+        return mysql.connector.connect(**self.db_config)
+
+    def acquire(self) -> PooledConnection:
+        inicio = time.perf_counter()
+        prazo = inicio + self.timeout
+        with self._cond:
+            if self._fechado:
+                raise PoolError("O pool de conexões foi encerrado.")
+            if not self._ociosas and self._abertas >= self.size:
+                self._esgotamentos += 1
+                while not self._ociosas and self._abertas >= self.size:
+                    restante = prazo - time.perf_counter()
+                    if restante <= 0:
+                        self._timeouts += 1
+                        raise PoolError(
+                            f"Pool de conexões esgotado: nenhuma conexão livre após {self.timeout}s.")
+                    self._cond.wait(restante)
+
+            if self._ociosas:
+                cnx, ultimo_uso, criada_em = self._ociosas.pop()
+            else:
+                cnx, ultimo_uso, criada_em = None, 0.0, 0.0
+                self._abertas += 1
+
+            self._em_uso += 1
+            self._aquisicoes += 1
+            self._pico_em_uso = max(self._pico_em_uso, self._em_uso)
+            espera = time.perf_counter() - inicio
+            self._espera_total += espera
+            self._espera_max = max(self._espera_max, espera)
+
+        try:
+            agora = time.monotonic()
+            if cnx is not None and agora - criada_em > self.max_lifetime:
+                self._fechar_silenciosamente(cnx)
+                cnx = None
+                with self._cond:
+                    self._recicladas += 1
+            elif cnx is not None and agora - ultimo_uso > self.ping_interval:
+                try:
+                    cnx.ping(reconnect=True, attempts=1, delay=0)
+                except Error:
+                    self._fechar_silenciosamente(cnx)
+                    cnx = None
+                    with self._cond:
+                        self._falhas_health_check += 1
+                        self._recicladas += 1
+
+            if cnx is None:
+                cnx = self._connect()
+                criada_em = time.monotonic()
+        except BaseException:
+            with self._cond:
+                self._em_uso -= 1
+                self._abertas -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, cnx, criada_em)
+
+    def _release(self, cnx, criada_em: float, descartar: bool, vazada: bool = False) -> None:
+        if not descartar:
+            try:
+                # Encerra a transação implícita aberta por SELECTs com
+                # autocommit desligado, para não vazar snapshot entre usos.
+                if cnx.in_transaction:
+                    cnx.rollback()
+            except Error:
+                descartar = True
+
+        if descartar or self._fechado:
+            self._fechar_silenciosamente(cnx)
+
+        with self._cond:
+            self._em_uso -= 1
+            if vazada:
+                self._vazadas += 1
+            if descartar or self._fechado:
+                self._abertas -= 1
+                if descartar:
+                    self._recicladas += 1
+            else:
+                self._ociosas.append((cnx, time.monotonic(), criada_em))
+            self._cond.notify()
+
+    @staticmethod
+    def _fechar_silenciosamente(cnx) -> None:
+        try:
+            cnx.close()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        with self._cond:
+            self._fechado = True
+            ociosas = list(self._ociosas)
+            self._ociosas.clear()
+            self._abertas -= len(ociosas)
+            self._cond.notify_all()
+        for cnx, _, _ in ociosas:
+            self._fechar_silenciosamente(cnx)
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        with self._cond:
+            return {
+                "size": self.size,
+                "open": self._abertas,
+                "in_use": self._em_uso,
+                "idle": len(self._ociosas),
+                "peak_in_use": self._pico_em_uso,
+                "acquired_total": self._aquisicoes,
+                "exhausted_total": self._esgotamentos,
+                "timeouts_total": self._timeouts,
+                "wait_seconds_total": round(self._espera_total, 6),
+                "wait_seconds_max": round(self._espera_max, 6),
+                "recycled_total": self._recicladas,
+                "health_check_failures_total": self._falhas_health_check,
+                "leaked_total": self._vazadas,
+            }
@@ -4,13 +4,16 @@ Fornece funções helper para os scripts de seed do banco de dados IBDN.
 """
 import logging
 import os
-import random
 from datetime import datetime, timedelta
 
 import mysql.connector
 from faker import Faker
 from dotenv import load_dotenv
 
+from app.database.config import get_pool
+from app.database.pool import PooledConnection
+from app.service import cnpj
+
 load_dotenv()
 
 # Initialize Faker with pt_BR locale
@@ -62,18 +65,17 @@ def get_db_config() -> dict:
     }
 
 
-def get_db_connection() -> mysql.connector.MySQLConnection:
+def get_db_connection() -> PooledConnection:
     """
-    Cria conexão com o banco de dados.
+    Obtém uma conexão do pool compartilhado com a aplicação.
     
     Returns:
-        Objeto de conexão MySQL
+        Conexão do pool (``close()`` a devolve ao pool)
         
     Raises:
-        mysql.connector.Error: Se falhar ao conectar
+        mysql.connector.Error: Se falhar ao conectar ou o pool estiver esgotado
     """
-    config = get_db_config()
-    return mysql.connector.connect(**config)
+    return get_pool().acquire()
 
 
 class SeedContextManager:
@@ -121,35 +123,12 @@ class SeedContextManager:
 def gerar_cnpj() -> str:
     """
     Gera um CNPJ válido com dígitos verificadores corretos.
+    Para muitos CNPJs de uma vez, use app.service.cnpj.gerar_cnpjs.
     
     Returns:
         CNPJ formatado (XX.XXX.XXX/XXXX-XX)
     """
-    # Gera os 8 primeiros dígitos (raiz)
-    raiz = ''.join([str(random.randint(0, 9)) for _ in range(8)])
-    
-    # Gera os 4 dígitos do estabelecimento
-    estabelecimento = ''.join([str(random.randint(0, 9)) for _ in range(4)])
-    
-    # Concatena para cálculo dos dígitos verificadores
-    cnpj_base = raiz + estabelecimento
-    
-    # Cálculo do primeiro dígito verificador
-    pesos_1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    soma_1 = sum(int(c) * p for c, p in zip(cnpj_base[:12], pesos_1))
-    resto_1 = soma_1 % 11
-    dv1 = 0 if resto_1 < 2 else 11 - resto_1
-    
-    # Cálculo do segundo dígito verificador
-    cnpj_com_dv1 = cnpj_base + str(dv1)
-    pesos_2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    soma_2 = sum(int(c) * p for c, p in zip(cnpj_com_dv1, pesos_2))
-    resto_2 = soma_2 % 11
-    dv2 = 0 if resto_2 < 2 else 11 - resto_2
-    
-    cnpj_final = f"{raiz[:2]}.{raiz[2:5]}.{raiz[5:8]}/{estabelecimento}-{dv1}{dv2}"
-    
-    return cnpj_final
+    return cnpj.gerar_cnpj()
 
 
 def get_faker() -> Faker:
@@ -0,0 +1,342 @@
+"""
+Seed Massivo
+Gera bases grandes para testes de carga: usuários, empresas, endereços,
+empresa_ramo, empresa_selo e notificações em volume proporcional a uma escala.
+
+Diferente dos demais seeds, NÃO é idempotente: cada execução acrescenta uma
+nova leva de dados (e-mails marcados com um identificador da execução).
+Deve rodar com a API parada ou sem tráfego de escrita, pois os ids das
+empresas são atribuídos explicitamente a partir do MAX(id) atual.
+
+    python -m app.database.seed.seed_massivo --escala 10          # 1M empresas
+    python -m app.database.seed.seed_massivo --escala 0.1 --somente-gerar
+
+Por unidade de escala: 100 mil usuários/empresas, 1 endereço, 1 a 3 ramos,
+0 a 4 selos e 0 a 20 notificações por empresa (médias de 2 selos e 10
+notificações).
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+import uuid
+
+import numpy as np
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set
+
+from app.database.seed.seed_base import (
+    setup_logging,
+    get_db_connection,
+    get_faker
+)
+from app.database.contadores import reconciliar_nao_lidas
+from app.database.seed.seed_complementos import BRASIL_ESTADOS, TIPOS_LOGRADOURO, gerar_cep_valido
+from app.database.seed.seed_notificacoes import MENSAGENS_POR_TIPO, TIPOS_NOTIFICACAO
+from app.database.seed.seed_usuarios import SENHA_PADRAO
+from app.security.password import get_password_hash, shutdown_password_hasher
+from app.service.cnpj import gerar_cnpjs
+from app.service.codigo_selo import gerar_codigo_selo
+
+
+EMPRESAS_POR_ESCALA = 100_000
+LOTE_PADRAO = 5_000
+
+# Tamanho dos "dicionários" de valores gerados pelo Faker uma única vez; as
+# linhas combinam esses valores em vez de chamar o Faker por linha.
+TAMANHO_POOL_FAKER = 2_000
+
+STATUS_SELO_PESOS = {
+    "Ativo": 60,
+    "Pendente": 15,
+    "Expirado": 15,
+    "Em Renovação": 5,
+    "Recusado": 5,
+}
+
+INSERTS = {
+    "ibdn_usuarios": """
+        INSERT INTO ibdn_usuarios (id, nome, email, senha_hash, perfil_id, ativo, twofactor)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
+    """,
+    "empresa": """
+        INSERT INTO empresa (id, cnpj, razao_social, nome_fantasia, usuario_id, telefone,
+                             responsavel, cargo_responsavel, site, data_cadastro, ativo)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "endereco": """
+        INSERT INTO endereco (id_empresa, logradouro, numero, bairro, cep, cidade, uf, complemento)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "empresa_ramo": """
+        INSERT INTO empresa_ramo (id_empresa, id_ramo) VALUES (%s, %s)
+    """,
+    "empresa_selo": """
+        INSERT INTO empresa_selo (id_empresa, id_selo, status, data_emissao, data_expiracao,
+                                  codigo_selo, alerta_enviado, dias_alerta_previo, plano_solicitado_anos)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    "notificacao": """
+        INSERT INTO notificacao (id_empresa, mensagem, data_envio, tipo, lida)
+        VALUES (%s, %s, %s, %s, %s)
+    """,
+}
+
+# Ordem de gravação (respeita as chaves estrangeiras).
+ORDEM_TABELAS = ["ibdn_usuarios", "empresa", "endereco", "empresa_ramo", "empresa_selo", "notificacao"]
+
+
+class _Tabela:
+    """
+    Buffer de linhas de uma tabela, gravado com `executemany` a cada `lote`
+    linhas; o mysql-connector reescreve o INSERT ... VALUES como um único
+    INSERT de várias linhas por chamada.
+    """
+
+    def __init__(self, nome: str, lote: int, conn=None):
+        self.nome = nome
+        self.lote = lote
+        self.conn = conn
+        self.cursor = conn.cursor() if conn is not None else None
+        self.linhas: List[tuple] = []
+        self.total = 0
+        self.segundos_gravando = 0.0
+
+    def adicionar(self, linha: tuple) -> None:
+        self.linhas.append(linha)
+        if len(self.linhas) >= self.lote:
+            self.gravar()
+
+    def gravar(self) -> None:
+        if not self.linhas:
+            return
+        if self.cursor is not None:
+            inicio = time.perf_counter()
+            self.cursor.executemany(INSERTS[self.nome], self.linhas)
+            self.conn.commit()
+            self.segundos_gravando += time.perf_counter() - inicio
+        self.total += len(self.linhas)
+        self.linhas = []
+
+    def fechar(self) -> None:
+        if self.cursor is not None:
+            self.cursor.close()
+
+
+def _pool_faker(gerar, tamanho: int = TAMANHO_POOL_FAKER) -> List[str]:
+    return [gerar() for _ in range(tamanho)]
+
+
+class GeradorMassivo:
+    def __init__(self, escala: float, lote: int = LOTE_PADRAO, semente: Optional[int] = None,
+                 conn=None, logger: logging.Logger = None):
+        self.quantidade_empresas = max(1, int(EMPRESAS_POR_ESCALA * escala))
+        self.lote = lote
+        self.conn = conn
+        self.logger = logger or setup_logging('seed_massivo')
+        self.random = random.Random(semente)
+        self.rng = np.random.default_rng(semente)
+        self._cnpjs_livres: List[str] = []
+        # Identificador da execução: torna os e-mails únicos sem consultar o banco.
+        self.execucao = uuid.uuid4().hex[:8]
+
+        faker = get_faker()
+        if semente is not None:
+            faker.seed_instance(semente)
+            random.seed(semente)  # gerar_cep_valido usa o módulo random
+        self.nomes = _pool_faker(faker.name)
+        self.empresas = _pool_faker(faker.company)
+        self.ruas = _pool_faker(faker.street_name)
+        self.bairros = _pool_faker(faker.bairro, 500)
+        self.cargos = _pool_faker(faker.job, 500)
+        self.sufixos = ["Ltda", "S.A.", "ME", "EPP", "Eireli"]
+        self.cidades = [(estado["uf"], cidade) for estado in BRASIL_ESTADOS for cidade in estado["cidades"]]
+
+    def _carregar_referencias(self, cursor) -> None:
+        # Tudo que o seed precisa do banco é lido uma única vez aqui.
+        cursor.execute("SELECT id FROM ibdn_perfis WHERE nome = 'empresa'")
+        perfil = cursor.fetchone()
+        if not perfil:
+            raise RuntimeError("Perfil 'empresa' não encontrado; execute as migrações antes do seed.")
+        self.perfil_empresa_id = perfil[0]
+
+        cursor.execute("SELECT id FROM ramo")
+        self.ramos = [row[0] for row in cursor.fetchall()]
+        cursor.execute("SELECT id, nome, sigla FROM selo")
+        self.selos = cursor.fetchall()
+        if not self.ramos or not self.selos:
+            raise RuntimeError("Catálogo de ramos/selos vazio; execute as migrações antes do seed.")
+
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM empresa")
+        self.proximo_id_empresa = cursor.fetchone()[0] + 1
+        cursor.execute("SELECT cnpj FROM empresa")
+        self.cnpjs: Set[str] = {row[0] for row in cursor.fetchall()}
+
+    def _referencias_sem_banco(self) -> None:
+        self.perfil_empresa_id = str(uuid.uuid4())
+        self.ramos = list(range(1, 16))
+        self.selos = [(i, f"Selo {i}", f"S{i:02d}") for i in range(1, 6)]
+        self.proximo_id_empresa = 1
+        self.cnpjs = set()
+
+    def _cnpj_unico(self) -> str:
+        # Gerados em lotes vetorizados, já fora do set de CNPJs existentes.
+        if not self._cnpjs_livres:
+            self._cnpjs_livres = gerar_cnpjs(self.lote, self.cnpjs, self.rng)
+            self.cnpjs.update(self._cnpjs_livres)
+            self._cnpjs_livres.reverse()
+        return self._cnpjs_livres.pop()
+
+    def _mensagens(self) -> Dict[str, List[str]]:
+        mensagens = {}
+        for tipo in TIPOS_NOTIFICACAO:
+            mensagens[tipo] = []
+            for modelo in MENSAGENS_POR_TIPO[tipo]:
+                for _, nome, sigla in self.selos:
+                    mensagens[tipo].append(modelo.format(
+                        nome=nome, sigla=sigla, dias=self.random.randint(15, 60),
+                        data=(datetime.now() + timedelta(days=self.random.randint(1, 60))).strftime("%d/%m/%Y")))
+        return mensagens
+
+    def executar(self) -> Dict[str, Dict[str, float]]:
+        if self.conn is not None:
+            cursor = self.conn.cursor()
+            self._carregar_referencias(cursor)
+            # As chaves e a unicidade são garantidas pelo próprio gerador.
+            cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+            cursor.close()
+        else:
+            self._referencias_sem_banco()
+
+        tabelas = {nome: _Tabela(nome, self.lote, self.conn) for nome in ORDEM_TABELAS}
+        senha_hash = get_password_hash(SENHA_PADRAO)  # um bcrypt para todos
+        mensagens = self._mensagens()
+        pesos_status = list(STATUS_SELO_PESOS.values())
+        status_selo = list(STATUS_SELO_PESOS.keys())
+        rnd = self.random
+        agora = datetime.now()
+        hoje = agora.date()
+
+        self.logger.info(
+            f"Gerando {self.quantidade_empresas} empresas a partir do id {self.proximo_id_empresa} "
+            f"(execução {self.execucao}, lote {self.lote})...")
+        inicio = time.perf_counter()
+        try:
+            for n in range(self.quantidade_empresas):
+                id_empresa = self.proximo_id_empresa + n
+                usuario_id = str(uuid.uuid4())
+                nome = rnd.choice(self.nomes)
+                tabelas["ibdn_usuarios"].adicionar((
+                    usuario_id, nome, f"carga.{self.execucao}.{n}@exemplo.com.br", senha_hash,
+                    self.perfil_empresa_id, rnd.random() < 0.9, rnd.random() < 0.2))
+
+                fantasia = rnd.choice(self.empresas)
+                tabelas["empresa"].adicionar((
+                    id_empresa, self._cnpj_unico(), f"{fantasia} {rnd.choice(self.sufixos)}", fantasia,
+                    usuario_id, f"({rnd.randint(11, 99)}) 9{rnd.randint(1000, 9999)}-{rnd.randint(1000, 9999)}",
+                    nome, rnd.choice(self.cargos), f"https://empresa{id_empresa}.exemplo.com.br",
+                    agora - timedelta(days=rnd.randint(0, 1500)), rnd.random() < 0.9))
+
+                uf, cidade = rnd.choice(self.cidades)
+                tabelas["endereco"].adicionar((
+                    id_empresa, f"{rnd.choice(TIPOS_LOGRADOURO)} {rnd.choice(self.ruas)}",
+                    str(rnd.randint(1, 9999)), rnd.choice(self.bairros), gerar_cep_valido(),
+                    cidade, uf, None))
+
+                for id_ramo in rnd.sample(self.ramos, rnd.randint(1, min(3, len(self.ramos)))):
+                    tabelas["empresa_ramo"].adicionar((id_empresa, id_ramo))
+
+                for id_selo, _, sigla in rnd.sample(self.selos, rnd.randint(0, min(4, len(self.selos)))):
+                    status = rnd.choices(status_selo, pesos_status)[0]
+                    if status in ("Pendente", "Recusado"):
+                        tabelas["empresa_selo"].adicionar((
+                            id_empresa, id_selo, status, None, None, None, None, None, rnd.choice((1, 2, 3))))
+                        continue
+                    anos = rnd.choice((1, 2, 3))
+                    if status == "Expirado":
+                        emissao = hoje - timedelta(days=anos * 365 + rnd.randint(1, 365))
+                    else:
+                        emissao = hoje - timedelta(days=rnd.randint(0, anos * 365 - 1))
+                    tabelas["empresa_selo"].adicionar((
+                        id_empresa, id_selo, status, emissao, emissao + timedelta(days=anos * 365),
+                        gerar_codigo_selo(sigla, id_empresa), False, None, anos))
+
+                for _ in range(rnd.randint(0, 20)):
+                    tipo = rnd.choice(TIPOS_NOTIFICACAO)
+                    tabelas["notificacao"].adicionar((
+                        id_empresa, rnd.choice(mensagens[tipo]),
+                        agora - timedelta(seconds=rnd.randint(0, 180 * 86400)), tipo, rnd.random() < 0.5))
+
+            for nome in ORDEM_TABELAS:
+                tabelas[nome].gravar()
+
+            if self.conn is not None:
+                cursor = self.conn.cursor()
+                cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+                inicio_contadores = time.perf_counter()
+                reconciliar_nao_lidas(cursor)
+                self.conn.commit()
+                cursor.close()
+                self.logger.info(
+                    f"Contadores de não lidas recalculados em {time.perf_counter() - inicio_contadores:.1f}s")
+        finally:
+            for tabela in tabelas.values():
+                tabela.fechar()
+
+        duracao = time.perf_counter() - inicio
+        return {
+            nome: {"linhas": tabela.total, "segundos_gravando": tabela.segundos_gravando}
+            for nome, tabela in tabelas.items()
+        } | {"_total": {"linhas": sum(t.total for t in tabelas.values()), "segundos": duracao}}
+
+
+def imprimir_relatorio(resultado: Dict[str, Dict[str, float]], gravou: bool) -> None:
+    total = resultado["_total"]
+    print(f"\n{'tabela':<16}{'linhas':>12}{'gravação (s)':>14}{'linhas/s':>14}")
+    for nome in ORDEM_TABELAS:
+        linhas = resultado[nome]["linhas"]
+        segundos = resultado[nome]["segundos_gravando"]
+        taxa = f"{linhas / segundos:,.0f}" if gravou and segundos else "-"
+        print(f"{nome:<16}{linhas:>12,}{segundos:>14.1f}{taxa:>14}")
+    print(f"{'total':<16}{total['linhas']:>12,}{total['segundos']:>14.1f}"
+          f"{total['linhas'] / total['segundos']:>14,.0f}")
+    if not gravou:
+        print("\n(--somente-gerar: nada foi gravado; a taxa total mede só a geração)")
+
+
+def run_seed_massivo(escala: float, lote: int = LOTE_PADRAO, semente: Optional[int] = None,
+                     somente_gerar: bool = False, logger: logging.Logger = None) -> Dict[str, Dict[str, float]]:
+    logger = logger or setup_logging('seed_massivo')
+    conn = None if somente_gerar else get_db_connection()
+    try:
+        return GeradorMassivo(escala, lote, semente, conn, logger).executar()
+    except Exception:
+        if conn is not None:
+            conn.rollback()
+            # A sessão ficou com foreign_key_checks/unique_checks desligados.
+            conn.invalidate()
+        raise
+    finally:
+        if conn is not None:
+            conn.close()
+        shutdown_password_hasher()
+
+
+def main(argv: Sequence[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed em volume para testes de carga.")
+    parser.add_argument("--escala", type=float, default=1.0,
+                        help=f"Fator de escala (1 = {EMPRESAS_POR_ESCALA:,} empresas).")
+    parser.add_argument("--lote", type=int, default=LOTE_PADRAO, help="Linhas por INSERT/commit.")
+    parser.add_argument("--semente", type=int, default=None, help="Semente do gerador aleatório.")
+    parser.add_argument("--somente-gerar", action="store_true",
+                        help="Gera as linhas sem gravar (mede só a geração).")
+    args = parser.parse_args(argv)
+
+    resultado = run_seed_massivo(args.escala, args.lote, args.semente, args.somente_gerar)
+    imprimir_relatorio(resultado, not args.somente_gerar)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,7 @@ import random
 from datetime import datetime, timedelta
 from typing import List, Dict
 
+from app.database.contadores import reconciliar_nao_lidas
 from app.database.seed.seed_base import (
     setup_logging,
     SeedContextManager,
@@ -234,6 +235,9 @@ def seed_notificacoes(logger: logging.Logger) -> dict:
                 f"Empresa '{nome_empresa}': {qtd_notificacoes} notificações criadas"
             )
         
+        # Os INSERTs acima não passam pelo repositório; recalcula o contador
+        # de não lidas usado pelo badge.
+        reconciliar_nao_lidas(ctx.cursor)
         ctx.commit()
     
     return stats
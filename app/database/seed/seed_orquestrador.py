@@ -0,0 +1,152 @@
+"""
+Seed Orquestrador
+Executa as fases de seed como um grafo de dependências: cada fase roda assim
+que todas as fases das quais depende terminam com sucesso, em um pool de
+threads com paralelismo limitado. Cada fase abre a própria conexão (via
+SeedContextManager), então o paralelismo também limita as conexões usadas.
+"""
+import logging
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.database.seed.seed_base import setup_logging
+
+# Não passe do tamanho do pool de conexões (DB_POOL_SIZE).
+SEED_PARALELISMO = int(os.getenv("SEED_PARALELISMO", 3))
+
+
+class Fase:
+    def __init__(self, nome: str, executar: Callable[[logging.Logger], Any],
+                 depende_de: Sequence[str] = (),
+                 contar_linhas: Optional[Callable[[dict], int]] = None):
+        self.nome = nome
+        self.executar = executar
+        self.depende_de = tuple(depende_de)
+        self.contar_linhas = contar_linhas
+
+
+class ResultadoFase:
+    def __init__(self, nome: str, status: str, inicio: float = 0.0, duracao: float = 0.0,
+                 linhas: Optional[int] = None, erro: Optional[str] = None, dados: Any = None):
+        self.nome = nome
+        self.status = status  # "sucesso", "erro" ou "pulada"
+        self.inicio = inicio
+        self.duracao = duracao
+        self.linhas = linhas
+        self.erro = erro
+        self.dados = dados
+
+    @property
+    def sucesso(self) -> bool:
+        return self.status == "sucesso"
+
+
+def ordenar_fases(fases: Sequence[Fase]) -> List[str]:
+    """Ordem topológica (Kahn); falha em dependência desconhecida ou ciclo."""
+    por_nome = {fase.nome: fase for fase in fases}
+    if len(por_nome) != len(fases):
+        raise ValueError("Há fases com nomes repetidos.")
+    pendentes = {}
+    for fase in fases:
+        desconhecidas = set(fase.depende_de) - por_nome.keys()
+        if desconhecidas:
+            raise ValueError(f"Fase '{fase.nome}' depende de fases inexistentes: {sorted(desconhecidas)}")
+        pendentes[fase.nome] = len(set(fase.depende_de))
+
+    ordem = []
+    prontas = [nome for nome, qtd in pendentes.items() if qtd == 0]
+    while prontas:
+        nome = prontas.pop(0)
+        ordem.append(nome)
+        for fase in fases:
+            if nome in fase.depende_de:
+                pendentes[fase.nome] -= 1
+                if pendentes[fase.nome] == 0:
+                    prontas.append(fase.nome)
+    if len(ordem) != len(fases):
+        raise ValueError(f"Ciclo entre as fases: {sorted(set(por_nome) - set(ordem))}")
+    return ordem
+
+
+def _interpretar(dados: Any) -> Tuple[bool, Optional[str]]:
+    # Os run_seed_* devolvem um bool ou um dict com "sucesso"/"erro"; as
+    # funções seed_* devolvem só as contagens (erros viram exceção).
+    if isinstance(dados, bool):
+        return dados, None if dados else "a fase retornou False"
+    if isinstance(dados, dict) and "sucesso" in dados:
+        return bool(dados["sucesso"]), dados.get("erro")
+    return True, None
+
+
+class OrquestradorSeeds:
+    def __init__(self, fases: Sequence[Fase], paralelismo: int = SEED_PARALELISMO,
+                 logger: logging.Logger = None):
+        self.fases = {fase.nome: fase for fase in fases}
+        self.ordem = ordenar_fases(fases)
+        self.paralelismo = max(1, paralelismo)
+        self.logger = logger or setup_logging('seed_orquestrador')
+
+    def _executar_fase(self, fase: Fase, referencia: float) -> ResultadoFase:
+        inicio = time.perf_counter()
+        self.logger.info(f"[{fase.nome}] iniciando")
+        try:
+            dados = fase.executar(self.logger)
+        except Exception as e:
+            self.logger.error(f"[{fase.nome}] falhou: {e}")
+            return ResultadoFase(fase.nome, "erro", inicio - referencia,
+                                 time.perf_counter() - inicio, erro=str(e))
+        duracao = time.perf_counter() - inicio
+        sucesso, erro = _interpretar(dados)
+        linhas = None
+        if sucesso and fase.contar_linhas is not None:
+            linhas = fase.contar_linhas(dados)
+        self.logger.info(f"[{fase.nome}] {'concluída' if sucesso else 'falhou'} em {duracao:.2f}s")
+        return ResultadoFase(fase.nome, "sucesso" if sucesso else "erro", inicio - referencia,
+                             duracao, linhas, erro, dados)
+
+    def executar(self) -> Dict[str, ResultadoFase]:
+        resultados: Dict[str, ResultadoFase] = {}
+        em_execucao: Dict[Future, str] = {}
+        referencia = time.perf_counter()
+
+        def liberadas() -> List[str]:
+            agendadas = set(resultados) | set(em_execucao.values())
+            return [nome for nome in self.ordem
+                    if nome not in agendadas
+                    and all(dep in resultados for dep in self.fases[nome].depende_de)]
+
+        with ThreadPoolExecutor(max_workers=self.paralelismo, thread_name_prefix="seed") as executor:
+            while len(resultados) < len(self.fases):
+                for nome in liberadas():
+                    fase = self.fases[nome]
+                    falhas = [dep for dep in fase.depende_de if not resultados[dep].sucesso]
+                    if falhas:
+                        self.logger.warning(f"[{nome}] pulada: dependência sem sucesso ({', '.join(falhas)})")
+                        resultados[nome] = ResultadoFase(
+                            nome, "pulada", erro=f"dependência sem sucesso: {', '.join(falhas)}")
+                        continue
+                    em_execucao[executor.submit(self._executar_fase, fase, referencia)] = nome
+
+                if not em_execucao:
+                    # Só restavam fases puladas; o laço externo reavalia.
+                    continue
+                concluidas, _ = wait(list(em_execucao), return_when=FIRST_COMPLETED)
+                for futuro in concluidas:
+                    nome = em_execucao.pop(futuro)
+                    resultados[nome] = futuro.result()
+
+        return {nome: resultados[nome] for nome in self.ordem}
+
+
+def imprimir_resumo(resultados: Dict[str, ResultadoFase], duracao_total: float) -> None:
+    print(f"\n{'fase':<22}{'status':<9}{'início (s)':>11}{'duração (s)':>13}{'linhas':>10}")
+    for resultado in resultados.values():
+        linhas = f"{resultado.linhas:,}" if resultado.linhas is not None else "-"
+        print(f"{resultado.nome:<22}{resultado.status:<9}{resultado.inicio:>11.2f}"
+              f"{resultado.duracao:>13.2f}{linhas:>10}")
+        if resultado.erro:
+            print(f"{'':<22}└─ {resultado.erro}")
+    soma = sum(r.duracao for r in resultados.values())
+    print(f"\nTempo total: {duracao_total:.2f}s (soma das fases: {soma:.2f}s)")
@@ -1,7 +1,8 @@
 from pydantic import BaseModel, field_validator, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
-import re
+from app.models.model_endereco import EmpresaEnderecoCreate
+from app.service.cnpj import formatar_cnpj, normalizar_cnpj
 
 
 class Empresa(BaseModel):
@@ -30,10 +31,10 @@ class EmpresaCreate(BaseModel):
 
     @field_validator("cnpj")
     def validar_e_formatar_cnpj(cls, v):
-        cnpj_numerico = re.sub(r'\D', '', v)
-        if len(cnpj_numerico) != 14:
+        cnpj_numerico = normalizar_cnpj(v)
+        if cnpj_numerico is None:
             raise ValueError("CNPJ deve conter 14 dígitos.")
-        return f"{cnpj_numerico[:2]}.{cnpj_numerico[2:5]}.{cnpj_numerico[5:8]}/{cnpj_numerico[8:12]}-{cnpj_numerico[12:]}"
+        return formatar_cnpj(cnpj_numerico)
 
 
 class EmpresaDeleteRequest(BaseModel):
@@ -47,4 +48,43 @@ class EmpresaUpdate(BaseModel):
     responsavel: Optional[str] = Field(None, max_length=100)
     cargo_responsavel: Optional[str] = Field(None, max_length=100)
     site: Optional[str] = Field(None, max_length=255)
-    ativo: Optional[bool] = None
\ No newline at end of file
+    ativo: Optional[bool] = None
+
+
+class EnderecoImportacao(EmpresaEnderecoCreate):
+    # Limites das colunas de `endereco`: numa importação, um valor longo
+    # demais derrubaria o INSERT do lote inteiro.
+    logradouro: str = Field(..., min_length=1, max_length=255)
+    numero: str = Field(..., min_length=1, max_length=20)
+    bairro: str = Field(..., min_length=1, max_length=100)
+    cep: str = Field(..., min_length=1, max_length=10)
+    cidade: str = Field(..., min_length=1, max_length=100)
+    uf: str = Field(..., min_length=2, max_length=2)
+    complemento: Optional[str] = Field(None, max_length=255)
+
+
+class EmpresaImportacao(EmpresaCreate):
+    usuario_id: str = Field(..., min_length=1, max_length=40)
+    endereco: Optional[EnderecoImportacao] = None
+    ramos: List[int] = []
+
+
+class ErroImportacao(BaseModel):
+    linha: int
+    cnpj: Optional[str] = None
+    erros: List[str]
+
+
+class EmpresaImportada(BaseModel):
+    linha: int
+    id: int
+    cnpj: str
+
+
+class ResultadoImportacao(BaseModel):
+    total_linhas: int
+    importadas: int
+    com_erro: int
+    validar_apenas: bool
+    empresas: List[EmpresaImportada]
+    erros: List[ErroImportacao]
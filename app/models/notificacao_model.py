@@ -21,4 +21,12 @@ class Notificacao(NotificacaoBase):
 class NotificacaoUpdate(BaseModel):
     mensagem: Optional[str] = None
     tipo: Optional[str] = None
-    lida: Optional[bool] = None
\ No newline at end of file
+    lida: Optional[bool] = None
+
+class NotificacoesNaoLidas(BaseModel):
+    id_empresa: int
+    nao_lidas: int
+
+class TicketStream(BaseModel):
+    ticket: str
+    expira_em: int
@@ -37,6 +37,25 @@ class ConcederSeloRequest(BaseModel):
         365, gt=0, description="Número de dias que o selo será válido.")
 
 
+class ProcessarSolicitacoesLoteRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=500,
+                           description="IDs da tabela 'empresa_selo' a processar.")
+    acao: Literal["aprovar", "recusar"]
+
+
+class ResultadoSolicitacaoLote(BaseModel):
+    id: int
+    resultado: Literal["aprovado", "recusado", "nao_encontrado", "status_invalido"]
+    status_anterior: Optional[str] = None
+    data_emissao: Optional[date] = None
+    data_expiracao: Optional[date] = None
+
+
+class ProcessarSolicitacoesLoteResponse(BaseModel):
+    processados: int
+    resultados: List[ResultadoSolicitacaoLote]
+
+
 class SeloConcedido(BaseModel):
     id: int
     id_empresa: int
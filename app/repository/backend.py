@@ -0,0 +1,38 @@
+from functools import wraps
+from types import ModuleType
+from fastapi.concurrency import run_in_threadpool
+from app.database.async_config import get_db_backend
+from app.repository import ibdn_user_repository, ibdn_user_repository_async
+from app.repository import ibdn_profiles_repository, ibdn_profiles_repository_async
+
+
+class _ThreadpoolRepository:
+    """
+    Expõe as funções `repo_*` de um repositório síncrono como corrotinas,
+    executando cada chamada no threadpool para não bloquear o event loop.
+    """
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str):
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await run_in_threadpool(func, *args, **kwargs)
+
+        setattr(self, name, wrapper)
+        return wrapper
+
+
+def _select(sync_module: ModuleType, async_module: ModuleType):
+    if get_db_backend() == 'async':
+        return async_module
+    return _ThreadpoolRepository(sync_module)
+
+
+users_repo = _select(ibdn_user_repository, ibdn_user_repository_async)
+profiles_repo = _select(ibdn_profiles_repository, ibdn_profiles_repository_async)
@@ -46,12 +46,12 @@ def remover_associacao(id_empresa: int, id_ramo: int) -> bool:
     except mysql.connector.Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao remover associação: {err}")
     
+_RAMOS_DA_EMPRESA_QUERY = """SELECT r.id, r.nome, r.descricao FROM ramo r INNER JOIN empresa_ramo er ON r.id = er.id_ramo WHERE er.id_empresa = %s"""
+
 def listar_ramo_por_empresa(id_empresa: int) -> List[RamoBase]:
     try:
         with get_cursor() as cursor:
-            cursor.execute(
-            """SELECT r.id, r.nome, r.descricao FROM ramo r INNER JOIN empresa_ramo er ON r.id = er.id_ramo WHERE er.id_empresa = %s""", (id_empresa,)
-            )
+            cursor.execute(_RAMOS_DA_EMPRESA_QUERY, (id_empresa,))
 
             rows = cursor.fetchall()
             ramos = [RamoBase(**row) for row in rows]
@@ -1,6 +1,7 @@
 import mysql.connector
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from app.database.connection import get_db_connection
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
 from app.models.empresas_model import Empresa, EmpresaCreate, EmpresaUpdate
 
 
@@ -15,12 +16,26 @@ def repo_get_empresa_by_id(empresa_id: int) -> Optional[Dict[str, Any]]:
         conn.close()
 
 
-def repo_get_all_empresas() -> List[Dict[str, Any]]:
+def _build_empresas_page_query(limit: int, posicao: Optional[List[Any]]) -> Tuple[str, List[Any]]:
+    query = "SELECT * FROM empresa WHERE ativo = TRUE"
+    params: List[Any] = []
+    if posicao:
+        condicao, condicao_params = keyset_condition("id", posicao[0])
+        query += f" AND {condicao}"
+        params += condicao_params
+    query += " ORDER BY id LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+
+def repo_get_all_empresas(limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    posicao = decode_cursor("empresas", cursor_token, 1)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute("SELECT * FROM empresa WHERE ativo = TRUE")
-        return cursor.fetchall()
+        query, params = _build_empresas_page_query(limit, posicao)
+        cursor.execute(query, tuple(params))
+        return montar_pagina("empresas", cursor.fetchall(), limit, lambda e: [e["id"]])
     finally:
         cursor.close()
         conn.close()
@@ -1,14 +1,28 @@
 from mysql.connector import Error
 from fastapi import HTTPException
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 from app.database.config import get_cursor
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
 from app.models.model_endereco import EmpresaEnderecoCreate, EmpresaEnderecoUpdate
 
-def get_enderecos_by_empresa(empresa_id: int) -> List[Dict]:
+def _build_enderecos_page_query(empresa_id: int, limit: int, posicao: Optional[List]) -> Tuple[str, List]:
+    query = "SELECT * FROM endereco WHERE id_empresa = %s"
+    params = [empresa_id]
+    if posicao:
+        condicao, condicao_params = keyset_condition("id", posicao[0])
+        query += f" AND {condicao}"
+        params += condicao_params
+    query += " ORDER BY id LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+def get_enderecos_by_empresa(empresa_id: int, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+    posicao = decode_cursor("enderecos", cursor_token, 1)
     try:
         with get_cursor() as cursor:
-            cursor.execute("SELECT * FROM endereco WHERE id_empresa = %s", (empresa_id,))
-            return cursor.fetchall()
+            query, params = _build_enderecos_page_query(empresa_id, limit, posicao)
+            cursor.execute(query, tuple(params))
+            return montar_pagina("enderecos", cursor.fetchall(), limit, lambda e: [e["id"]])
     except Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao buscar endereços: {err}")
 
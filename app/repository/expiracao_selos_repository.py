@@ -0,0 +1,168 @@
+from collections import Counter
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from app.database.config import get_pool
+from app.repository.versoes_repository import ajustar_nao_lidas, registrar_alteracao
+from app.service.notificacoes_hub import publicar_evento
+
+# Os candidatos são travados em lotes (SELECT ... FOR UPDATE) e cada lote é
+# resolvido com um INSERT ... SELECT de notificações e um único UPDATE.
+SELECIONAR_EXPIRADOS = """
+    SELECT id, id_empresa FROM empresa_selo
+    WHERE status = 'Ativo' AND data_expiracao < CURDATE()
+    ORDER BY data_expiracao, id
+    LIMIT %s
+    FOR UPDATE
+"""
+
+# O intervalo por linha (dias_alerta_previo) não usa índice; o limite fixo
+# `janela_maxima` mantém a busca como um range em (status, data_expiracao).
+SELECIONAR_ALERTAS = """
+    SELECT id, id_empresa FROM empresa_selo
+    WHERE status = 'Ativo'
+      AND data_expiracao >= CURDATE()
+      AND data_expiracao <= CURDATE() + INTERVAL %s DAY
+      AND data_expiracao <= CURDATE() + INTERVAL LEAST(COALESCE(dias_alerta_previo, %s), %s) DAY
+      AND (alerta_enviado IS NULL OR alerta_enviado = FALSE)
+    ORDER BY data_expiracao, id
+    LIMIT %s
+    FOR UPDATE
+"""
+
+
+def parametros_alertas(dias_alerta_padrao: int, janela_maxima: int) -> tuple:
+    """Parâmetros de SELECIONAR_ALERTAS antes do LIMIT."""
+    return (janela_maxima, dias_alerta_padrao, janela_maxima)
+
+
+NOTIFICAR_EXPIRADOS = """
+    INSERT INTO notificacao (id_empresa, mensagem, data_envio, tipo, lida)
+    SELECT es.id_empresa,
+           CONCAT('O selo ', s.nome, ' (', s.sigla, ') expirou em ',
+                  DATE_FORMAT(es.data_expiracao, '%%d/%%m/%%Y'),
+                  '. Solicite a renovação para manter sua certificação.'),
+           NOW(), 'selo_expirado', FALSE
+    FROM empresa_selo es
+    JOIN selo s ON s.id = es.id_selo
+    WHERE es.id IN ({ids})
+"""
+
+NOTIFICAR_ALERTAS = """
+    INSERT INTO notificacao (id_empresa, mensagem, data_envio, tipo, lida)
+    SELECT es.id_empresa,
+           CONCAT('Atenção! O selo ', s.nome, ' (', s.sigla, ') expira em ',
+                  DATEDIFF(es.data_expiracao, CURDATE()), ' dia(s), no dia ',
+                  DATE_FORMAT(es.data_expiracao, '%%d/%%m/%%Y'), '.'),
+           NOW(), 'alerta_expiracao', FALSE
+    FROM empresa_selo es
+    JOIN selo s ON s.id = es.id_selo
+    WHERE es.id IN ({ids})
+"""
+
+
+def _placeholders(ids: List[int]) -> str:
+    return ", ".join(["%s"] * len(ids))
+
+
+def _processar_em_lotes(conn, cursor, selecionar: str, selecionar_params: tuple,
+                        notificar: str, atualizar: str, contadores: Tuple[str, ...],
+                        lote: int, tipo_notificacao: str,
+                        novo_status: Optional[str] = None) -> List[Dict[str, int]]:
+    processados = []
+    while True:
+        cursor.execute(selecionar, selecionar_params + (lote,))
+        linhas = cursor.fetchall()
+        ids = [row["id"] for row in linhas]
+        if not ids:
+            conn.commit()
+            break
+
+        marcadores = _placeholders(ids)
+        cursor.execute(notificar.format(ids=marcadores), ids)
+        cursor.execute(atualizar.format(ids=marcadores), ids)
+        for contador in contadores:
+            registrar_alteracao(cursor, contador, [row["id_empresa"] for row in linhas])
+        # Uma notificação não lida por selo do lote.
+        ajustar_nao_lidas(cursor, Counter(row["id_empresa"] for row in linhas))
+        processados += linhas
+        conn.commit()
+
+        # As notificações foram geradas por INSERT ... SELECT (sem ids); o
+        # evento só avisa o cliente para recarregar a lista.
+        for row in linhas:
+            if novo_status:
+                publicar_evento(row["id_empresa"], {"evento": "selo", "id": row["id"], "status": novo_status})
+            publicar_evento(row["id_empresa"], {"evento": "notificacoes_novas", "tipo": tipo_notificacao,
+                                                "id_empresa_selo": row["id"]})
+
+        if len(ids) < lote:
+            break
+    return processados
+
+
+def _inicio_se_pendente(conn, cursor, nome: str, intervalo_minimo: float) -> Optional[datetime]:
+    """
+    Horário de início (relógio do banco, comum a todos os workers) para uma
+    execução de `nome`, ou None se outra terminou com sucesso tendo começado
+    há menos de `intervalo_minimo` segundos. Chamado com o lock nomeado já
+    obtido, que impede execuções simultâneas.
+    """
+    cursor.execute(
+        "SELECT NOW(6) AS agora, (SELECT ultima_execucao > NOW(6) - INTERVAL %s MICROSECOND "
+        "FROM scheduler_execucao WHERE nome = %s) AS recente",
+        (int(intervalo_minimo * 1_000_000), nome))
+    linha = cursor.fetchone()
+    conn.commit()
+    return None if linha["recente"] else linha["agora"]
+
+
+def _registrar_execucao(conn, cursor, nome: str, inicio: datetime) -> None:
+    # Só depois do ciclo completo: se ele falhar, o próximo tick (de qualquer
+    # worker) tenta de novo em vez de esperar um intervalo inteiro.
+    cursor.execute(
+        "INSERT INTO scheduler_execucao (nome, ultima_execucao) VALUES (%s, %s) "
+        "ON DUPLICATE KEY UPDATE ultima_execucao = VALUES(ultima_execucao)",
+        (nome, inicio))
+    conn.commit()
+
+
+def repo_processar_expiracao_selos(lock_name: str, dias_alerta_padrao: int,
+                                   janela_maxima: int, lote: int,
+                                   intervalo_minimo: float = 0) -> Optional[Dict[str, list]]:
+    """
+    Executa um ciclo de alertas e expirações. Retorna None quando outro
+    processo detém o lock (ou seja, está executando este ciclo) ou quando
+    um ciclo concluído começou nos últimos `intervalo_minimo` segundos.
+    """
+    conn = get_pool().acquire()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("SELECT GET_LOCK(%s, 0) AS obtido", (lock_name,))
+        if not cursor.fetchone()["obtido"]:
+            return None
+        try:
+            inicio = _inicio_se_pendente(conn, cursor, lock_name, intervalo_minimo)
+            if inicio is None:
+                return None
+            expirados = _processar_em_lotes(
+                conn, cursor, SELECIONAR_EXPIRADOS, (), NOTIFICAR_EXPIRADOS,
+                "UPDATE empresa_selo SET status = 'Expirado' WHERE id IN ({ids})",
+                ("versao_selos", "versao_notificacoes"), lote,
+                "selo_expirado", 'Expirado')
+            alertados = _processar_em_lotes(
+                conn, cursor, SELECIONAR_ALERTAS,
+                parametros_alertas(dias_alerta_padrao, janela_maxima), NOTIFICAR_ALERTAS,
+                "UPDATE empresa_selo SET alerta_enviado = TRUE WHERE id IN ({ids})",
+                ("versao_notificacoes",), lote, "alerta_expiracao")
+            _registrar_execucao(conn, cursor, lock_name, inicio)
+            return {"expirados": expirados, "alertados": alertados}
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+            cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
@@ -0,0 +1,88 @@
+import os
+from typing import Iterator, List, Tuple
+
+from fastapi import HTTPException
+from mysql.connector import Error
+
+from app.database.connection import get_db_connection
+
+EXPORTACAO_LOTE = int(os.getenv("EXPORTACAO_LOTE", 1000))
+# O servidor derruba a conexão se o cliente não consumir o resultado dentro de
+# net_write_timeout; downloads lentos precisam de uma folga maior que o padrão.
+EXPORTACAO_NET_WRITE_TIMEOUT = int(os.getenv("EXPORTACAO_NET_WRITE_TIMEOUT", 600))
+
+CONSULTAS = {
+    "empresas": """
+        SELECT id, cnpj, razao_social, nome_fantasia, usuario_id, telefone, responsavel,
+               cargo_responsavel, site, data_cadastro, ativo
+        FROM empresa ORDER BY id
+    """,
+    "selos": """
+        SELECT es.id, es.id_empresa, es.id_selo, s.sigla AS sigla_selo, es.status,
+               es.data_emissao, es.data_expiracao, es.codigo_selo, es.plano_solicitado_anos
+        FROM empresa_selo es
+        JOIN selo s ON s.id = es.id_selo
+        ORDER BY es.id
+    """,
+    "notificacoes": """
+        SELECT id, id_empresa, tipo, mensagem, data_envio, lida
+        FROM notificacao ORDER BY id
+    """,
+}
+
+# Colunas BOOLEAN chegam do MySQL como 0/1.
+COLUNAS_BOOLEANAS = {"ativo", "lida"}
+
+
+class CursorExportacao:
+    """
+    Resultado lido do servidor aos poucos (cursor não bufferizado), em lotes
+    de `fetchmany`, para que a memória não cresça com o tamanho da tabela.
+
+    A consulta é executada no construtor, então erros de conexão/SQL ainda
+    viram uma resposta HTTP normal antes do streaming começar.
+    """
+
+    def __init__(self, recurso: str, lote: int = EXPORTACAO_LOTE):
+        self._lote = lote
+        self._concluido = False
+        self._conn = get_db_connection()
+        try:
+            self._cursor = self._conn.cursor(buffered=False)
+            self._cursor.execute("SET SESSION net_write_timeout = %s", (EXPORTACAO_NET_WRITE_TIMEOUT,))
+            self._cursor.execute(CONSULTAS[recurso])
+            self.colunas: Tuple[str, ...] = tuple(self._cursor.column_names)
+        except Error as e:
+            self._conn.invalidate()
+            self._conn.close()
+            raise HTTPException(status_code=500, detail=f"Erro ao iniciar exportação: {e}")
+
+    def lotes(self) -> Iterator[List[tuple]]:
+        try:
+            while True:
+                linhas = self._cursor.fetchmany(self._lote)
+                if not linhas:
+                    self._concluido = True
+                    return
+                yield linhas
+        finally:
+            self.fechar()
+
+    def fechar(self) -> None:
+        conn, self._conn = self._conn, None
+        if conn is None:
+            return
+        if self._concluido:
+            try:
+                self._cursor.close()
+                cursor = conn.cursor()
+                cursor.execute("SET SESSION net_write_timeout = DEFAULT")
+                cursor.close()
+            except Error:
+                conn.invalidate()
+        else:
+            # Cliente desconectou no meio: ainda há linhas pendentes no socket.
+            # Ler o resto só para devolver a conexão custaria a tabela inteira,
+            # então a conexão é descartada.
+            conn.invalidate()
+        conn.close()
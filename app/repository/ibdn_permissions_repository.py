@@ -2,6 +2,7 @@ from typing import List, Optional, Dict, Any
 from fastapi import HTTPException
 from mysql.connector import Error
 from app.database.connection import get_db_connection
+from app.repository.ibdn_profiles_repository import invalidate_perfis_cache
 
 
 def repo_create_ibdn_permissao(permissao_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -66,6 +67,7 @@ def repo_update_ibdn_permissao(permissao_id: str, nome: str) -> Optional[Dict[st
         cursor.execute(
             "UPDATE ibdn_permissoes SET nome = %s WHERE id = %s", (nome, permissao_id))
         conn.commit()
+        invalidate_perfis_cache()
         return {"id": permissao_id, "nome": nome}
     except Error as e:
         conn.rollback()
@@ -88,6 +90,7 @@ def repo_delete_ibdn_permissao(permissao_id: str) -> bool:
         cursor.execute(
             "DELETE FROM ibdn_permissoes WHERE id = %s", (permissao_id,))
         conn.commit()
+        invalidate_perfis_cache()
         return cursor.rowcount > 0
     except Error as e:
         conn.rollback()
@@ -1,8 +1,56 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 from mysql.connector import Error
 from app.database.connection import get_db_connection
+from app.service.cache import TTLCache
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
 import json
+import os
+
+_perfis_cache = TTLCache(
+    maxsize=int(os.getenv('PERFIS_CACHE_MAXSIZE', 256)),
+    ttl=float(os.getenv('PERFIS_CACHE_TTL', 300)),
+    name="perfis"
+)
+
+
+def invalidate_perfis_cache(*perfil_ids: str) -> None:
+    if perfil_ids:
+        _perfis_cache.invalidate(*perfil_ids)
+    else:
+        _perfis_cache.clear()
+
+
+def get_perfis_cache_stats() -> Dict[str, Any]:
+    return _perfis_cache.stats()
+
+
+def _copiar_perfil(perfil: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": perfil["id"],
+        "nome": perfil["nome"],
+        "permissoes": [dict(p) for p in perfil["permissoes"]]
+    }
+
+
+def _perfis_em_cache(perfil_ids: List[str]):
+    ids = list(dict.fromkeys(p_id for p_id in perfil_ids if p_id))
+    encontrados: Dict[str, Dict[str, Any]] = {}
+    faltantes: List[str] = []
+    for p_id in ids:
+        perfil = _perfis_cache.get(p_id)
+        if perfil is None:
+            faltantes.append(p_id)
+        else:
+            encontrados[p_id] = _copiar_perfil(perfil)
+    return encontrados, faltantes
+
+
+def _guardar_perfis_em_cache(carregados: Dict[str, Dict[str, Any]], encontrados: Dict[str, Dict[str, Any]], geracao: int) -> Dict[str, Dict[str, Any]]:
+    for p_id, perfil in carregados.items():
+        _perfis_cache.set(p_id, perfil, generation=geracao)
+        encontrados[p_id] = _copiar_perfil(perfil)
+    return encontrados
 
 
 def repo_create_ibdn_perfil(perfil_data: Dict[str, Any], permissoes_ids: List[str]) -> Dict[str, Any]:
@@ -18,6 +66,7 @@ def repo_create_ibdn_perfil(perfil_data: Dict[str, Any], permissoes_ids: List[st
                                 for p_id in permissoes_ids]
             cursor.executemany(assoc_query, dados_associacao)
         conn.commit()
+        invalidate_perfis_cache(perfil_data['id'])
         return perfil_data
     except Error as e:
         conn.rollback()
@@ -37,38 +86,81 @@ def repo_create_ibdn_perfil(perfil_data: Dict[str, Any], permissoes_ids: List[st
 
 
 def repo_get_ibdn_perfil_by_id_with_permissions(perfil_id: str) -> Optional[Dict[str, Any]]:
+    return repo_get_ibdn_perfis_by_ids_with_permissions([perfil_id]).get(perfil_id)
+
+
+_PERFIS_COM_PERMISSOES_QUERY = """
+    SELECT
+        pf.id,
+        pf.nome,
+        perm.id AS permissao_id,
+        perm.nome AS permissao_nome
+    FROM ibdn_perfis pf
+    LEFT JOIN ibdn_perfil_permissoes ipp ON pf.id = ipp.perfil_id
+    LEFT JOIN ibdn_permissoes perm ON ipp.permissao_id = perm.id
+    WHERE pf.id IN ({placeholders})
+    ORDER BY pf.id, perm.nome
+"""
+
+
+def _build_perfis_query(perfil_ids: List[str]) -> str:
+    return _PERFIS_COM_PERMISSOES_QUERY.format(
+        placeholders=", ".join(["%s"] * len(perfil_ids)))
+
+
+def _montar_perfis(rows: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    perfis: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        perfil = perfis.get(row["id"])
+        if perfil is None:
+            perfil = {"id": row["id"], "nome": row["nome"], "permissoes": []}
+            perfis[row["id"]] = perfil
+        if row.get("permissao_id") is not None:
+            perfil["permissoes"].append(
+                {"id": row["permissao_id"], "nome": row["permissao_nome"]})
+    return perfis
+
+
+def repo_get_ibdn_perfis_by_ids_with_permissions(perfil_ids: List[str], cursor=None) -> Dict[str, Dict[str, Any]]:
+    encontrados, faltantes = _perfis_em_cache(perfil_ids)
+    if not faltantes:
+        return encontrados
+
+    geracao = _perfis_cache.generation
+    if cursor is not None:
+        cursor.execute(_build_perfis_query(faltantes), tuple(faltantes))
+        carregados = _montar_perfis(cursor.fetchall())
+        return _guardar_perfis_em_cache(carregados, encontrados, geracao)
+
     conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    perfil = None
+    own_cursor = conn.cursor(dictionary=True)
     try:
-        cursor.execute(
-            "SELECT id, nome FROM ibdn_perfis WHERE id = %s", (perfil_id,))
-        perfil = cursor.fetchone()
-        if not perfil:
-            return None
-        perm_query = """
-            SELECT p.id, p.nome
-            FROM ibdn_permissoes p
-            JOIN ibdn_perfil_permissoes ipp ON p.id = ipp.permissao_id
-            WHERE ipp.perfil_id = %s
-            ORDER BY p.nome
-        """
-        cursor.execute(perm_query, (perfil_id,))
-        permissoes = cursor.fetchall()
-        perfil['permissoes'] = permissoes if permissoes else []
-        return perfil
+        own_cursor.execute(_build_perfis_query(faltantes), tuple(faltantes))
+        carregados = _montar_perfis(own_cursor.fetchall())
+        return _guardar_perfis_em_cache(carregados, encontrados, geracao)
     finally:
-        if cursor:
-            cursor.close()
+        if own_cursor:
+            own_cursor.close()
         if conn and conn.is_connected():
             conn.close()
 
 
-def repo_get_all_ibdn_perfis_with_permissions(skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+def repo_get_all_ibdn_perfis_with_permissions(skip: int = 0, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    posicao = decode_cursor("perfis", cursor_token, 2)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        query = """
+        where = ""
+        params: List[Any] = []
+        if posicao:
+            where, params = keyset_condition("p.id", posicao[1], "ASC", "p.nome", posicao[0])
+            where = f"WHERE {where}"
+        params.append(limit + 1)
+        offset = ""
+        if not posicao and skip:
+            offset = "OFFSET %s"
+            params.append(skip)
+        query = f"""
             SELECT
                 p.id,
                 p.nome,
@@ -81,14 +173,16 @@ def repo_get_all_ibdn_perfis_with_permissions(skip: int = 0, limit: int = 100) -
                 ibdn_perfil_permissoes ipp ON p.id = ipp.perfil_id
             LEFT JOIN
                 ibdn_permissoes perm ON ipp.permissao_id = perm.id
+            {where}
             GROUP BY
                 p.id, p.nome
             ORDER BY
-                p.nome
-            LIMIT %s OFFSET %s;
+                p.nome, p.id
+            LIMIT %s {offset};
         """
-        cursor.execute(query, (limit, skip))
-        perfis_db = cursor.fetchall()
+        cursor.execute(query, tuple(params))
+        perfis_db, proximo_cursor = montar_pagina(
+            "perfis", cursor.fetchall(), limit, lambda p: [p["nome"], p["id"]])
 
         for perfil in perfis_db:
             permissoes_str = perfil.get('permissoes')
@@ -101,7 +195,7 @@ def repo_get_all_ibdn_perfis_with_permissions(skip: int = 0, limit: int = 100) -
             elif permissoes_str is None:
                 perfil['permissoes'] = []
 
-        return perfis_db
+        return perfis_db, proximo_cursor
     finally:
         if cursor:
             cursor.close()
@@ -131,6 +225,7 @@ def repo_update_ibdn_perfil(perfil_id: str, nome: Optional[str], permissoes_ids:
                                     for p_id in permissoes_ids]
                 cursor.executemany(assoc_query, dados_associacao)
         conn.commit()
+        invalidate_perfis_cache(perfil_id)
         return repo_get_ibdn_perfil_by_id_with_permissions(perfil_id)
     except Error as e:
         conn.rollback()
@@ -155,6 +250,7 @@ def repo_delete_ibdn_perfil(perfil_id: str) -> bool:
     try:
         cursor.execute("DELETE FROM ibdn_perfis WHERE id = %s", (perfil_id,))
         conn.commit()
+        invalidate_perfis_cache(perfil_id)
         return cursor.rowcount > 0
     except Error as e:
         conn.rollback()
@@ -177,6 +273,7 @@ def repo_add_permissao_to_perfil(perfil_id: str, permissao_id: str) -> bool:
         query = "INSERT INTO ibdn_perfil_permissoes (perfil_id, permissao_id) VALUES (%s, %s)"
         cursor.execute(query, (perfil_id, permissao_id))
         conn.commit()
+        invalidate_perfis_cache(perfil_id)
         return True
     except Error as e:
         conn.rollback()
@@ -202,6 +299,7 @@ def repo_remove_permissao_from_perfil(perfil_id: str, permissao_id: str) -> bool
         query = "DELETE FROM ibdn_perfil_permissoes WHERE perfil_id = %s AND permissao_id = %s"
         cursor.execute(query, (perfil_id, permissao_id))
         conn.commit()
+        invalidate_perfis_cache(perfil_id)
         return cursor.rowcount > 0
     except Error as e:
         conn.rollback()
@@ -0,0 +1,30 @@
+from typing import List, Optional, Dict, Any
+from app.database.async_config import get_async_cursor
+from app.repository.ibdn_profiles_repository import (
+    _build_perfis_query,
+    _montar_perfis,
+    _perfis_cache,
+    _perfis_em_cache,
+    _guardar_perfis_em_cache,
+)
+
+
+async def repo_get_ibdn_perfis_by_ids_with_permissions(perfil_ids: List[str], cursor=None) -> Dict[str, Dict[str, Any]]:
+    encontrados, faltantes = _perfis_em_cache(perfil_ids)
+    if not faltantes:
+        return encontrados
+
+    geracao = _perfis_cache.generation
+    if cursor is not None:
+        await cursor.execute(_build_perfis_query(faltantes), tuple(faltantes))
+        carregados = _montar_perfis(await cursor.fetchall())
+        return _guardar_perfis_em_cache(carregados, encontrados, geracao)
+
+    async with get_async_cursor() as own_cursor:
+        await own_cursor.execute(_build_perfis_query(faltantes), tuple(faltantes))
+        carregados = _montar_perfis(await own_cursor.fetchall())
+        return _guardar_perfis_em_cache(carregados, encontrados, geracao)
+
+
+async def repo_get_ibdn_perfil_by_id_with_permissions(perfil_id: str) -> Optional[Dict[str, Any]]:
+    return (await repo_get_ibdn_perfis_by_ids_with_permissions([perfil_id])).get(perfil_id)
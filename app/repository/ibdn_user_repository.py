@@ -1,10 +1,11 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from fastapi import HTTPException
 from mysql.connector import Error
 from app.database.connection import get_db_connection
 from app.models.ibdn_user_model import IbdnUsuarioCreate, IbdnUsuarioUpdate
 from app.security.password import get_password_hash
-from app.repository.ibdn_profiles_repository import repo_get_ibdn_perfil_by_id_with_permissions
+from app.repository.ibdn_profiles_repository import repo_get_ibdn_perfis_by_ids_with_permissions
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
 
 
 def _get_profile_id_by_name(name: str, cursor) -> Optional[str]:
@@ -32,10 +33,20 @@ def _map_user_db_to_schema(user_db_data: Dict[str, Any], perfil_completo: Option
     return user_data_mapped
 
 
+def _map_users_with_perfis(usuarios_db: List[Dict[str, Any]], cursor) -> List[Dict[str, Any]]:
+    perfis = repo_get_ibdn_perfis_by_ids_with_permissions(
+        [u.get("perfil_id") for u in usuarios_db], cursor)
+    return [
+        _map_user_db_to_schema(u, perfis.get(u.get("perfil_id")))
+        for u in usuarios_db
+    ]
+
+
 def repo_create_ibdn_usuario(usuario_data: IbdnUsuarioCreate) -> Optional[Dict[str, Any]]:
+    # Calcula o hash antes de pegar a conexão para não segurá-la durante o bcrypt.
+    hashed_password = get_password_hash(usuario_data.senha)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    hashed_password = get_password_hash(usuario_data.senha)
     try:
         perfil_id = usuario_data.perfil_id
         if not perfil_id:
@@ -92,12 +103,7 @@ def repo_get_ibdn_usuario_by_id(usuario_id: str, include_password_hash: bool = F
         if not user_db_data:
             return None
 
-        perfil_completo = None
-        if user_db_data.get("perfil_id"):
-            perfil_completo = repo_get_ibdn_perfil_by_id_with_permissions(
-                user_db_data["perfil_id"])
-
-        return _map_user_db_to_schema(user_db_data, perfil_completo)
+        return _map_users_with_perfis([user_db_data], cursor)[0]
     finally:
         if cursor:
             cursor.close()
@@ -120,12 +126,7 @@ def repo_get_ibdn_usuario_by_email(email: str, include_password_hash: bool = Fal
         if not user_db_data:
             return None
 
-        perfil_completo = None
-        if user_db_data.get("perfil_id"):
-            perfil_completo = repo_get_ibdn_perfil_by_id_with_permissions(
-                user_db_data["perfil_id"])
-
-        mapped_user = _map_user_db_to_schema(user_db_data, perfil_completo)
+        mapped_user = _map_users_with_perfis([user_db_data], cursor)[0]
         if user_db_data.get("empresa_id"):
             mapped_user["empresa_id"] = user_db_data["empresa_id"]
 
@@ -138,24 +139,77 @@ def repo_get_ibdn_usuario_by_email(email: str, include_password_hash: bool = Fal
             conn.close()
 
 
-def repo_get_all_ibdn_usuarios(skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
+_EMPRESA_DO_USUARIO_QUERY = "SELECT id FROM empresa WHERE usuario_id = %s"
+
+_LOGIN_CREDENCIAIS_QUERY = """
+    SELECT
+        u.id,
+        u.email,
+        u.senha_hash,
+        e.id AS empresa_id,
+        perm.nome AS permissao_nome
+    FROM ibdn_usuarios u
+    LEFT JOIN empresa e ON e.usuario_id = u.id
+    LEFT JOIN ibdn_perfil_permissoes ipp ON ipp.perfil_id = u.perfil_id
+    LEFT JOIN ibdn_permissoes perm ON perm.id = ipp.permissao_id
+    WHERE u.email = %s
+"""
+
+
+def _montar_login_credenciais(rows: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not rows:
+        return None
+    primeiro = rows[0]
+    return {
+        "id": primeiro["id"],
+        "email": primeiro["email"],
+        "senha_hash": primeiro["senha_hash"],
+        "empresa_id": primeiro["empresa_id"],
+        "permissoes": sorted({r["permissao_nome"] for r in rows if r["permissao_nome"]}),
+    }
+
+
+def repo_get_login_credenciais(email: str) -> Optional[Dict[str, Any]]:
+    # Uma única ida ao banco: usa os índices UNIQUE de ibdn_usuarios.email e
+    # empresa.usuario_id e a PK (perfil_id, permissao_id) de ibdn_perfil_permissoes.
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
-    usuarios_finais = []
     try:
-        query = "SELECT id, nome, email, perfil_id, ativo, twofactor FROM ibdn_usuarios ORDER BY nome LIMIT %s OFFSET %s"
-        cursor.execute(query, (limit, skip))
-        usuarios_db = cursor.fetchall()
-
-        for user_db_data in usuarios_db:
-            perfil_completo = None
-            if user_db_data.get("perfil_id"):
-                perfil_completo = repo_get_ibdn_perfil_by_id_with_permissions(
-                    user_db_data["perfil_id"])
-            usuarios_finais.append(_map_user_db_to_schema(
-                user_db_data, perfil_completo))
-
-        return usuarios_finais
+        cursor.execute(_LOGIN_CREDENCIAIS_QUERY, (email,))
+        return _montar_login_credenciais(cursor.fetchall())
+    finally:
+        if cursor:
+            cursor.close()
+        if conn and conn.is_connected():
+            conn.close()
+
+
+def _build_usuarios_page_query(limit: int, skip: int, posicao: Optional[List[Any]]) -> Tuple[str, List[Any]]:
+    query = "SELECT id, nome, email, perfil_id, ativo, twofactor FROM ibdn_usuarios"
+    params: List[Any] = []
+    if posicao:
+        condicao, params = keyset_condition("id", posicao[1], "ASC", "nome", posicao[0])
+        query += f" WHERE {condicao}"
+    query += " ORDER BY nome, id LIMIT %s"
+    params.append(limit + 1)
+    if not posicao and skip:
+        # OFFSET mantido só por compatibilidade; prefira o cursor.
+        query += " OFFSET %s"
+        params.append(skip)
+    return query, params
+
+
+def repo_get_all_ibdn_usuarios(skip: int = 0, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    posicao = decode_cursor("usuarios", cursor_token, 2)
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        query, params = _build_usuarios_page_query(limit, skip, posicao)
+        cursor.execute(query, tuple(params))
+        usuarios_db, proximo_cursor = montar_pagina(
+            "usuarios", cursor.fetchall(), limit, lambda u: [u["nome"], u["id"]])
+
+        return _map_users_with_perfis(usuarios_db, cursor), proximo_cursor
     finally:
         if cursor:
             cursor.close()
@@ -164,6 +218,11 @@ def repo_get_all_ibdn_usuarios(skip: int = 0, limit: int = 100) -> List[Dict[str
 
 
 def repo_update_ibdn_usuario(usuario_id: str, usuario_data: IbdnUsuarioUpdate) -> Optional[Dict[str, Any]]:
+    update_dict = usuario_data.model_dump(exclude_unset=True)
+    hashed_password = None
+    if "senha" in update_dict:
+        hashed_password = get_password_hash(update_dict["senha"])
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
 
@@ -178,8 +237,6 @@ def repo_update_ibdn_usuario(usuario_id: str, usuario_data: IbdnUsuarioUpdate) -
     fields_to_update = []
     params = []
 
-    update_dict = usuario_data.model_dump(exclude_unset=True)
-
     if "nome" in update_dict:
         fields_to_update.append("nome = %s")
         params.append(update_dict["nome"])
@@ -188,7 +245,7 @@ def repo_update_ibdn_usuario(usuario_id: str, usuario_data: IbdnUsuarioUpdate) -
         params.append(update_dict["email"])
     if "senha" in update_dict:
         fields_to_update.append("senha_hash = %s")
-        params.append(get_password_hash(update_dict["senha"]))
+        params.append(hashed_password)
     if "perfil_id" in update_dict:
         fields_to_update.append("perfil_id = %s")
         params.append(update_dict["perfil_id"])
@@ -234,8 +291,7 @@ def repo_delete_ibdn_usuario(usuario_id: str) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute(
-            "SELECT id FROM empresa WHERE usuario_id = %s", (usuario_id,))
+        cursor.execute(_EMPRESA_DO_USUARIO_QUERY, (usuario_id,))
         if cursor.fetchone():
             raise HTTPException(
                 status_code=409,
@@ -0,0 +1,202 @@
+from typing import List, Optional, Dict, Any, Tuple
+from fastapi import HTTPException
+from pymysql.err import MySQLError
+from app.database.async_config import get_async_cursor
+from app.models.ibdn_user_model import IbdnUsuarioCreate, IbdnUsuarioUpdate
+from app.security.password import get_password_hash_async
+from app.repository.ibdn_profiles_repository_async import repo_get_ibdn_perfis_by_ids_with_permissions
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, montar_pagina
+from app.repository.ibdn_user_repository import (
+    _map_user_db_to_schema,
+    _build_usuarios_page_query,
+    _EMPRESA_DO_USUARIO_QUERY,
+    _montar_login_credenciais,
+    _LOGIN_CREDENCIAIS_QUERY,
+)
+
+
+def _errno(e: MySQLError) -> Optional[int]:
+    return e.args[0] if e.args and isinstance(e.args[0], int) else None
+
+
+async def _map_users_with_perfis(usuarios_db: List[Dict[str, Any]], cursor) -> List[Dict[str, Any]]:
+    perfis = await repo_get_ibdn_perfis_by_ids_with_permissions(
+        [u.get("perfil_id") for u in usuarios_db], cursor)
+    return [
+        _map_user_db_to_schema(u, perfis.get(u.get("perfil_id")))
+        for u in usuarios_db
+    ]
+
+
+async def _get_profile_id_by_name(name: str, cursor) -> Optional[str]:
+    await cursor.execute("SELECT id FROM ibdn_perfis WHERE nome = %s", (name,))
+    result = await cursor.fetchone()
+    return result['id'] if result else None
+
+
+async def _fetch_usuario_by_id(usuario_id: str, cursor, include_password_hash: bool = False) -> Optional[Dict[str, Any]]:
+    select_fields = "id, nome, email, perfil_id, ativo, twofactor"
+    if include_password_hash:
+        select_fields += ", senha_hash"
+
+    query = f"SELECT {select_fields} FROM ibdn_usuarios WHERE id = %s"
+    await cursor.execute(query, (usuario_id,))
+    user_db_data = await cursor.fetchone()
+
+    if not user_db_data:
+        return None
+
+    return (await _map_users_with_perfis([user_db_data], cursor))[0]
+
+
+async def repo_create_ibdn_usuario(usuario_data: IbdnUsuarioCreate) -> Optional[Dict[str, Any]]:
+    hashed_password = await get_password_hash_async(usuario_data.senha)
+    async with get_async_cursor() as cursor:
+        try:
+            perfil_id = usuario_data.perfil_id
+            if not perfil_id:
+                perfil_id = await _get_profile_id_by_name("empresa", cursor)
+                if not perfil_id:
+                    raise HTTPException(
+                        status_code=500, detail="Perfil 'empresa' padrão não encontrado no sistema.")
+
+            query = """
+                INSERT INTO ibdn_usuarios (id, nome, email, senha_hash, perfil_id, ativo, twofactor)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+            """
+            await cursor.execute(query, (
+                usuario_data.id,
+                usuario_data.nome,
+                usuario_data.email,
+                hashed_password,
+                perfil_id,
+                1 if usuario_data.ativo else 0,
+                1 if usuario_data.twofactor else 0
+            ))
+            return await _fetch_usuario_by_id(usuario_data.id, cursor)
+        except MySQLError as e:
+            errno = _errno(e)
+            if errno == 1062:
+                raise HTTPException(
+                    status_code=409, detail=f"Usuário com email '{usuario_data.email}' ou ID '{usuario_data.id}' já existe.")
+            if errno == 1452 and 'perfil_id' in str(e):
+                raise HTTPException(
+                    status_code=400, detail=f"Perfil com ID '{usuario_data.perfil_id}' não encontrado.")
+            raise HTTPException(
+                status_code=500, detail=f"Erro de banco de dados ao criar usuário: {e}")
+
+
+async def repo_get_ibdn_usuario_by_id(usuario_id: str, include_password_hash: bool = False) -> Optional[Dict[str, Any]]:
+    async with get_async_cursor() as cursor:
+        return await _fetch_usuario_by_id(usuario_id, cursor, include_password_hash)
+
+
+async def repo_get_ibdn_usuario_by_email(email: str, include_password_hash: bool = False) -> Optional[Dict[str, Any]]:
+    async with get_async_cursor() as cursor:
+        select_fields = "id, nome, email, perfil_id, ativo, twofactor"
+        if include_password_hash:
+            select_fields += ", senha_hash"
+        query = f"SELECT {select_fields}, (SELECT id FROM empresa WHERE usuario_id = u.id) as empresa_id FROM ibdn_usuarios u WHERE u.email = %s"
+        await cursor.execute(query, (email,))
+        user_db_data = await cursor.fetchone()
+
+        if not user_db_data:
+            return None
+
+        mapped_user = (await _map_users_with_perfis([user_db_data], cursor))[0]
+        if user_db_data.get("empresa_id"):
+            mapped_user["empresa_id"] = user_db_data["empresa_id"]
+
+        return mapped_user
+
+
+async def repo_get_login_credenciais(email: str) -> Optional[Dict[str, Any]]:
+    async with get_async_cursor() as cursor:
+        await cursor.execute(_LOGIN_CREDENCIAIS_QUERY, (email,))
+        return _montar_login_credenciais(await cursor.fetchall())
+
+
+async def repo_get_all_ibdn_usuarios(skip: int = 0, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    posicao = decode_cursor("usuarios", cursor_token, 2)
+    async with get_async_cursor() as cursor:
+        query, params = _build_usuarios_page_query(limit, skip, posicao)
+        await cursor.execute(query, tuple(params))
+        usuarios_db, proximo_cursor = montar_pagina(
+            "usuarios", list(await cursor.fetchall()), limit, lambda u: [u["nome"], u["id"]])
+
+        return await _map_users_with_perfis(usuarios_db, cursor), proximo_cursor
+
+
+async def repo_update_ibdn_usuario(usuario_id: str, usuario_data: IbdnUsuarioUpdate) -> Optional[Dict[str, Any]]:
+    update_dict = usuario_data.model_dump(exclude_unset=True)
+    hashed_password = None
+    if "senha" in update_dict:
+        hashed_password = await get_password_hash_async(update_dict["senha"])
+
+    async with get_async_cursor() as cursor:
+        await cursor.execute("SELECT id FROM ibdn_usuarios WHERE id = %s", (usuario_id,))
+        if not await cursor.fetchone():
+            return None
+
+        fields_to_update = []
+        params = []
+
+        if "nome" in update_dict:
+            fields_to_update.append("nome = %s")
+            params.append(update_dict["nome"])
+        if "email" in update_dict:
+            fields_to_update.append("email = %s")
+            params.append(update_dict["email"])
+        if "senha" in update_dict:
+            fields_to_update.append("senha_hash = %s")
+            params.append(hashed_password)
+        if "perfil_id" in update_dict:
+            fields_to_update.append("perfil_id = %s")
+            params.append(update_dict["perfil_id"])
+        if "ativo" in update_dict:
+            fields_to_update.append("ativo = %s")
+            params.append(1 if update_dict["ativo"] else 0)
+        if "twofactor" in update_dict:
+            fields_to_update.append("twofactor = %s")
+            params.append(1 if update_dict["twofactor"] else 0)
+
+        if not fields_to_update:
+            return await _fetch_usuario_by_id(usuario_id, cursor)
+
+        query = f"UPDATE ibdn_usuarios SET {', '.join(fields_to_update)} WHERE id = %s"
+        params.append(usuario_id)
+
+        try:
+            await cursor.execute(query, tuple(params))
+            return await _fetch_usuario_by_id(usuario_id, cursor)
+        except MySQLError as e:
+            errno = _errno(e)
+            if errno == 1062:
+                raise HTTPException(
+                    status_code=409, detail=f"Email '{usuario_data.email}' já está em uso por outro usuário.")
+            if errno == 1452 and 'perfil_id' in str(e):
+                raise HTTPException(
+                    status_code=400, detail=f"Perfil com ID '{usuario_data.perfil_id}' não encontrado para atualização.")
+            raise HTTPException(
+                status_code=500, detail=f"Erro de banco de dados ao atualizar usuário: {e}")
+
+
+async def repo_delete_ibdn_usuario(usuario_id: str) -> bool:
+    async with get_async_cursor() as cursor:
+        try:
+            await cursor.execute(_EMPRESA_DO_USUARIO_QUERY, (usuario_id,))
+            if await cursor.fetchone():
+                raise HTTPException(
+                    status_code=409,
+                    detail="Não é possível excluir este usuário pois ele está associado a uma empresa. Por favor, reatribua ou delete a empresa primeiro."
+                )
+
+            await cursor.execute(
+                "DELETE FROM ibdn_usuarios WHERE id = %s", (usuario_id,))
+            return cursor.rowcount > 0
+        except MySQLError as e:
+            if _errno(e) == 1451:
+                raise HTTPException(
+                    status_code=409, detail="Não é possível excluir este usuário pois ele está referenciado em outras tabelas (ex: logs). Considere inativar o usuário em vez de excluir.")
+            raise HTTPException(
+                status_code=500, detail=f"Erro de banco de dados ao excluir usuário: {e}")
@@ -0,0 +1,86 @@
+from typing import Dict, Iterable, List, Set
+
+from mysql.connector import Error
+
+from app.database.connection import get_db_connection
+from app.models.empresas_model import EmpresaImportacao
+
+INSERIR_EMPRESAS = """
+    INSERT INTO empresa (cnpj, razao_social, nome_fantasia, usuario_id, telefone,
+                         responsavel, cargo_responsavel, site, ativo)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+INSERIR_ENDERECOS = """
+    INSERT INTO endereco (id_empresa, logradouro, numero, bairro, cep, cidade, uf, complemento)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+INSERIR_RAMOS = "INSERT INTO empresa_ramo (id_empresa, id_ramo) VALUES (%s, %s)"
+
+
+def _marcadores(valores: List) -> str:
+    return ", ".join(["%s"] * len(valores))
+
+
+class ImportadorEmpresas:
+    """
+    Uma conexão para a importação inteira. Cada lote faz as verificações
+    com consultas `IN (...)` (uma por tipo de conflito, não uma por linha) e
+    grava empresas, endereços e ramos com INSERTs de várias linhas numa única
+    transação.
+    """
+
+    def __init__(self):
+        self._conn = get_db_connection()
+        self._cursor = self._conn.cursor()
+
+    def _existentes(self, sql: str, valores: Iterable[str]) -> Set[str]:
+        valores = list(set(valores))
+        if not valores:
+            return set()
+        self._cursor.execute(sql.format(marcadores=_marcadores(valores)), valores)
+        return {row[0] for row in self._cursor.fetchall()}
+
+    def cnpjs_cadastrados(self, cnpjs: Iterable[str]) -> Set[str]:
+        return self._existentes("SELECT cnpj FROM empresa WHERE cnpj IN ({marcadores})", cnpjs)
+
+    def usuarios_existentes(self, ids: Iterable[str]) -> Set[str]:
+        return self._existentes("SELECT id FROM ibdn_usuarios WHERE id IN ({marcadores})", ids)
+
+    def usuarios_com_empresa(self, ids: Iterable[str]) -> Set[str]:
+        return self._existentes("SELECT usuario_id FROM empresa WHERE usuario_id IN ({marcadores})", ids)
+
+    def gravar_lote(self, empresas: List[EmpresaImportacao]) -> Dict[str, int]:
+        """Grava o lote numa transação e devolve {cnpj: id da empresa}."""
+        try:
+            self._cursor.executemany(INSERIR_EMPRESAS, [
+                (e.cnpj, e.razao_social, e.nome_fantasia, e.usuario_id, e.telefone,
+                 e.responsavel, e.cargo_responsavel, e.site, e.ativo)
+                for e in empresas
+            ])
+            # CNPJ é único: uma consulta recupera os ids gerados do lote todo.
+            cnpjs = [e.cnpj for e in empresas]
+            self._cursor.execute(
+                f"SELECT cnpj, id FROM empresa WHERE cnpj IN ({_marcadores(cnpjs)})", cnpjs)
+            ids = dict(self._cursor.fetchall())
+
+            enderecos = [
+                (ids[e.cnpj], e.endereco.logradouro, e.endereco.numero, e.endereco.bairro,
+                 e.endereco.cep, e.endereco.cidade, e.endereco.uf, e.endereco.complemento)
+                for e in empresas if e.endereco is not None
+            ]
+            if enderecos:
+                self._cursor.executemany(INSERIR_ENDERECOS, enderecos)
+            ramos = [(ids[e.cnpj], id_ramo) for e in empresas for id_ramo in dict.fromkeys(e.ramos)]
+            if ramos:
+                self._cursor.executemany(INSERIR_RAMOS, ramos)
+            self._conn.commit()
+            return ids
+        except Error:
+            self._conn.rollback()
+            raise
+
+    def fechar(self) -> None:
+        self._cursor.close()
+        self._conn.close()
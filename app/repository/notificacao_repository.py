@@ -1,20 +1,12 @@
-import mysql.connector 
 from mysql.connector import Error
 from fastapi import HTTPException
-from ..database.config import get_db_config 
+from ..database.connection import get_db_connection
 from datetime import datetime
-from typing import List, Optional, Dict, Any
-
-def get_db_connection():
-    try:
-        config = get_db_config()
-        connection = mysql.connector.connect(**config)
-        return connection 
-    except Error as e:
-        raise HTTPException(
-            status_code=500,
-            detail=f"Erro ao conectar ao banco de dados: {str(e)}"
-        )
+from typing import List, Optional, Dict, Any, Tuple
+from app.database.contadores import reconciliar_nao_lidas
+from app.repository.versoes_repository import ajustar_nao_lidas, registrar_alteracao
+from app.service.notificacoes_hub import publicar_evento
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
 
 def get_notificacao_by_id(notificacao_id: int) -> Optional[Dict[str, Any]]:
     conn = get_db_connection()
@@ -31,21 +23,31 @@ def get_notificacao_by_id(notificacao_id: int) -> Optional[Dict[str, Any]]:
         if conn and conn.is_connected():
             conn.close()
 
-def get_notificacoes_by_empresa(empresa_id: int, lida: Optional[bool] = None) -> List[dict]:
+def _build_notificacoes_page_query(empresa_id: int, lida: Optional[bool], limit: int,
+                                   posicao: Optional[List[Any]]) -> Tuple[str, List[Any]]:
+    query = "SELECT * FROM notificacao WHERE id_empresa = %s"
+    params: List[Any] = [empresa_id]
+    if lida is not None:
+        query += " AND lida = %s"
+        params.append(lida)
+    if posicao:
+        condicao, condicao_params = keyset_condition(
+            "id", posicao[1], "DESC", "data_envio", posicao[0])
+        query += f" AND {condicao}"
+        params += condicao_params
+    query += " ORDER BY data_envio DESC, id DESC LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+def get_notificacoes_by_empresa(empresa_id: int, lida: Optional[bool] = None, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    posicao = decode_cursor("notificacoes", cursor_token, 2)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        query = "SELECT * FROM notificacao WHERE id_empresa = %s"
-        params = [empresa_id]
-        
-        if lida is not None:
-            query += " AND lida = %s"
-            params.append(lida)
-            
-        query += " ORDER BY data_envio DESC"
-        
+        query, params = _build_notificacoes_page_query(empresa_id, lida, limit, posicao)
         cursor.execute(query, params)
-        return cursor.fetchall()
+        return montar_pagina("notificacoes", cursor.fetchall(), limit,
+                             lambda n: [n["data_envio"], n["id"]])
     except Error as e:
         raise HTTPException(
             status_code=500,
@@ -55,6 +57,67 @@ def get_notificacoes_by_empresa(empresa_id: int, lida: Optional[bool] = None) ->
         cursor.close()
         conn.close()
 
+def contar_nao_lidas(empresa_id: int) -> Optional[int]:
+    # Lê o contador mantido pelas escritas abaixo em vez de varrer notificacao.
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT COALESCE(c.notificacoes_nao_lidas, 0) AS nao_lidas
+            FROM empresa e
+            LEFT JOIN empresa_contadores c ON c.id_empresa = e.id
+            WHERE e.id = %s
+        """, (empresa_id,))
+        linha = cursor.fetchone()
+        return linha['nao_lidas'] if linha else None
+    except Error as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao contar notificações não lidas: {str(e)}"
+        )
+    finally:
+        cursor.close()
+        conn.close()
+
+def reconciliar_contadores_nao_lidas(empresa_id: Optional[int] = None) -> None:
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        reconciliar_nao_lidas(cursor, empresa_id)
+        conn.commit()
+    except Error as e:
+        conn.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao reconciliar notificações não lidas: {str(e)}"
+        )
+    finally:
+        cursor.close()
+        conn.close()
+
+def consumir_ticket_stream(jti: str, expira_em: int) -> bool:
+    # True só no primeiro uso do ticket, em qualquer worker (PK em jti).
+    # `expira_em` é o `exp` (epoch) do ticket, convertido no relógio do banco.
+    conn = get_db_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM stream_ticket_usado WHERE expira_em < NOW() LIMIT 1000")
+        cursor.execute(
+            "INSERT IGNORE INTO stream_ticket_usado (jti, expira_em) VALUES (%s, FROM_UNIXTIME(%s))",
+            (jti, expira_em))
+        consumido = cursor.rowcount == 1
+        conn.commit()
+        return consumido
+    except Error as e:
+        conn.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro ao validar o ticket do stream: {str(e)}"
+        )
+    finally:
+        cursor.close()
+        conn.close()
+
 def create_notificacao(empresa_id: int, notificacao_data: dict) -> int:
     conn = get_db_connection()
     cursor = conn.cursor()
@@ -64,17 +127,30 @@ def create_notificacao(empresa_id: int, notificacao_data: dict) -> int:
         (id_empresa, mensagem, data_envio, tipo, lida) 
         VALUES (%s, %s, %s, %s, %s)
         """
+        data_envio = datetime.now()
         params = (
             empresa_id,
             notificacao_data['mensagem'],
-            datetime.now(),
+            data_envio,
             notificacao_data['tipo'],
             notificacao_data.get('lida', False)
         )
         
         cursor.execute(query, params)
+        notificacao_id = cursor.lastrowid
+        registrar_alteracao(cursor, "versao_notificacoes", [empresa_id])
+        if not notificacao_data.get('lida', False):
+            ajustar_nao_lidas(cursor, {empresa_id: 1})
         conn.commit()
-        return cursor.lastrowid
+        publicar_evento(empresa_id, {"evento": "notificacao", "notificacao": {
+            "id": notificacao_id,
+            "id_empresa": empresa_id,
+            "mensagem": notificacao_data['mensagem'],
+            "data_envio": data_envio,
+            "tipo": notificacao_data['tipo'],
+            "lida": bool(notificacao_data.get('lida', False)),
+        }})
+        return notificacao_id
     except Error as e:
         raise HTTPException(
             status_code=500,
@@ -88,8 +164,9 @@ def update_notificacao(notificacao_id: int, update_data: dict) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
-        cursor.execute("SELECT id FROM notificacao WHERE id = %s", (notificacao_id,))
-        if not cursor.fetchone():
+        cursor.execute("SELECT id_empresa, lida FROM notificacao WHERE id = %s FOR UPDATE", (notificacao_id,))
+        notificacao = cursor.fetchone()
+        if not notificacao:
             raise HTTPException(status_code=404, detail="Notificação não encontrada")
 
         set_clause = []
@@ -109,7 +186,13 @@ def update_notificacao(notificacao_id: int, update_data: dict) -> bool:
         params.append(notificacao_id)
 
         cursor.execute(query, params)
+        registrar_alteracao(cursor, "versao_notificacoes", [notificacao[0]])
+        nova_lida = update_data.get('lida')
+        if nova_lida is not None and bool(nova_lida) != bool(notificacao[1]):
+            ajustar_nao_lidas(cursor, {notificacao[0]: -1 if nova_lida else 1})
         conn.commit()
+        publicar_evento(notificacao[0], {"evento": "notificacao_atualizada", "id": notificacao_id,
+                                         **{k: v for k, v in update_data.items() if v is not None}})
         return True
     except Error as e:
         raise HTTPException(
@@ -125,9 +208,17 @@ def delete_notificacao(notificacao_id: int) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
+        cursor.execute("SELECT id_empresa, lida FROM notificacao WHERE id = %s FOR UPDATE", (notificacao_id,))
+        notificacao = cursor.fetchone()
+        if not notificacao:
+            return False
         cursor.execute("DELETE FROM notificacao WHERE id = %s", (notificacao_id,))
+        registrar_alteracao(cursor, "versao_notificacoes", [notificacao[0]])
+        if not notificacao[1]:
+            ajustar_nao_lidas(cursor, {notificacao[0]: -1})
         conn.commit()
-        return cursor.rowcount > 0
+        publicar_evento(notificacao[0], {"evento": "notificacao_removida", "id": notificacao_id})
+        return True
     except Error as e:
         raise HTTPException(
             status_code=500,
@@ -1,17 +1,51 @@
 import mysql.connector 
 from mysql.connector import Error
 from fastapi import HTTPException
-from typing import List
+import os
+from typing import Any, Dict, List, Optional, Tuple
 from app.database.config import get_cursor
+from app.service.cache import CatalogCache
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, montar_pagina
 from app.models.model_ramo import RamoBase,RamoCreate,RamoResponse,RamoUpdate 
  
-def get_ramos() -> List[RamoBase]:
+def _carregar_ramos() -> List[dict]:
+    with get_cursor() as cursor:
+        cursor.execute("SELECT id, nome, descricao FROM ramo ORDER BY id")
+        return cursor.fetchall()
+
+
+_ramos_catalogo = CatalogCache(
+    "ramos", _carregar_ramos, ttl=float(os.getenv('CATALOGO_CACHE_TTL', 300)))
+
+
+def invalidate_ramos_cache() -> None:
+    _ramos_catalogo.invalidate()
+
+
+def get_ramos_cache_stats() -> Dict[str, Any]:
+    return _ramos_catalogo.stats()
+
+
+def get_ramos_versao() -> str:
+    return _ramos_catalogo.snapshot().versao
+
+
+def get_ids_ramos() -> frozenset:
+    return frozenset(_ramos_catalogo.snapshot().por_id)
+
+
+def get_ramos(limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[RamoBase], Optional[str]]:
+    posicao = decode_cursor("ramos", cursor_token, 1)
     try:
-        with get_cursor() as cursor:
-            cursor.execute("SELECT id, nome, descricao FROM ramo")
-            rows = cursor.fetchall()
-            ramos = [RamoBase(**row) for row in rows]
-            return ramos
+        # Catálogo pequeno: a página é recortada do snapshot em memória, com o
+        # mesmo cursor (id) usado antes na consulta.
+        rows = _ramos_catalogo.snapshot().linhas
+        if posicao:
+            rows = [r for r in rows if r["id"] > posicao[0]]
+        rows, proximo_cursor = montar_pagina(
+            "ramos", list(rows[:limit + 1]), limit, lambda r: [r["id"]])
+        ramos = [RamoBase(**row) for row in rows]
+        return ramos, proximo_cursor
     except Error as e:
         raise HTTPException(
             status_code=500,
@@ -20,12 +54,10 @@ def get_ramos() -> List[RamoBase]:
 
 def get_ramo_by_id(ramo_id: int) -> RamoBase:
     try:
-        with get_cursor() as cursor:
-            cursor.execute("SELECT * FROM ramo WHERE id = %s", (ramo_id,))
-            row = cursor.fetchone()
-            if not row:
-                raise HTTPException(status_code=404, detail="Ramo não encontrado")
-            return RamoBase(**row)
+        row = _ramos_catalogo.snapshot().por_id.get(ramo_id)
+        if not row:
+            raise HTTPException(status_code=404, detail="Ramo não encontrado")
+        return RamoBase(**row)
     except mysql.connector.Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao acessar banco: {err}")
     
@@ -37,7 +69,8 @@ def create_ramo(ramo: RamoCreate) -> RamoBase:
                 cursor.execute("INSERT INTO ramo (nome, descricao) VALUES (%s,%s)",(ramo.nome,ramo.descricao))
             ramo_id = cursor.lastrowid
 
-            return RamoBase(id=ramo_id, nome=ramo.nome, descricao=ramo.descricao)
+        invalidate_ramos_cache()
+        return RamoBase(id=ramo_id, nome=ramo.nome, descricao=ramo.descricao)
     except mysql.connector.Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao inserir ramo: {err}")
 
@@ -49,7 +82,8 @@ def update_ramo(ramo_id: int, ramo: RamoUpdate) -> RamoResponse:
             if cursor.rowcount == 0:
                 raise HTTPException(status_code=404, detail="Ramo não encontrado")
 
-            return RamoResponse(id=ramo_id, nome=ramo.nome, descricao=ramo.descricao)
+        invalidate_ramos_cache()
+        return RamoResponse(id=ramo_id, nome=ramo.nome, descricao=ramo.descricao)
     except mysql.connector.Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao atualizar ramo: {err}")
 
@@ -61,6 +95,7 @@ def delete_ramo(ramo_id:int) -> None:
                 raise HTTPException(status_code=404, detail="Ramo não encontrado")
             
             cursor.execute("DELETE FROM RAMO WHERE id =%s", (ramo_id,))
+        invalidate_ramos_cache()
     except mysql.connector.Error as err:
         raise HTTPException(status_code=500, detail=f"Erro ao deletar ramo; {err}")
     
\ No newline at end of file
@@ -1,9 +1,17 @@
 import mysql.connector
+import os
 from mysql.connector import Error
 from fastapi import HTTPException
 from ..database.connection import get_db_connection
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+from app.repository.versoes_repository import registrar_alteracao
+from app.service.cache import CatalogCache
+from app.service.codigo_selo import gerar_codigo_selo
+from app.service.notificacoes_hub import publicar_evento
+from app.service.pagination import DEFAULT_PAGE_SIZE, decode_cursor, keyset_condition, montar_pagina
+
+STATUS_SOLICITACAO_ABERTA = {'pendente', 'em renovação'}
 
 def repo_criar_selo(selo_data: dict) -> int:
     conn = get_db_connection()
@@ -13,6 +21,7 @@ def repo_criar_selo(selo_data: dict) -> int:
         cursor.execute(query, (selo_data['nome'], selo_data.get(
             'descricao'), selo_data['sigla']))
         conn.commit()
+        invalidate_selos_cache()
         return cursor.lastrowid
     except Error as e:
         conn.rollback()
@@ -26,7 +35,7 @@ def repo_criar_selo(selo_data: dict) -> int:
         conn.close()
 
 
-def repo_listar_selos() -> List[dict]:
+def _carregar_selos() -> List[dict]:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -38,19 +47,37 @@ def repo_listar_selos() -> List[dict]:
         conn.close()
 
 
+_selos_catalogo = CatalogCache(
+    "selos", _carregar_selos, ttl=float(os.getenv('CATALOGO_CACHE_TTL', 300)))
+
+
+def invalidate_selos_cache() -> None:
+    _selos_catalogo.invalidate()
+
+
+def get_selos_cache_stats() -> Dict[str, Any]:
+    return _selos_catalogo.stats()
+
+
+def repo_versao_catalogo_selos() -> str:
+    return _selos_catalogo.snapshot().versao
+
+
+def repo_listar_selos() -> List[dict]:
+    return [dict(selo) for selo in _selos_catalogo.snapshot().linhas]
+
+
 def repo_get_selo_por_id(id_selo: int) -> Optional[dict]:
-    conn = get_db_connection()
-    cursor = conn.cursor(dictionary=True)
-    try:
-        query = "SELECT id, nome, descricao, sigla FROM selo WHERE id = %s"
-        cursor.execute(query, (id_selo,))
-        return cursor.fetchone()
-    finally:
-        cursor.close()
-        conn.close()
+    selo = _selos_catalogo.snapshot().por_id.get(id_selo)
+    return dict(selo) if selo else None
 
 
 def repo_conceder_selo_empresa(id_empresa: int, id_selo: int, dias_validade: int) -> dict:
+    selo_catalogo = repo_get_selo_por_id(id_selo)
+    if not selo_catalogo:
+        raise HTTPException(
+            status_code=404, detail="Tipo de selo não encontrado no catálogo.")
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -61,15 +88,7 @@ def repo_conceder_selo_empresa(id_empresa: int, id_selo: int, dias_validade: int
             raise HTTPException(
                 status_code=404, detail="Empresa não encontrada.")
 
-        cursor.execute(
-            "SELECT sigla, nome FROM selo WHERE id = %s", (id_selo,))
-        selo_catalogo = cursor.fetchone()
-        if not selo_catalogo:
-            raise HTTPException(
-                status_code=404, detail="Tipo de selo não encontrado no catálogo.")
-
-        timestamp = int(datetime.now().timestamp())
-        codigo_selo_gerado = f"{selo_catalogo['sigla']}-{datetime.now().year}-{id_empresa}-{timestamp}"
+        codigo_selo_gerado = gerar_codigo_selo(selo_catalogo['sigla'], id_empresa)
         data_emissao = datetime.now().date()
         data_expiracao = data_emissao + timedelta(days=dias_validade)
 
@@ -81,12 +100,19 @@ def repo_conceder_selo_empresa(id_empresa: int, id_selo: int, dias_validade: int
         cursor.execute(query, (id_empresa, id_selo, 'Ativo',
                                data_emissao, data_expiracao, codigo_selo_gerado))
         novo_empresa_selo_id = cursor.lastrowid
+        registrar_alteracao(cursor, "versao_selos", [id_empresa])
         conn.commit()
+        publicar_evento(id_empresa, {"evento": "selo", "id": novo_empresa_selo_id, "status": 'Ativo'})
 
         return {"id": novo_empresa_selo_id, "codigo_selo": codigo_selo_gerado}
 
     except Error as e:
         conn.rollback()
+        if e.errno == 1452:
+            # Selo removido do catálogo depois da leitura do cache.
+            invalidate_selos_cache()
+            raise HTTPException(
+                status_code=404, detail="Tipo de selo não encontrado no catálogo.")
         raise HTTPException(
             status_code=500, detail=f"Erro de banco de dados ao conceder selo: {e}")
     finally:
@@ -94,25 +120,56 @@ def repo_conceder_selo_empresa(id_empresa: int, id_selo: int, dias_validade: int
         conn.close()
 
 
-def repo_listar_selos_da_empresa(id_empresa: int) -> List[dict]:
+_SELOS_CONCEDIDOS_SELECT = """
+    SELECT
+        es.id, es.id_empresa, es.id_selo, es.status, es.data_emissao, es.data_expiracao, es.codigo_selo,
+        es.plano_solicitado_anos,
+        s.nome as nome_selo,
+        s.sigla as sigla_selo,
+        e.razao_social as razao_social_empresa
+    FROM empresa_selo es
+    JOIN selo s ON es.id_selo = s.id
+    JOIN empresa e ON es.id_empresa = e.id
+"""
+
+_EMPRESA_SELO_POR_ID_QUERY = "SELECT id, id_empresa, id_selo, status, plano_solicitado_anos FROM empresa_selo WHERE id = %s"
+
+
+def _build_selos_empresa_page_query(id_empresa: int, limit: int, posicao: Optional[List[Any]]) -> Tuple[str, List[Any]]:
+    query = _SELOS_CONCEDIDOS_SELECT + " WHERE es.id_empresa = %s"
+    params: List[Any] = [id_empresa]
+    if posicao:
+        condicao, condicao_params = keyset_condition(
+            "es.id", posicao[1], "DESC", "es.data_expiracao", posicao[0], anulavel=True)
+        query += f" AND {condicao}"
+        params += condicao_params
+    query += " ORDER BY es.data_expiracao DESC, es.id DESC LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+
+def _build_solicitacoes_page_query(limit: int, posicao: Optional[List[Any]]) -> Tuple[str, List[Any]]:
+    query = _SELOS_CONCEDIDOS_SELECT + " WHERE es.status IN ('Pendente', 'Em Renovação')"
+    params: List[Any] = []
+    if posicao:
+        condicao, condicao_params = keyset_condition(
+            "es.id", posicao[1], "ASC", "es.data_emissao", posicao[0], anulavel=True)
+        query += f" AND {condicao}"
+        params += condicao_params
+    query += " ORDER BY es.data_emissao ASC, es.id ASC LIMIT %s"
+    params.append(limit + 1)
+    return query, params
+
+
+def repo_listar_selos_da_empresa(id_empresa: int, limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    posicao = decode_cursor("selos_empresa", cursor_token, 2)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        query = """
-            SELECT
-                es.id, es.id_empresa, es.id_selo, es.status, es.data_emissao, es.data_expiracao, es.codigo_selo,
-                es.plano_solicitado_anos,
-                s.nome as nome_selo,
-                s.sigla as sigla_selo,
-                e.razao_social as razao_social_empresa
-            FROM empresa_selo es
-            JOIN selo s ON es.id_selo = s.id
-            JOIN empresa e ON es.id_empresa = e.id
-            WHERE es.id_empresa = %s
-            ORDER BY es.data_expiracao DESC
-        """
-        cursor.execute(query, (id_empresa,))
-        return cursor.fetchall()
+        query, params = _build_selos_empresa_page_query(id_empresa, limit, posicao)
+        cursor.execute(query, tuple(params))
+        return montar_pagina("selos_empresa", cursor.fetchall(), limit,
+                             lambda s: [s["data_expiracao"], s["id"]])
     except Error as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao buscar selos da empresa: {e}")
@@ -121,25 +178,15 @@ def repo_listar_selos_da_empresa(id_empresa: int) -> List[dict]:
         conn.close()
 
 
-def repo_listar_solicitacoes_pendentes() -> List[dict]:
+def repo_listar_solicitacoes_pendentes(limit: int = DEFAULT_PAGE_SIZE, cursor_token: Optional[str] = None) -> Tuple[List[dict], Optional[str]]:
+    posicao = decode_cursor("solicitacoes", cursor_token, 2)
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        query = """
-            SELECT
-                es.id, es.id_empresa, es.id_selo, es.status, es.data_emissao, es.data_expiracao, es.codigo_selo,
-                es.plano_solicitado_anos,
-                s.nome as nome_selo,
-                s.sigla as sigla_selo,
-                e.razao_social as razao_social_empresa
-            FROM empresa_selo es
-            JOIN selo s ON es.id_selo = s.id
-            JOIN empresa e ON es.id_empresa = e.id
-            WHERE es.status IN ('Pendente', 'Em Renovação')
-            ORDER BY es.data_emissao ASC
-        """
-        cursor.execute(query)
-        return cursor.fetchall()
+        query, params = _build_solicitacoes_page_query(limit, posicao)
+        cursor.execute(query, tuple(params))
+        return montar_pagina("solicitacoes", cursor.fetchall(), limit,
+                             lambda s: [s["data_emissao"], s["id"]])
     except Error as e:
         raise HTTPException(
             status_code=500, detail=f"Erro ao buscar solicitações pendentes: {e}")
@@ -152,27 +199,34 @@ def repo_atualizar_status_selo(empresa_selo_id: int, novo_status: str) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
+        cursor.execute("SELECT id_empresa, plano_solicitado_anos FROM empresa_selo WHERE id = %s", (empresa_selo_id,))
+        resultado = cursor.fetchone()
+        if not resultado:
+            return False
+
         if novo_status == 'Ativo':
-            cursor.execute("SELECT plano_solicitado_anos FROM empresa_selo WHERE id = %s", (empresa_selo_id,))
-            resultado = cursor.fetchone()
-            
             anos_validade = 1
-            if resultado and resultado.get('plano_solicitado_anos'):
+            if resultado.get('plano_solicitado_anos'):
                 anos_validade = resultado['plano_solicitado_anos']
 
             dias_validade = anos_validade * 365
             data_emissao = datetime.now().date()
             data_expiracao = data_emissao + timedelta(days=dias_validade)
             
-            query = "UPDATE empresa_selo SET status = %s, data_emissao = %s, data_expiracao = %s WHERE id = %s"
+            query = "UPDATE empresa_selo SET status = %s, data_emissao = %s, data_expiracao = %s, alerta_enviado = FALSE WHERE id = %s"
             params = (novo_status, data_emissao, data_expiracao, empresa_selo_id)
         else:
             query = "UPDATE empresa_selo SET status = %s WHERE id = %s"
             params = (novo_status, empresa_selo_id)
 
         cursor.execute(query, params)
+        alterado = cursor.rowcount > 0
+        if alterado:
+            registrar_alteracao(cursor, "versao_selos", [resultado['id_empresa']])
         conn.commit()
-        return cursor.rowcount > 0
+        if alterado:
+            publicar_evento(resultado['id_empresa'], {"evento": "selo", "id": empresa_selo_id, "status": novo_status})
+        return alterado
     except Error as e:
         conn.rollback()
         raise HTTPException(
@@ -181,7 +235,74 @@ def repo_atualizar_status_selo(empresa_selo_id: int, novo_status: str) -> bool:
         cursor.close()
         conn.close()
 
+def repo_processar_solicitacoes_em_lote(ids: List[int], acao: str) -> List[dict]:
+    ids = list(dict.fromkeys(ids))
+    marcadores = ", ".join(["%s"] * len(ids))
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(
+            f"SELECT id, id_empresa, status FROM empresa_selo WHERE id IN ({marcadores}) FOR UPDATE", ids)
+        linhas = cursor.fetchall()
+        status_atual = {row['id']: row['status'] for row in linhas}
+        empresa_de = {row['id']: row['id_empresa'] for row in linhas}
+
+        elegiveis = [i for i in ids if i in status_atual and
+                     (status_atual[i] or '').casefold() in STATUS_SOLICITACAO_ABERTA]
+        datas = {}
+        if elegiveis:
+            marcadores_elegiveis = ", ".join(["%s"] * len(elegiveis))
+            if acao == 'aprovar':
+                # Mesma regra de repo_atualizar_status_selo: validade = plano (anos) * 365 dias.
+                cursor.execute(f"""
+                    UPDATE empresa_selo
+                    SET status = 'Ativo',
+                        data_emissao = CURDATE(),
+                        data_expiracao = CURDATE() + INTERVAL COALESCE(plano_solicitado_anos, 1) * 365 DAY,
+                        alerta_enviado = FALSE
+                    WHERE id IN ({marcadores_elegiveis})
+                """, elegiveis)
+                cursor.execute(
+                    f"SELECT id, data_emissao, data_expiracao FROM empresa_selo WHERE id IN ({marcadores_elegiveis})",
+                    elegiveis)
+                datas = {row['id']: row for row in cursor.fetchall()}
+            else:
+                cursor.execute(
+                    f"UPDATE empresa_selo SET status = 'Recusado' WHERE id IN ({marcadores_elegiveis})",
+                    elegiveis)
+            registrar_alteracao(cursor, "versao_selos", [empresa_de[i] for i in elegiveis])
+        conn.commit()
+
+        novo_status = 'Ativo' if acao == 'aprovar' else 'Recusado'
+        for i in elegiveis:
+            publicar_evento(empresa_de[i], {"evento": "selo", "id": i, "status": novo_status})
+
+        resultado_ok = 'aprovado' if acao == 'aprovar' else 'recusado'
+        elegiveis = set(elegiveis)
+        resultados = []
+        for i in ids:
+            if i not in status_atual:
+                resultados.append({"id": i, "resultado": "nao_encontrado"})
+                continue
+            item = {"id": i, "status_anterior": status_atual[i],
+                    "resultado": resultado_ok if i in elegiveis else "status_invalido"}
+            if i in datas:
+                item["data_emissao"] = datas[i]['data_emissao']
+                item["data_expiracao"] = datas[i]['data_expiracao']
+            resultados.append(item)
+        return resultados
+    except Error as e:
+        conn.rollback()
+        raise HTTPException(
+            status_code=500, detail=f"Erro ao processar solicitações de selo em lote: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
 def repo_solicitar_selo_empresa(id_empresa: int, id_selo: int, plano_anos: int) -> dict:
+    if not repo_get_selo_por_id(id_selo):
+        raise HTTPException(status_code=404, detail="Tipo de selo não encontrado no catálogo.")
+
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
@@ -189,10 +310,6 @@ def repo_solicitar_selo_empresa(id_empresa: int, id_selo: int, plano_anos: int)
         if not cursor.fetchone():
             raise HTTPException(status_code=404, detail="Empresa não encontrada ou inativa.")
 
-        cursor.execute("SELECT sigla FROM selo WHERE id = %s", (id_selo,))
-        if not cursor.fetchone():
-            raise HTTPException(status_code=404, detail="Tipo de selo não encontrado no catálogo.")
-
         cursor.execute(
             "SELECT id, status FROM empresa_selo WHERE id_empresa = %s AND id_selo = %s",
             (id_empresa, id_selo)
@@ -208,7 +325,9 @@ def repo_solicitar_selo_empresa(id_empresa: int, id_selo: int, plano_anos: int)
         query = "INSERT INTO empresa_selo (id_empresa, id_selo, status, plano_solicitado_anos) VALUES (%s, %s, %s, %s)"
         cursor.execute(query, (id_empresa, id_selo, 'Pendente', plano_anos))
         novo_id = cursor.lastrowid
+        registrar_alteracao(cursor, "versao_selos", [id_empresa])
         conn.commit()
+        publicar_evento(id_empresa, {"evento": "selo", "id": novo_id, "status": 'Pendente'})
 
         return {"id_solicitacao": novo_id, "mensagem": "Selo solicitado com sucesso. Aguardando aprovação do administrador."}
 
@@ -216,6 +335,9 @@ def repo_solicitar_selo_empresa(id_empresa: int, id_selo: int, plano_anos: int)
         raise
     except Error as e:
         conn.rollback()
+        if e.errno == 1452:
+            invalidate_selos_cache()
+            raise HTTPException(status_code=404, detail="Tipo de selo não encontrado no catálogo.")
         raise HTTPException(status_code=500, detail=f"Erro de banco de dados: {e}")
     finally:
         cursor.close()
@@ -225,8 +347,7 @@ def repo_get_empresa_selo_por_id(empresa_selo_id: int) -> Optional[dict]:
     conn = get_db_connection()
     cursor = conn.cursor(dictionary=True)
     try:
-        query = "SELECT id, id_empresa, id_selo, status, plano_solicitado_anos FROM empresa_selo WHERE id = %s"
-        cursor.execute(query, (empresa_selo_id,))
+        cursor.execute(_EMPRESA_SELO_POR_ID_QUERY, (empresa_selo_id,))
         return cursor.fetchone()
     finally:
         cursor.close()
@@ -236,10 +357,19 @@ def repo_revogar_selo_empresa(empresa_selo_id: int) -> bool:
     conn = get_db_connection()
     cursor = conn.cursor()
     try:
+        cursor.execute("SELECT id_empresa FROM empresa_selo WHERE id = %s", (empresa_selo_id,))
+        selo = cursor.fetchone()
+        if not selo:
+            return False
         query = "DELETE FROM empresa_selo WHERE id = %s"
         cursor.execute(query, (empresa_selo_id,))
+        removido = cursor.rowcount > 0
+        if removido:
+            registrar_alteracao(cursor, "versao_selos", [selo[0]])
         conn.commit()
-        return cursor.rowcount > 0
+        if removido:
+            publicar_evento(selo[0], {"evento": "selo_revogado", "id": empresa_selo_id})
+        return removido
     except Error as e:
         conn.rollback()
         raise HTTPException(
@@ -0,0 +1,63 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from fastapi import HTTPException
+from mysql.connector import Error
+
+from app.database.connection import get_db_connection
+
+# Contadores por empresa usados como versão das listas (ETag). São
+# incrementados na mesma transação das escritas em empresa_selo/notificacao.
+CONTADORES = ("versao_selos", "versao_notificacoes")
+
+
+def repo_get_versoes_empresa(empresa_id: int) -> Optional[Dict[str, Any]]:
+    conn = get_db_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT e.id, e.usuario_id, e.atualizado_em,
+                   COALESCE(c.versao_selos, 0) AS versao_selos,
+                   COALESCE(c.versao_notificacoes, 0) AS versao_notificacoes
+            FROM empresa e
+            LEFT JOIN empresa_contadores c ON c.id_empresa = e.id
+            WHERE e.id = %s
+        """, (empresa_id,))
+        return cursor.fetchone()
+    except Error as e:
+        raise HTTPException(
+            status_code=500, detail=f"Erro ao buscar versão da empresa: {e}")
+    finally:
+        cursor.close()
+        conn.close()
+
+
+def registrar_alteracao(cursor, contador: str, ids_empresa: Iterable[int]) -> None:
+    if contador not in CONTADORES:
+        raise ValueError(f"Contador desconhecido: {contador}")
+    ids = sorted(set(ids_empresa))
+    if not ids:
+        return
+    valores = ", ".join(["(%s, 1)"] * len(ids))
+    cursor.execute(
+        f"INSERT INTO empresa_contadores (id_empresa, {contador}) VALUES {valores} "
+        f"ON DUPLICATE KEY UPDATE {contador} = {contador} + 1",
+        ids)
+
+
+def ajustar_nao_lidas(cursor, deltas: Mapping[int, int]) -> None:
+    # Mantém empresa_contadores.notificacoes_nao_lidas na mesma transação que
+    # insere/remove/marca notificações; `deltas` é {id_empresa: variação}.
+    por_delta = defaultdict(list)
+    for id_empresa, delta in deltas.items():
+        if delta:
+            por_delta[delta].append(id_empresa)
+    for delta, ids in sorted(por_delta.items()):
+        ids.sort()
+        valores = ", ".join(["(%s, GREATEST(%s, 0))"] * len(ids))
+        params = [valor for id_empresa in ids for valor in (id_empresa, delta)]
+        cursor.execute(
+            f"INSERT INTO empresa_contadores (id_empresa, notificacoes_nao_lidas) VALUES {valores} "
+            "ON DUPLICATE KEY UPDATE notificacoes_nao_lidas = GREATEST(notificacoes_nao_lidas + %s, 0)",
+            params + [delta])
+
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
+from typing import List, Optional
 from app.controllers import ibdn_profiles_controller as ctrl
 from app.models.ibdn_user_model import IbdnPerfil, IbdnPerfilCreate, IbdnPerfilUpdate, PerfilPermissaoLink
 from app.controllers.token import require_permission
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     prefix="/perfis",
@@ -12,9 +13,18 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[IbdnPerfil], dependencies=[Depends(require_permission("admin_master", "admin"))])
-async def api_get_all_perfis(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=1000)):
+async def api_get_all_perfis(
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Use o parâmetro cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior."),
+):
     try:
-        return ctrl.get_all_perfis(skip=skip, limit=limit)
+        perfis, proximo_cursor = ctrl.get_all_perfis(skip=skip, limit=limit, cursor=cursor)
+        aplicar_cursor(response, proximo_cursor)
+        return perfis
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro interno do servidor: {str(e)}")
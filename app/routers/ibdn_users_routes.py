@@ -1,8 +1,9 @@
-from fastapi import APIRouter, HTTPException, status, Query, Depends
-from typing import List
+from fastapi import APIRouter, HTTPException, status, Query, Depends, Response
+from typing import List, Optional
 from app.controllers import ibdn_users_controller as ctrl
 from app.models.ibdn_user_model import IbdnUsuario, IbdnUsuarioCreate, IbdnUsuarioUpdate, UsuarioRegister
 from app.controllers.token import require_permission, get_current_user, TokenPayLoad
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     prefix="/usuario",
@@ -13,7 +14,7 @@ router = APIRouter(
 @router.post("/register", response_model=IbdnUsuario, status_code=status.HTTP_201_CREATED, summary="Autocadastro de um novo usuário")
 async def api_register_user(usuario_data: UsuarioRegister):
     try:
-        return ctrl.register_new_user(usuario_data)
+        return await ctrl.register_new_user(usuario_data)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -27,7 +28,7 @@ async def api_create_usuario(
     usuario_data: IbdnUsuarioCreate,
 ):
     try:
-        return ctrl.create_usuario(usuario_data)
+        return await ctrl.create_usuario(usuario_data)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -41,7 +42,7 @@ async def api_get_usuario(
     current_user: TokenPayLoad = Depends(get_current_user)
 ):
     try:
-        return ctrl.get_usuario(usuario_id, current_user)
+        return await ctrl.get_usuario(usuario_id, current_user)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -51,24 +52,30 @@ async def api_get_usuario(
 
 @router.get("/", response_model=List[IbdnUsuario], dependencies=[Depends(require_permission("admin_master"))])
 async def api_get_all_usuarios(
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000),
+    response: Response,
+    skip: int = Query(0, ge=0, deprecated=True, description="Use o parâmetro cursor."),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior."),
 ):
     try:
-        return ctrl.get_all_usuarios(skip=skip, limit=limit)
+        usuarios, proximo_cursor = await ctrl.get_all_usuarios(skip=skip, limit=limit, cursor=cursor)
+        aplicar_cursor(response, proximo_cursor)
+        return usuarios
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=500, detail=f"Erro interno do servidor: {str(e)}")
 
 
-@router.put("/{usuario_id}", response_model=IbdnUsuario, dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.put("/{usuario_id}", response_model=IbdnUsuario)
 async def api_update_usuario(
     usuario_id: str,
     usuario_data: IbdnUsuarioUpdate,
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
     try:
-        return ctrl.update_usuario(usuario_id, usuario_data, current_user)
+        return await ctrl.update_usuario(usuario_id, usuario_data, current_user)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -81,7 +88,7 @@ async def api_delete_usuario(
     usuario_id: str,
 ):
     try:
-        return ctrl.delete_usuario(usuario_id)
+        return await ctrl.delete_usuario(usuario_id)
     except HTTPException as e:
         raise e
     except Exception as e:
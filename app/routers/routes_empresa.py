@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Path, Depends, Body, status
-from typing import List, Dict, Any
+from fastapi import APIRouter, Path, Depends, Body, File, Query, Request, Response, UploadFile, status
+from typing import List, Dict, Any, Literal, Optional
 from app.models.empresas_model import (
     Empresa,
     EmpresaCreate,
-    EmpresaUpdate
+    EmpresaUpdate,
+    ResultadoImportacao
 )
-from app.controllers import controller_empresa
-from app.controllers.token import get_current_user, TokenPayLoad, require_permission
+from app.controllers import controller_empresa, controller_importacao_empresas
+from app.controllers.token import TokenPayLoad, require_permission
+from app.service.etag import responder_condicional
+from app.service.serializacao import resposta_lista
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     prefix="/empresas",
@@ -15,45 +19,68 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[Empresa], dependencies=[Depends(require_permission("admin", "admin_master"))])
-def listar_empresas():
-    return controller_empresa.get_empresas()
+def listar_empresas(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior.")
+):
+    empresas, proximo_cursor = controller_empresa.get_empresas(limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return resposta_lista(Empresa, empresas, response)
 
 
 @router.post(
     "/",
     response_model=Dict[str, Any],
     status_code=status.HTTP_201_CREATED,
-    summary="Cria uma nova empresa",
-    dependencies=[Depends(require_permission(
-        "empresa", "admin", "admin_master"))]
+    summary="Cria uma nova empresa"
 )
 def rota_criar_empresa(
     empresa: EmpresaCreate,
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
     return controller_empresa.criar_empresa(empresa, current_user)
 
 
-@router.get("/{empresa_id}", response_model=Empresa, dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.post(
+    "/importacao",
+    response_model=ResultadoImportacao,
+    summary="Importa empresas em massa a partir de um arquivo CSV ou NDJSON",
+    dependencies=[Depends(require_permission("admin", "admin_master"))]
+)
+def importar_empresas(
+    arquivo: UploadFile = File(..., description="CSV com cabeçalho ou NDJSON (um objeto JSON por linha)."),
+    formato: Optional[Literal["csv", "ndjson"]] = Query(None, description="Padrão: deduzido do nome/tipo do arquivo."),
+    validar_apenas: bool = Query(False, description="Só valida e devolve o relatório, sem gravar.")
+):
+    return controller_importacao_empresas.importar_empresas(arquivo, formato, validar_apenas)
+
+
+@router.get("/{empresa_id}", response_model=Empresa)
 def buscar_empresa_por_id(
+    request: Request,
+    response: Response,
     empresa_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
+    versao = controller_empresa.get_etag_empresa(empresa_id, current_user)
+    if versao:
+        nao_modificado = responder_condicional(request, response, *versao)
+        if nao_modificado:
+            return nao_modificado
     return controller_empresa.get_empresa_por_id(empresa_id, current_user=current_user)
 
 
 @router.put(
     "/{id_empresa}",
     response_model=Empresa,
-    summary="Atualizar dados de uma empresa",
-    dependencies=[Depends(require_permission(
-        "empresa", "admin", "admin_master"))]
+    summary="Atualizar dados de uma empresa"
 )
 def atualizar_empresa_endpoint(
     id_empresa: int = Path(..., gt=0,
                            description="ID da empresa a ser atualizada"),
     empresa_update_data: EmpresaUpdate = Body(...),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
     return controller_empresa.update_empresa(
         id_empresa=id_empresa,
@@ -65,11 +92,10 @@ def atualizar_empresa_endpoint(
 @router.delete(
     "/{empresa_id}",
     status_code=status.HTTP_200_OK,
-    summary="Inativar uma empresa (exclusão lógica)",
-    dependencies=[Depends(require_permission("admin", "admin_master"))]
+    summary="Inativar uma empresa (exclusão lógica)"
 )
 def excluir_empresa_endpoint(
     empresa_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("admin", "admin_master"))
 ):
     return controller_empresa.delete_empresa(empresa_id, current_user)
\ No newline at end of file
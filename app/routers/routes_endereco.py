@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Path, Depends
-from typing import List
+from fastapi import APIRouter, Path, Depends, Query, Response
+from typing import List, Optional
 from app.controllers.controller_endereco import get_empresa_enderecos_by_empresa_id, update_empresa_endereco, create_empresa_endereco,  delete_empresa_endereco
 from app.models.model_endereco import EmpresaEndereco, EmpresaEnderecoUpdate, EmpresaEnderecoCreate
-from app.controllers.token import require_permission, TokenPayLoad, get_current_user
+from app.controllers.token import require_permission, TokenPayLoad
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     prefix="",
@@ -10,26 +11,31 @@ router = APIRouter(
     responses={404: {"description": "Não encontrado"}},
 )
 
-@router.get("/empresas/{empresa_id}/enderecos", response_model=List[EmpresaEndereco], dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.get("/empresas/{empresa_id}/enderecos", response_model=List[EmpresaEndereco])
 def listar_enderecos_da_empresa(
+    response: Response,
     empresa_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior."),
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
-    return get_empresa_enderecos_by_empresa_id(empresa_id, current_user)
+    enderecos, proximo_cursor = get_empresa_enderecos_by_empresa_id(empresa_id, current_user, limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return enderecos
 
-@router.post("/empresas/{empresa_id}/endereco", status_code=201, dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.post("/empresas/{empresa_id}/endereco", status_code=201)
 def criar_novo_endereco(
     data: EmpresaEnderecoCreate,
     empresa_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
     return create_empresa_endereco(empresa_id, data, current_user)
 
-@router.put("/empresas/{empresa_id}/endereco", dependencies=[Depends(require_permission("empresa", "admin"))])
+@router.put("/empresas/{empresa_id}/endereco")
 def atualizar_endereco_da_empresa(
     data: EmpresaEnderecoUpdate,
     empresa_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin"))
 ):
     return update_empresa_endereco(empresa_id, data, current_user)
 
@@ -0,0 +1,23 @@
+from typing import Literal
+from fastapi import APIRouter, Depends, Path, Query
+from app.controllers import controller_exportacao
+from app.controllers.token import require_permission
+
+router = APIRouter(
+    prefix="/exportacoes",
+    tags=["Exportações"],
+    responses={404: {"description": "Não encontrado"}},
+)
+
+
+@router.get(
+    "/{recurso}",
+    summary="Exporta uma tabela inteira em streaming (NDJSON ou CSV)",
+    response_description="Arquivo NDJSON (uma linha JSON por registro) ou CSV com cabeçalho.",
+    dependencies=[Depends(require_permission("admin", "admin_master"))]
+)
+def exportar_recurso(
+    recurso: Literal["empresas", "selos", "notificacoes"] = Path(..., description="Tabela a exportar."),
+    formato: Literal["ndjson", "csv"] = Query("ndjson")
+):
+    return controller_exportacao.exportar(recurso, formato)
@@ -1,5 +1,3 @@
-import asyncio
-from fastapi import APIRouter, HTTPException
 from fastapi import APIRouter, HTTPException, status
 from app.models.login_model import CredenciaisLogin
 from app.controllers.controller_login import login
@@ -12,10 +10,7 @@ router = APIRouter(
 
 @router.post("/login", summary="Login de usuário")
 async def login_usuario(request: CredenciaisLogin):
-    resultado = login(request.email, request.senha)
-    print(request)
-    print(
-        f"Tipo da  função login: {type(login)}, is coroutine? {asyncio.iscoroutinefunction(login)}")
+    resultado = await login(request.email, request.senha)
 
     if not resultado:
         raise HTTPException(
@@ -0,0 +1,16 @@
+from typing import Optional
+
+from fastapi import APIRouter, Header
+from fastapi.responses import PlainTextResponse
+
+from app.controllers import controller_metricas
+
+router = APIRouter(tags=["Métricas"])
+
+CONTENT_TYPE_PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metricas(authorization: Optional[str] = Header(None)):
+    controller_metricas.verificar_acesso_metricas(authorization)
+    return PlainTextResponse(controller_metricas.gerar_metricas(), media_type=CONTENT_TYPE_PROMETHEUS)
@@ -1,26 +1,78 @@
-from fastapi import APIRouter, Path, Query, Depends, status
+from fastapi import APIRouter, Path, Query, Depends, Request, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
 from app.controllers.controller_notificacao import (
     get_notificacoes_empresa,
+    get_etag_notificacoes_empresa,
+    transmitir_notificacoes_empresa,
+    emitir_ticket_stream,
+    get_nao_lidas_empresa,
+    reconciliar_nao_lidas,
     criar_notificacao_empresa,
     atualizar_notificacao as atualizar_notificacao_controller,
     remover_notificacao
 )
-from app.models.notificacao_model import Notificacao, NotificacaoCreate, NotificacaoUpdate
-from app.controllers.token import require_permission, get_current_user, TokenPayLoad
+from app.models.notificacao_model import Notificacao, NotificacaoCreate, NotificacaoUpdate, NotificacoesNaoLidas, TicketStream
+from app.controllers.token import require_permission, get_current_user_stream, TokenPayLoad
+from app.service.etag import responder_condicional
+from app.service.serializacao import resposta_lista
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     tags=["Notificações"],
     responses={404: {"description": "Não encontrado"}},
 )
 
-@router.get("/empresas/{empresa_id}/notificacoes", response_model=List[Notificacao], summary="Lista as notificações de uma empresa", dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.get("/empresas/{empresa_id}/notificacoes", response_model=List[Notificacao], summary="Lista as notificações de uma empresa")
 def listar_notificacoes_empresa(
+    request: Request,
+    response: Response,
     empresa_id: int = Path(..., gt=0),
     lida: Optional[bool] = Query(None, description="Filtre as notificações por status de leitura (true para lidas, false para não lidas)."),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior."),
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
-    return get_notificacoes_empresa(empresa_id, current_user, lida)
+    etag = get_etag_notificacoes_empresa(empresa_id, current_user, lida, limit, cursor)
+    nao_modificado = responder_condicional(request, response, etag)
+    if nao_modificado:
+        return nao_modificado
+    notificacoes, proximo_cursor = get_notificacoes_empresa(empresa_id, current_user, lida, limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return resposta_lista(Notificacao, notificacoes, response)
+
+@router.get("/empresas/{empresa_id}/notificacoes/nao-lidas", response_model=NotificacoesNaoLidas, summary="Quantidade de notificações não lidas de uma empresa")
+def contar_notificacoes_nao_lidas(
+    empresa_id: int = Path(..., gt=0),
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
+):
+    return get_nao_lidas_empresa(empresa_id, current_user)
+
+@router.post("/notificacoes/nao-lidas/reconciliar", response_model=dict, summary="Admin recalcula os contadores de notificações não lidas", dependencies=[Depends(require_permission("admin", "admin_master"))])
+def reconciliar_contadores_nao_lidas(
+    empresa_id: Optional[int] = Query(None, gt=0, description="Recalcula apenas esta empresa; sem o parâmetro, todas.")
+):
+    return reconciliar_nao_lidas(empresa_id)
+
+@router.post("/empresas/{empresa_id}/notificacoes/stream/ticket", response_model=TicketStream, summary="Emite um ticket curto e de uso único para abrir o stream de notificações")
+def criar_ticket_stream(
+    empresa_id: int = Path(..., gt=0),
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
+):
+    return emitir_ticket_stream(empresa_id, current_user)
+
+@router.get(
+    "/empresas/{empresa_id}/notificacoes/stream",
+    summary="Recebe em tempo real (Server-Sent Events) as notificações e mudanças de selo de uma empresa",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}}},
+)
+async def stream_notificacoes_empresa(
+    empresa_id: int = Path(..., gt=0),
+    current_user: TokenPayLoad = Depends(require_permission(
+        "empresa", "admin", "admin_master", autenticacao=get_current_user_stream))
+):
+    return transmitir_notificacoes_empresa(empresa_id, current_user)
 
 @router.post("/empresas/{empresa_id}/notificacoes", response_model=dict, status_code=status.HTTP_201_CREATED, summary="Admin cria uma notificação para uma empresa", dependencies=[Depends(require_permission("admin", "admin_master"))])
 def criar_notificacao(
@@ -29,11 +81,11 @@ def criar_notificacao(
 ):
     return criar_notificacao_empresa(empresa_id, notificacao)
 
-@router.put("/notificacoes/{notificacao_id}", response_model=dict, summary="Atualiza uma notificação (marcar como lida)", dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
+@router.put("/notificacoes/{notificacao_id}", response_model=dict, summary="Atualiza uma notificação (marcar como lida)")
 def atualizar_notificacao(
     notificacao: NotificacaoUpdate,
     notificacao_id: int = Path(..., gt=0),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
 ):
     return atualizar_notificacao_controller(notificacao_id, notificacao, current_user)
 
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Path, Depends
+from fastapi import APIRouter, Path, Depends, Query, Request, Response
 from app.controllers.token import require_permission
 from logging import info
 from app.models.model_ramo import RamoBase, RamoCreate, RamoUpdate, RamoResponse
 from app.controllers.controller_ramo import (
-    controller_update_ramo, controller_create_ramo, controller_delete_ramo, controller_get_ramo_by_id, controller_get_ramos
+    controller_update_ramo, controller_create_ramo, controller_delete_ramo, controller_get_ramo_by_id, controller_get_ramos,
+    controller_get_etag_ramos
 )
-from typing import List
+from typing import List, Optional
+from app.service.etag import responder_condicional
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     prefix="/ramos",
@@ -14,8 +17,18 @@ router = APIRouter(
 
 
 @router.get("/", response_model=List[RamoBase], dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
-def listar_ramos():
-    return controller_get_ramos()
+def listar_ramos(
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior.")
+):
+    nao_modificado = responder_condicional(request, response, controller_get_etag_ramos(limit, cursor))
+    if nao_modificado:
+        return nao_modificado
+    ramos, proximo_cursor = controller_get_ramos(limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return ramos
 
 
 @router.get("/{ramo_id}", response_model=RamoBase, dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends, Path, status
-from typing import List
+from fastapi import APIRouter, Depends, Path, Query, Request, Response, status
+from typing import List, Optional
 from app.controllers import controller_selo as ctrl
-from app.models.selo_model import ConcederSeloRequest, SeloConcedido, SolicitarSeloRequest
-from app.controllers.token import require_permission, get_current_user, TokenPayLoad
+from app.models.selo_model import ConcederSeloRequest, ProcessarSolicitacoesLoteRequest, ProcessarSolicitacoesLoteResponse, SeloConcedido, SolicitarSeloRequest
+from app.controllers.token import require_permission, TokenPayLoad
+from app.service.etag import responder_condicional
+from app.service.serializacao import resposta_lista
+from app.service.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, aplicar_cursor
 
 router = APIRouter(
     tags=["Selos Concedidos (Instâncias)"],
@@ -10,10 +13,10 @@ router = APIRouter(
 )
 
 
-@router.post("/selos/solicitar", status_code=status.HTTP_201_CREATED, summary="Empresa solicita um selo do catálogo", dependencies=[Depends(require_permission("empresa"))])
+@router.post("/selos/solicitar", status_code=status.HTTP_201_CREATED, summary="Empresa solicita um selo do catálogo")
 def solicitar_selo(
     data: SolicitarSeloRequest,
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa"))
 ):
     return ctrl.solicitar_selo_para_minha_empresa(data, current_user)
 
@@ -22,14 +25,33 @@ def conceder_selo(id_empresa: int, data: ConcederSeloRequest):
     return ctrl.conceder_selo_a_empresa(id_empresa, data)
 
 
-@router.get("/empresas/{id_empresa}/selos", response_model=List[SeloConcedido], summary="Lista os selos de uma empresa", dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
-def listar_selos_empresa(id_empresa: int, current_user: TokenPayLoad = Depends(get_current_user)):
-    return ctrl.listar_selos_de_empresa(id_empresa, current_user)
+@router.get("/empresas/{id_empresa}/selos", response_model=List[SeloConcedido], summary="Lista os selos de uma empresa")
+def listar_selos_empresa(
+    id_empresa: int,
+    request: Request,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior."),
+    current_user: TokenPayLoad = Depends(require_permission("empresa", "admin", "admin_master"))
+):
+    etag = ctrl.get_etag_selos_de_empresa(id_empresa, current_user, limit, cursor)
+    nao_modificado = responder_condicional(request, response, etag)
+    if nao_modificado:
+        return nao_modificado
+    selos, proximo_cursor = ctrl.listar_selos_de_empresa(id_empresa, current_user, limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return resposta_lista(SeloConcedido, selos, response)
 
 
 @router.get("/selos/solicitacoes", response_model=List[SeloConcedido], summary="Lista todas as solicitações de selo pendentes", dependencies=[Depends(require_permission("admin", "admin_master"))])
-def listar_solicitacoes():
-    return ctrl.listar_solicitacoes_pendentes()
+def listar_solicitacoes(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(None, description="Cursor opaco retornado no cabeçalho X-Next-Cursor da página anterior.")
+):
+    solicitacoes, proximo_cursor = ctrl.listar_solicitacoes_pendentes(limit, cursor)
+    aplicar_cursor(response, proximo_cursor)
+    return resposta_lista(SeloConcedido, solicitacoes, response)
 
 
 @router.put("/empresa-selos/{empresa_selo_id}/aprovar", summary="Aprova uma solicitação de selo", dependencies=[Depends(require_permission("admin", "admin_master"))])
@@ -40,10 +62,14 @@ def aprovar_selo(empresa_selo_id: int = Path(..., description="O ID da tabela 'e
 def recusar_solicitacao(empresa_selo_id: int = Path(..., description="O ID da tabela 'empresa_selo'")):
     return ctrl.recusar_selo_concedido(empresa_selo_id)
 
-@router.put("/empresa-selos/{empresa_selo_id}/solicitar-renovacao", summary="Solicita a renovação de um selo", dependencies=[Depends(require_permission("empresa"))])
+@router.post("/empresa-selos/lote", response_model=ProcessarSolicitacoesLoteResponse, summary="Aprova ou recusa várias solicitações de selo de uma vez", dependencies=[Depends(require_permission("admin", "admin_master"))])
+def processar_solicitacoes_em_lote(data: ProcessarSolicitacoesLoteRequest):
+    return ctrl.processar_solicitacoes_em_lote(data)
+
+@router.put("/empresa-selos/{empresa_selo_id}/solicitar-renovacao", summary="Solicita a renovação de um selo")
 def solicitar_renovacao(
     empresa_selo_id: int = Path(..., description="O ID da tabela 'empresa_selo'"),
-    current_user: TokenPayLoad = Depends(get_current_user)
+    current_user: TokenPayLoad = Depends(require_permission("empresa"))
 ):
     return ctrl.solicitar_renovacao_de_selo(empresa_selo_id, current_user)
 
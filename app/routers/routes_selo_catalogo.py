@@ -1,8 +1,9 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Request, Response, status
 from typing import List
 from app.controllers import controller_selo as ctrl
 from app.models.selo_model import SeloInDB, SeloCreate, SeloUpdate
 from app.controllers.token import require_permission
+from app.service.etag import responder_condicional
 
 router = APIRouter(
     prefix="/selos-catalogo",
@@ -17,5 +18,8 @@ def criar_selo_no_catalogo(data: SeloCreate):
 
 
 @router.get("/", response_model=List[SeloInDB], summary="Lista todos os tipos de selo do catálogo",  dependencies=[Depends(require_permission("empresa", "admin", "admin_master"))])
-def listar_selos_do_catalogo():
+def listar_selos_do_catalogo(request: Request, response: Response):
+    nao_modificado = responder_condicional(request, response, ctrl.get_etag_catalogo_selos())
+    if nao_modificado:
+        return nao_modificado
     return ctrl.listar_tipos_selo()
\ No newline at end of file
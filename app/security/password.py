@@ -1,11 +1,133 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# O bcrypt libera o GIL durante o cálculo do hash, então um pool de threads
+# já distribui logins simultâneos entre os núcleos disponíveis.
+HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", os.cpu_count() or 2))
+HASH_MAX_PENDING = int(os.getenv("PASSWORD_HASH_MAX_PENDING", HASH_WORKERS * 8))
+
+
+class _PasswordHasher:
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers, thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _op_metrics(self, op: str) -> Dict[str, float]:
+        metrics = self._metrics.get(op)
+        if metrics is None:
+            metrics = self._metrics[op] = {
+                "completed": 0, "rejected": 0, "cancelled": 0,
+                "wait_seconds_total": 0.0, "wait_seconds_max": 0.0,
+                "run_seconds_total": 0.0, "run_seconds_max": 0.0,
+            }
+        return metrics
+
+    def submit(self, op: str, func: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._op_metrics(op)["rejected"] += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Serviço de autenticação sobrecarregado. Tente novamente em instantes.",
+                    headers={"Retry-After": "1"}
+                )
+            self._pending += 1
+
+        enfileirado_em = time.perf_counter()
+
+        def run():
+            inicio = time.perf_counter()
+            try:
+                return func(*args)
+            finally:
+                fim = time.perf_counter()
+                with self._lock:
+                    metrics = self._op_metrics(op)
+                    metrics["completed"] += 1
+                    espera, execucao = inicio - enfileirado_em, fim - inicio
+                    metrics["wait_seconds_total"] += espera
+                    metrics["wait_seconds_max"] = max(metrics["wait_seconds_max"], espera)
+                    metrics["run_seconds_total"] += execucao
+                    metrics["run_seconds_max"] = max(metrics["run_seconds_max"], execucao)
+
+        def liberar(future: Future):
+            # Chamado ao terminar e também ao cancelar (cliente desconectou
+            # durante o await, ou shutdown), quando `run()` nem chega a rodar.
+            with self._lock:
+                self._pending -= 1
+                if future.cancelled():
+                    self._op_metrics(op)["cancelled"] += 1
+
+        try:
+            future = self._get_executor().submit(run)
+        except BaseException:
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(liberar)
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self._pending,
+                "operations": {op: dict(m) for op, m in self._metrics.items()},
+            }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_hasher = _PasswordHasher(HASH_WORKERS, HASH_MAX_PENDING)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return _hasher.submit("verify", pwd_context.verify, plain_password, hashed_password).result()
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return _hasher.submit("hash", pwd_context.hash, password).result()
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await asyncio.wrap_future(
+        _hasher.submit("verify", pwd_context.verify, plain_password, hashed_password))
+
+
+async def get_password_hash_async(password: str) -> str:
+    return await asyncio.wrap_future(_hasher.submit("hash", pwd_context.hash, password))
+
+
+def get_password_hasher_stats() -> Dict[str, Any]:
+    return _hasher.stats()
+
+
+def shutdown_password_hasher() -> None:
+    _hasher.shutdown()
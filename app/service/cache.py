@@ -0,0 +1,145 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Cache em memória com expiração por tempo (TTL) e descarte LRU.
+
+    Thread-safe; mantém contadores de hits/misses/evictions para observação
+    via `stats()`. Cada processo (worker) tem a sua própria instância, então
+    o TTL limita quanto tempo outro worker pode servir um dado antigo.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, name: str = "cache"):
+        if maxsize < 1:
+            raise ValueError("maxsize deve ser maior que zero.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        # Incrementada a cada invalidação; permite descartar valores carregados
+        # do banco antes de uma escrita concorrente (ver `set(generation=...)`).
+        with self._lock:
+            return self._generation
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key, _MISSING)
+            if item is _MISSING:
+                self._misses += 1
+                return default
+            value, expira_em = item
+            if expira_em <= time.monotonic():
+                del self._data[key]
+                self._misses += 1
+                return default
+            self._data.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None,
+            generation: Optional[int] = None) -> None:
+        expira_em = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            self._data[key] = (value, expira_em)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self._evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                if self._data.pop(key, _MISSING) is not _MISSING:
+                    self._invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._invalidations += len(self._data)
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_ratio": round(self._hits / total, 4) if total else 0.0,
+                "evictions": self._evictions,
+                "invalidations": self._invalidations,
+            }
+
+
+class CatalogSnapshot:
+    __slots__ = ("linhas", "por_id", "versao")
+
+    def __init__(self, linhas: List[Dict[str, Any]]):
+        self.linhas = tuple(linhas)
+        self.por_id = {linha["id"]: linha for linha in linhas}
+        bruto = json.dumps(linhas, default=str, sort_keys=True, separators=(",", ":"))
+        self.versao = hashlib.sha1(bruto.encode()).hexdigest()[:16]
+
+
+class CatalogCache:
+    """
+    Cache read-through de uma tabela de catálogo inteira (poucas linhas,
+    raramente alterada). Guarda um snapshot imutável com índice por id e uma
+    versão derivada do conteúdo, igual em todos os workers para os mesmos
+    dados. Os caminhos de escrita chamam `invalidate()`; o TTL limita quanto
+    tempo outro worker pode servir o snapshot anterior.
+    """
+
+    _KEY = "snapshot"
+
+    def __init__(self, name: str, loader: Callable[[], List[Dict[str, Any]]], ttl: float = 300.0):
+        self._loader = loader
+        self._cache = TTLCache(maxsize=1, ttl=ttl, name=name)
+        self._load_lock = threading.Lock()
+
+    def snapshot(self) -> CatalogSnapshot:
+        atual = self._cache.get(self._KEY)
+        if atual is not None:
+            return atual
+        # Evita que várias threads recarreguem o catálogo ao mesmo tempo.
+        with self._load_lock:
+            atual = self._cache.get(self._KEY)
+            if atual is not None:
+                return atual
+            geracao = self._cache.generation
+            atual = CatalogSnapshot(self._loader())
+            self._cache.set(self._KEY, atual, generation=geracao)
+            return atual
+
+    def invalidate(self) -> None:
+        self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return self._cache.stats()
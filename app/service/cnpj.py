@@ -0,0 +1,104 @@
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+PESOS_DV1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+PESOS_DV2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2], dtype=np.int64)
+
+# Tudo que não é dígito é removido na normalização ("12.345.678/0001-95").
+_NAO_DIGITOS = bytes(c for c in range(256) if not 48 <= c <= 57)
+# Posições de "XX.XXX.XXX/XXXX-XX" que recebem os 14 dígitos.
+_POSICOES_DIGITOS = np.array([0, 1, 3, 4, 5, 7, 8, 9, 11, 12, 13, 14, 16, 17])
+_MASCARA = np.frombuffer(b"00.000.000/0000-00", dtype=np.uint8)
+
+
+def _digito(soma: np.ndarray) -> np.ndarray:
+    resto = soma % 11
+    return np.where(resto < 2, 0, 11 - resto)
+
+
+def digitos_verificadores(bases: np.ndarray) -> np.ndarray:
+    """Recebe (n, 12) dígitos e devolve os (n, 2) dígitos verificadores."""
+    dv1 = _digito(bases @ PESOS_DV1)
+    dv2 = _digito(bases @ PESOS_DV2[:12] + dv1 * PESOS_DV2[12])
+    return np.stack([dv1, dv2], axis=1)
+
+
+def _sem_repeticao(digitos: np.ndarray) -> np.ndarray:
+    # "00000000000000", "11111111111111"... passam no cálculo, mas não são CNPJs.
+    return (digitos != digitos[:, :1]).any(axis=1)
+
+
+def normalizar_cnpjs(valores: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Remove a pontuação e devolve `(digitos, formato_ok)`: uma matriz (n, 14)
+    de dígitos e uma máscara das posições que tinham exatamente 14 dígitos
+    (as demais linhas da matriz ficam zeradas).
+    """
+    limpos = [str(v).encode("ascii", "ignore").translate(None, _NAO_DIGITOS) for v in valores]
+    formato_ok = np.fromiter((len(v) == 14 for v in limpos), dtype=bool, count=len(limpos))
+    digitos = np.zeros((len(limpos), 14), dtype=np.int64)
+    if formato_ok.any():
+        buffer = b"".join(v for v, ok in zip(limpos, formato_ok) if ok)
+        digitos[formato_ok] = np.frombuffer(buffer, dtype=np.uint8).reshape(-1, 14) - 48
+    return digitos, formato_ok
+
+
+def validar_digitos(digitos: np.ndarray) -> np.ndarray:
+    calculados = digitos_verificadores(digitos[:, :12])
+    return (calculados == digitos[:, 12:]).all(axis=1) & _sem_repeticao(digitos)
+
+
+def validar_cnpjs(valores: Sequence[str]) -> np.ndarray:
+    """Máscara booleana: 14 dígitos e dígitos verificadores corretos."""
+    digitos, formato_ok = normalizar_cnpjs(valores)
+    return formato_ok & validar_digitos(digitos)
+
+
+def formatar_cnpjs(digitos: np.ndarray) -> List[str]:
+    saida = np.broadcast_to(_MASCARA, (len(digitos), len(_MASCARA))).copy()
+    saida[:, _POSICOES_DIGITOS] = digitos.astype(np.uint8) + 48
+    return saida.view("S18").ravel().astype(str).tolist()
+
+
+def gerar_cnpjs(quantidade: int, existentes: Optional[Iterable[str]] = None,
+                rng: Optional[np.random.Generator] = None) -> List[str]:
+    """
+    Gera `quantidade` CNPJs válidos, formatados, distintos entre si e fora
+    de `existentes` (um set de CNPJs formatados, como gravados no banco).
+    """
+    rng = rng or np.random.default_rng()
+    existentes = existentes if existentes is not None else ()
+    gerados: List[str] = []
+    vistos = set()
+    while len(gerados) < quantidade:
+        # Folga para descartar repetidos sem outra rodada na maioria dos casos.
+        faltam = quantidade - len(gerados)
+        bases = rng.integers(0, 10, size=(faltam + faltam // 10 + 8, 12), dtype=np.int64)
+        digitos = np.concatenate([bases, digitos_verificadores(bases)], axis=1)
+        digitos = digitos[_sem_repeticao(digitos)]
+        for cnpj in formatar_cnpjs(digitos):
+            if cnpj not in vistos and cnpj not in existentes:
+                vistos.add(cnpj)
+                gerados.append(cnpj)
+                if len(gerados) == quantidade:
+                    break
+    return gerados
+
+
+def normalizar_cnpj(valor: str) -> Optional[str]:
+    """Os 14 dígitos do CNPJ, ou None se não houver exatamente 14."""
+    digitos = valor.encode("ascii", "ignore").translate(None, _NAO_DIGITOS)
+    return digitos.decode() if len(digitos) == 14 else None
+
+
+def formatar_cnpj(digitos: str) -> str:
+    return f"{digitos[:2]}.{digitos[2:5]}.{digitos[5:8]}/{digitos[8:12]}-{digitos[12:]}"
+
+
+def cnpj_valido(valor: str) -> bool:
+    return bool(validar_cnpjs([valor])[0])
+
+
+def gerar_cnpj() -> str:
+    return gerar_cnpjs(1)[0]
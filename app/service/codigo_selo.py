@@ -0,0 +1,69 @@
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Optional
+
+# Alfabeto base32 de Crockford (sem I, L, O, U): ordenação lexicográfica igual
+# à ordem numérica, então códigos gerados depois sempre comparam como maiores.
+_ALFABETO = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+_TIMESTAMP_MAX = (1 << 48) - 1
+
+
+def _encode(valor: int, tamanho: int) -> str:
+    chars = []
+    for _ in range(tamanho):
+        valor, resto = divmod(valor, 32)
+        chars.append(_ALFABETO[resto])
+    return "".join(reversed(chars))
+
+
+class GeradorULID:
+    """
+    Gera ULIDs (48 bits de milissegundos + 80 bits aleatórios, 26 caracteres).
+
+    Dentro de um mesmo milissegundo a parte aleatória é incrementada, então a
+    sequência é estritamente crescente no processo. Entre workers/nós a
+    unicidade vem dos 80 bits aleatórios sorteados a cada novo milissegundo,
+    sem nenhuma coordenação pelo banco.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ultimo_ms = -1
+        self._ultimo_aleatorio = 0
+
+    def novo(self, timestamp_ms: Optional[int] = None) -> str:
+        agora = time.time_ns() // 1_000_000 if timestamp_ms is None else timestamp_ms
+        with self._lock:
+            if agora > self._ultimo_ms:
+                self._ultimo_ms = agora
+                # Reserva o bit mais alto para que haja espaço para incrementos.
+                self._ultimo_aleatorio = int.from_bytes(os.urandom(10), "big") >> 1
+            else:
+                # Mesmo milissegundo (ou relógio voltou): continua a sequência.
+                self._ultimo_aleatorio += 1
+                if self._ultimo_aleatorio > _RANDOM_MAX:
+                    self._ultimo_ms += 1
+                    self._ultimo_aleatorio = int.from_bytes(os.urandom(10), "big") >> 1
+            ms, aleatorio = self._ultimo_ms, self._ultimo_aleatorio
+
+        if ms > _TIMESTAMP_MAX:
+            raise ValueError("Timestamp fora do intervalo suportado pelo ULID.")
+        return _encode(ms, 10) + _encode(aleatorio, 16)
+
+
+_gerador = GeradorULID()
+
+
+def novo_ulid() -> str:
+    return _gerador.novo()
+
+
+def gerar_codigo_selo(sigla: str, id_empresa: int, ano: Optional[int] = None) -> str:
+    # SIGLA-ANO-EMPRESA-ULID: no máximo 3 + 4 + 10 + 26 + 3 separadores = 46
+    # caracteres, dentro do VARCHAR(50) de empresa_selo.codigo_selo.
+    ano = ano or datetime.now().year
+    return f"{sigla}-{ano}-{id_empresa}-{novo_ulid()}"
@@ -1,4 +1,5 @@
 from fastapi.middleware.cors import CORSMiddleware
+from app.service.pagination import NEXT_CURSOR_HEADER
 import os
 
 origins = os.getenv("ALLOWED_ORIGINS", "").split(",")
@@ -11,4 +12,5 @@ def add_cors(app):
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing"],
     )
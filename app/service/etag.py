@@ -0,0 +1,65 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, Optional
+
+from fastapi import Request, Response, status
+
+# Os clientes precisam revalidar sempre (no-cache), mas podem reaproveitar o
+# corpo quando recebem 304. `private` porque as respostas dependem do usuário.
+CACHE_CONTROL = "private, no-cache"
+
+
+def montar_etag(*partes: Any) -> str:
+    bruto = "|".join("" if p is None else str(p) for p in partes)
+    return f'W/"{hashlib.sha1(bruto.encode()).hexdigest()[:20]}"'
+
+
+def _etag_corresponde(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Comparação fraca (RFC 9110, 13.1.2): ignora o prefixo W/.
+    alvo = etag.removeprefix("W/")
+    return any(candidato.strip().removeprefix("W/") == alvo
+               for candidato in if_none_match.split(","))
+
+
+def _nao_modificado_desde(if_modified_since: str, ultima_modificacao: datetime) -> bool:
+    try:
+        referencia = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if referencia.tzinfo is None:
+        referencia = referencia.replace(tzinfo=timezone.utc)
+    return ultima_modificacao.replace(microsecond=0) <= referencia
+
+
+def responder_condicional(request: Request, response: Response, etag: Optional[str],
+                          ultima_modificacao: Optional[datetime] = None) -> Optional[Response]:
+    """
+    Aplica ETag/Last-Modified na resposta e, se a versão do cliente ainda for
+    a atual, devolve um 304 para a rota retornar direto (sem consultar nem
+    serializar o corpo). Retorna None quando a rota deve seguir normalmente.
+    """
+    if etag is None:
+        return None
+
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if ultima_modificacao is not None:
+        # Datas sem fuso vindas do MySQL estão no horário local do servidor.
+        ultima_modificacao = ultima_modificacao.astimezone(timezone.utc)
+        headers["Last-Modified"] = format_datetime(ultima_modificacao, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        nao_modificado = _etag_corresponde(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        nao_modificado = (ultima_modificacao is not None and if_modified_since is not None
+                          and _nao_modificado_desde(if_modified_since, ultima_modificacao))
+
+    if nao_modificado:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
@@ -0,0 +1,79 @@
+from typing import Dict
+
+import orjson
+
+
+class _CorpoGrandeDemais(Exception):
+    pass
+
+
+class LimiteCorpoMiddleware:
+    """
+    Limita o tamanho do corpo das requisições para os caminhos em `limites`
+    ({caminho: bytes}). Atua enquanto o corpo chega, antes de o Starlette
+    gravar o multipart em arquivo temporário: recusa pelo Content-Length e,
+    sem ele (chunked), interrompe a leitura ao passar do limite. Em ambos os
+    casos a resposta é 413.
+    """
+
+    def __init__(self, app, limites: Dict[str, int]):
+        self.app = app
+        self.limites = limites
+
+    async def __call__(self, scope, receive, send):
+        limite = self.limites.get(scope["path"]) if scope["type"] == "http" else None
+        if limite is None:
+            await self.app(scope, receive, send)
+            return
+
+        for nome, valor in scope["headers"]:
+            if nome == b"content-length" and valor.isdigit() and int(valor) > limite:
+                await _responder_413(send, limite)
+                return
+
+        recebidos = 0
+        excedido = False
+        iniciada = False
+
+        async def receber():
+            nonlocal recebidos, excedido
+            mensagem = await receive()
+            if mensagem["type"] == "http.request":
+                recebidos += len(mensagem.get("body", b""))
+                if recebidos > limite:
+                    excedido = True
+                    raise _CorpoGrandeDemais()
+            return mensagem
+
+        async def enviar(mensagem):
+            nonlocal iniciada
+            # O erro de leitura vira um 400 genérico no FastAPI; é descartado
+            # e substituído pelo 413 abaixo.
+            if excedido and not iniciada:
+                return
+            if mensagem["type"] == "http.response.start":
+                iniciada = True
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receber, enviar)
+        except _CorpoGrandeDemais:
+            pass
+        if excedido and not iniciada:
+            await _responder_413(send, limite)
+
+
+async def _responder_413(send, limite: int) -> None:
+    corpo = orjson.dumps({"detail": f"Arquivo maior que o limite de {limite} bytes."})
+    await send({
+        "type": "http.response.start",
+        "status": 413,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(corpo)).encode()),
+                    (b"connection", b"close")],
+    })
+    await send({"type": "http.response.body", "body": corpo})
+
+
+def add_limite_corpo(app, limites: Dict[str, int]) -> None:
+    app.add_middleware(LimiteCorpoMiddleware, limites=limites)
@@ -0,0 +1,323 @@
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+
+METRICAS_HABILITADAS = os.getenv("METRICAS_HABILITADAS", "true").lower() == "true"
+PREFIXO = "ibdn"
+# Limites (em segundos) dos buckets do histograma de latência por rota.
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Rótulo das requisições que não casaram com nenhuma rota (404), para não
+# criar uma série por URL inventada.
+ROTA_DESCONHECIDA = "desconhecida"
+
+
+class MetricasRequisicao:
+    """Acesso ao banco feito durante uma requisição (ver `_requisicao_atual`)."""
+    __slots__ = ("consultas", "conexoes", "segundos_banco", "segundos_conexao")
+
+    def __init__(self):
+        self.consultas = 0
+        self.conexoes = 0
+        self.segundos_banco = 0.0
+        self.segundos_conexao = 0.0
+
+    def server_timing(self, segundos_total: float) -> str:
+        # Valores de cabeçalho HTTP são latin-1; sem acentos por segurança.
+        return (f'total;dur={segundos_total * 1000:.1f}, '
+                f'db;dur={self.segundos_banco * 1000:.1f};desc="{self.consultas} consultas", '
+                f'conexao;dur={self.segundos_conexao * 1000:.1f};desc="{self.conexoes} conexoes"')
+
+
+# O middleware cria um MetricasRequisicao por requisição. Rotas síncronas
+# rodam no threadpool com uma cópia do contexto, que aponta para o mesmo
+# objeto; fora de requisições (seeds, scheduler) o valor é None.
+_requisicao_atual: ContextVar[Optional[MetricasRequisicao]] = ContextVar("metricas_requisicao", default=None)
+
+
+def metricas_atuais() -> Optional[MetricasRequisicao]:
+    return _requisicao_atual.get()
+
+
+def registrar_conexao(segundos: float) -> None:
+    metricas = _requisicao_atual.get()
+    if metricas is not None:
+        metricas.conexoes += 1
+        metricas.segundos_conexao += segundos
+
+
+class CursorInstrumentado:
+    """
+    Envolve um cursor do mysql-connector e soma o tempo de execute/fetch nas
+    métricas da requisição. O resto (lastrowid, rowcount, close...) é delegado.
+    """
+
+    def __init__(self, cursor, metricas: MetricasRequisicao):
+        self._cursor = cursor
+        self._metricas = metricas
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self) -> "CursorInstrumentado":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._cursor.close()
+
+    def _medir(self, metodo, *args, consulta: bool = False, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return metodo(*args, **kwargs)
+        finally:
+            self._metricas.segundos_banco += time.perf_counter() - inicio
+            if consulta:
+                self._metricas.consultas += 1
+
+    def execute(self, *args, **kwargs):
+        return self._medir(self._cursor.execute, *args, consulta=True, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self._medir(self._cursor.executemany, *args, consulta=True, **kwargs)
+
+    def callproc(self, *args, **kwargs):
+        return self._medir(self._cursor.callproc, *args, consulta=True, **kwargs)
+
+    def fetchone(self):
+        return self._medir(self._cursor.fetchone)
+
+    def fetchmany(self, *args, **kwargs):
+        return self._medir(self._cursor.fetchmany, *args, **kwargs)
+
+    def fetchall(self):
+        return self._medir(self._cursor.fetchall)
+
+
+class CursorAsyncInstrumentado(CursorInstrumentado):
+    """Mesma ideia para o cursor do aiomysql (que já traz as linhas no execute)."""
+
+    async def _medir_async(self, metodo, *args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return await metodo(*args, **kwargs)
+        finally:
+            self._metricas.segundos_banco += time.perf_counter() - inicio
+            self._metricas.consultas += 1
+
+    async def execute(self, *args, **kwargs):
+        return await self._medir_async(self._cursor.execute, *args, **kwargs)
+
+    async def executemany(self, *args, **kwargs):
+        return await self._medir_async(self._cursor.executemany, *args, **kwargs)
+
+    async def fetchone(self):
+        return await self._cursor.fetchone()
+
+    async def fetchmany(self, *args, **kwargs):
+        return await self._cursor.fetchmany(*args, **kwargs)
+
+    async def fetchall(self):
+        return await self._cursor.fetchall()
+
+
+def instrumentar_cursor(cursor):
+    metricas = _requisicao_atual.get()
+    return cursor if metricas is None else CursorInstrumentado(cursor, metricas)
+
+
+def instrumentar_cursor_async(cursor):
+    metricas = _requisicao_atual.get()
+    return cursor if metricas is None else CursorAsyncInstrumentado(cursor, metricas)
+
+
+class Histograma:
+    def __init__(self, limites: Tuple[float, ...] = BUCKETS_LATENCIA):
+        self.limites = limites
+        self.contagens = [0] * (len(limites) + 1)
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float) -> None:
+        self.contagens[bisect_left(self.limites, valor)] += 1
+        self.soma += valor
+        self.total += 1
+
+
+class _Rota:
+    __slots__ = ("consultas", "conexoes", "segundos_banco", "segundos_conexao")
+
+    def __init__(self):
+        self.consultas = 0
+        self.conexoes = 0
+        self.segundos_banco = 0.0
+        self.segundos_conexao = 0.0
+
+
+class ColetorHttp:
+    """
+    Agregados por rota (o template, ex.: /empresas/{empresa_id}) deste
+    processo. Com vários workers, cada um expõe os próprios números.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencias: Dict[Tuple[str, str, str], Histograma] = {}
+        self._rotas: Dict[Tuple[str, str], _Rota] = {}
+        self.em_andamento = 0
+
+    def iniciar(self) -> None:
+        with self._lock:
+            self.em_andamento += 1
+
+    def finalizar(self, metodo: str, rota: str, status: int, segundos: float,
+                  metricas: MetricasRequisicao) -> None:
+        with self._lock:
+            self.em_andamento -= 1
+            chave = (metodo, rota, str(status))
+            histograma = self._latencias.get(chave)
+            if histograma is None:
+                histograma = self._latencias[chave] = Histograma()
+            histograma.observar(segundos)
+            agregado = self._rotas.get((metodo, rota))
+            if agregado is None:
+                agregado = self._rotas[(metodo, rota)] = _Rota()
+            agregado.consultas += metricas.consultas
+            agregado.conexoes += metricas.conexoes
+            agregado.segundos_banco += metricas.segundos_banco
+            agregado.segundos_conexao += metricas.segundos_conexao
+
+    def exportar(self) -> List[str]:
+        with self._lock:
+            latencias = {chave: (list(h.contagens), h.soma, h.total, h.limites)
+                         for chave, h in self._latencias.items()}
+            rotas = {chave: (r.consultas, r.conexoes, r.segundos_banco, r.segundos_conexao)
+                     for chave, r in self._rotas.items()}
+            em_andamento = self.em_andamento
+
+        nome = f"{PREFIXO}_http_request_duration_seconds"
+        linhas = [f"# HELP {nome} Latência das requisições HTTP por rota.",
+                  f"# TYPE {nome} histogram"]
+        for (metodo, rota, status), (contagens, soma, total, limites) in sorted(latencias.items()):
+            rotulos = f'method="{_escapar(metodo)}",route="{_escapar(rota)}",status="{status}"'
+            acumulado = 0
+            for limite, contagem in zip(limites, contagens):
+                acumulado += contagem
+                linhas.append(f'{nome}_bucket{{{rotulos},le="{limite}"}} {acumulado}')
+            linhas.append(f'{nome}_bucket{{{rotulos},le="+Inf"}} {total}')
+            linhas.append(f"{nome}_sum{{{rotulos}}} {soma:.6f}")
+            linhas.append(f"{nome}_count{{{rotulos}}} {total}")
+
+        for indice, (sufixo, ajuda) in enumerate((
+            ("db_queries_total", "Consultas ao banco feitas pelas requisições da rota."),
+            ("db_connections_total", "Conexões do pool usadas pelas requisições da rota."),
+            ("db_seconds_total", "Tempo gasto em execute/fetch pelas requisições da rota."),
+            ("db_connection_seconds_total", "Tempo gasto obtendo conexões do pool pela rota."),
+        )):
+            nome = f"{PREFIXO}_http_{sufixo}"
+            linhas += [f"# HELP {nome} {ajuda}", f"# TYPE {nome} counter"]
+            for (metodo, rota), valores in sorted(rotas.items()):
+                linhas.append(f'{nome}{{method="{_escapar(metodo)}",route="{_escapar(rota)}"}} '
+                              f'{_formatar(valores[indice])}')
+
+        nome = f"{PREFIXO}_http_requests_in_progress"
+        linhas += [f"# HELP {nome} Requisições HTTP em andamento.", f"# TYPE {nome} gauge",
+                   f"{nome} {em_andamento}"]
+        return linhas
+
+
+coletor = ColetorHttp()
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar(valor: float) -> str:
+    return str(valor) if isinstance(valor, int) else f"{valor:.6f}"
+
+
+def _achatar(prefixo: str, valores: Dict[str, Any]) -> Iterable[Tuple[str, float]]:
+    for chave, valor in valores.items():
+        nome = f"{prefixo}_{re.sub(r'[^a-zA-Z0-9_]', '_', str(chave))}"
+        if isinstance(valor, dict):
+            yield from _achatar(nome, valor)
+        elif isinstance(valor, bool):
+            yield nome, int(valor)
+        elif isinstance(valor, (int, float)):
+            yield nome, valor
+        elif isinstance(valor, datetime):
+            yield nome + "_timestamp_seconds", valor.timestamp()
+        # Textos (nomes, URLs, mensagens de erro) não viram métrica.
+
+
+def exportar_estatisticas(grupos: Dict[str, Optional[Dict[str, Any]]]) -> List[str]:
+    """
+    Converte os dicts de `get_*_stats()` em gauges (ou counters, para chaves
+    terminadas em `_total`): {"pool": {"in_use": 2}} -> ibdn_pool_in_use 2.
+    """
+    linhas = []
+    for grupo, valores in grupos.items():
+        if not valores:
+            continue
+        for nome, valor in _achatar(f"{PREFIXO}_{grupo}", valores):
+            tipo = "counter" if nome.endswith("_total") else "gauge"
+            linhas += [f"# TYPE {nome} {tipo}", f"{nome} {_formatar(valor)}"]
+    return linhas
+
+
+def _rota(scope) -> str:
+    # O roteamento do FastAPI grava a rota casada no próprio scope.
+    rota = scope.get("route")
+    return getattr(rota, "path", None) or ROTA_DESCONHECIDA
+
+
+class MetricasMiddleware:
+    """
+    Middleware ASGI puro (sem BaseHTTPMiddleware, que copiaria o corpo e
+    quebraria o contexto): mede a latência por rota, acumula o acesso ao
+    banco da requisição e devolve o resumo no cabeçalho Server-Timing.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        metricas = MetricasRequisicao()
+        token = _requisicao_atual.set(metricas)
+        inicio = time.perf_counter()
+        status = 500
+
+        async def enviar(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+                # Em respostas em streaming, o valor cobre até o início do corpo.
+                MutableHeaders(scope=mensagem).append(
+                    "Server-Timing", metricas.server_timing(time.perf_counter() - inicio))
+            await send(mensagem)
+
+        coletor.iniciar()
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _requisicao_atual.reset(token)
+            coletor.finalizar(scope["method"], _rota(scope), status,
+                              time.perf_counter() - inicio, metricas)
+
+
+def add_metricas(app) -> None:
+    if METRICAS_HABILITADAS:
+        app.add_middleware(MetricasMiddleware)
@@ -0,0 +1,250 @@
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import socket
+import struct
+import threading
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+import orjson
+
+logger = logging.getLogger("notificacoes_hub")
+
+FILA_MAXIMA = int(os.getenv("NOTIFICACOES_FILA_MAXIMA", 100))
+# Vazio: entrega só dentro do processo. "udp://239.255.42.99:49999": repassa os
+# eventos entre os workers da mesma máquina via multicast UDP.
+BROKER_URL = os.getenv("NOTIFICACOES_BROKER", "")
+# Chave do HMAC que assina cada datagrama do broker; por padrão, a SECRET_KEY
+# da API (todos os workers precisam da mesma).
+BROKER_CHAVE = os.getenv("NOTIFICACOES_BROKER_CHAVE") or os.getenv("SECRET_KEY", "")
+_TAMANHO_ORIGEM = 16
+_TAMANHO_ASSINATURA = hashlib.sha256().digest_size
+
+# Enviado no lugar dos eventos perdidos quando a fila de um assinante lento
+# enche: o cliente deve recarregar a lista (GET com If-None-Match).
+EVENTO_RESSINCRONIZAR = {"evento": "ressincronizar"}
+
+
+class _Assinante:
+    __slots__ = ("loop", "fila")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, tamanho: int):
+        self.loop = loop
+        self.fila: asyncio.Queue = asyncio.Queue(maxsize=tamanho)
+
+    def entregar(self, evento: Dict[str, Any]) -> None:
+        # Sempre executado no loop do assinante.
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            while not self.fila.empty():
+                self.fila.get_nowait()
+            self.fila.put_nowait(EVENTO_RESSINCRONIZAR)
+
+
+class NotificacoesHub:
+    """
+    Fan-out em memória dos eventos de uma empresa para as conexões abertas
+    (SSE) deste processo. `publicar` pode ser chamado de qualquer thread,
+    inclusive das threads do threadpool onde rodam os repositórios.
+    """
+
+    def __init__(self, fila_maxima: int = FILA_MAXIMA):
+        self.fila_maxima = fila_maxima
+        self._assinantes: Dict[int, Set[_Assinante]] = {}
+        self._lock = threading.Lock()
+        self._broker: Optional["BrokerMulticastLocal"] = None
+        self._publicados = 0
+        self._entregues = 0
+
+    @asynccontextmanager
+    async def assinar(self, empresa_id: int) -> AsyncIterator[asyncio.Queue]:
+        assinante = _Assinante(asyncio.get_running_loop(), self.fila_maxima)
+        with self._lock:
+            self._assinantes.setdefault(empresa_id, set()).add(assinante)
+        try:
+            yield assinante.fila
+        finally:
+            with self._lock:
+                assinantes = self._assinantes.get(empresa_id)
+                if assinantes is not None:
+                    assinantes.discard(assinante)
+                    if not assinantes:
+                        del self._assinantes[empresa_id]
+
+    def publicar(self, empresa_id: int, evento: Dict[str, Any]) -> None:
+        self._entregar_local(empresa_id, evento)
+        broker = self._broker
+        if broker is not None:
+            broker.enviar(empresa_id, evento)
+
+    def _entregar_local(self, empresa_id: int, evento: Dict[str, Any]) -> None:
+        with self._lock:
+            self._publicados += 1
+            assinantes = list(self._assinantes.get(empresa_id, ()))
+            self._entregues += len(assinantes)
+        for assinante in assinantes:
+            try:
+                assinante.loop.call_soon_threadsafe(assinante.entregar, evento)
+            except RuntimeError:
+                # Loop já encerrado (shutdown); a assinatura será removida.
+                pass
+
+    def conectar_broker(self, broker: "BrokerMulticastLocal") -> None:
+        self._broker = broker
+        broker.iniciar(self._entregar_local)
+
+    def desconectar_broker(self) -> None:
+        broker, self._broker = self._broker, None
+        if broker is not None:
+            broker.parar()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "empresas": len(self._assinantes),
+                "conexoes": sum(len(a) for a in self._assinantes.values()),
+                "publicados": self._publicados,
+                "entregues": self._entregues,
+                "broker": self._broker.url if self._broker else None,
+            }
+
+
+class BrokerMulticastLocal:
+    """
+    Adaptador opcional para vários workers na mesma máquina: cada processo
+    entra no mesmo grupo multicast (TTL 0, só loopback) e reentrega
+    localmente o que os outros publicaram. Não há garantia de entrega; o
+    cliente SSE se recupera recarregando a lista quando reconecta.
+
+    Datagrama: origem (16 bytes) + HMAC-SHA256(chave, origem + corpo) + corpo
+    JSON. O que não passa na verificação é descartado.
+    """
+
+    def __init__(self, url: str, chave: str = BROKER_CHAVE):
+        destino = urlparse(url)
+        if destino.scheme != "udp" or not destino.hostname or not destino.port:
+            raise ValueError(f"NOTIFICACOES_BROKER inválido: {url!r} (use udp://grupo:porta)")
+        if not chave:
+            raise ValueError("NOTIFICACOES_BROKER exige SECRET_KEY ou NOTIFICACOES_BROKER_CHAVE definida.")
+        self.url = url
+        self._chave = chave.encode()
+        self._grupo: Tuple[str, int] = (destino.hostname, destino.port)
+        self._origem = uuid.uuid4().bytes
+        self._envio: Optional[socket.socket] = None
+        self._recepcao: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._parado = threading.Event()
+
+    def iniciar(self, entregar) -> None:
+        grupo, porta = self._grupo
+        recepcao = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        recepcao.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):
+            recepcao.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Só o grupo: datagramas unicast enviados à porta por outros hosts não chegam.
+        recepcao.bind((grupo, porta))
+        membership = struct.pack("4s4s", socket.inet_aton(grupo), socket.inet_aton("127.0.0.1"))
+        recepcao.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+
+        envio = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        envio.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, 0)
+        envio.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        envio.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF, socket.inet_aton("127.0.0.1"))
+
+        self._recepcao, self._envio = recepcao, envio
+        self._thread = threading.Thread(
+            target=self._receber, args=(recepcao, entregar), name="notificacoes-broker", daemon=True)
+        self._thread.start()
+
+    def enviar(self, empresa_id: int, evento: Dict[str, Any]) -> None:
+        envio = self._envio
+        if envio is None:
+            return
+        mensagem = self._origem + orjson.dumps({"e": empresa_id, "d": evento})
+        try:
+            envio.sendto(mensagem[:_TAMANHO_ORIGEM] + self._assinar(mensagem) + mensagem[_TAMANHO_ORIGEM:],
+                         self._grupo)
+        except OSError as e:
+            logger.warning(f"Falha ao repassar evento de notificação: {e}")
+
+    def _assinar(self, mensagem: bytes) -> bytes:
+        return hmac.new(self._chave, mensagem, hashlib.sha256).digest()
+
+    def _verificar(self, dados: bytes) -> Optional[bytes]:
+        """Corpo do datagrama se a assinatura confere, senão None."""
+        cabecalho = _TAMANHO_ORIGEM + _TAMANHO_ASSINATURA
+        if len(dados) <= cabecalho:
+            return None
+        origem, assinatura, corpo = dados[:_TAMANHO_ORIGEM], dados[_TAMANHO_ORIGEM:cabecalho], dados[cabecalho:]
+        if not hmac.compare_digest(assinatura, self._assinar(origem + corpo)):
+            return None
+        return corpo
+
+    def _receber(self, recepcao: socket.socket, entregar) -> None:
+        while True:
+            try:
+                dados = recepcao.recv(65535)
+            except OSError:
+                return
+            if self._parado.is_set():
+                return
+            if dados[:_TAMANHO_ORIGEM] == self._origem:
+                continue
+            corpo = self._verificar(dados)
+            if corpo is None:
+                logger.warning("Datagrama do broker de notificações com assinatura inválida descartado.")
+                continue
+            try:
+                mensagem = orjson.loads(corpo)
+                entregar(int(mensagem["e"]), mensagem["d"])
+            except (ValueError, KeyError, TypeError):
+                logger.warning("Evento de notificação malformado recebido do broker.")
+
+    def parar(self) -> None:
+        self._parado.set()
+        if self._recepcao is not None:
+            try:
+                # Acorda a thread bloqueada em recv() antes de fechar o socket.
+                self._recepcao.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        for sock in (self._envio, self._recepcao):
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        self._envio = self._recepcao = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+
+hub = NotificacoesHub()
+
+
+def publicar_evento(empresa_id: int, evento: Dict[str, Any]) -> None:
+    try:
+        hub.publicar(empresa_id, evento)
+    except Exception as e:
+        # A entrega em tempo real é um complemento: nunca derruba a escrita.
+        logger.warning(f"Falha ao publicar evento da empresa {empresa_id}: {e}")
+
+
+def iniciar_broker_notificacoes() -> None:
+    if BROKER_URL and hub._broker is None:
+        hub.conectar_broker(BrokerMulticastLocal(BROKER_URL))
+
+
+def parar_broker_notificacoes() -> None:
+    hub.desconectar_broker()
+
+
+def get_notificacoes_hub_stats() -> Dict[str, Any]:
+    return hub.stats()
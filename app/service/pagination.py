@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+import os
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+DEFAULT_PAGE_SIZE = int(os.getenv("PAGINATION_DEFAULT_LIMIT", 100))
+MAX_PAGE_SIZE = int(os.getenv("PAGINATION_MAX_LIMIT", 1000))
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(escopo: str, valores: Sequence[Any]) -> str:
+    # Datas/decimais viram string no formato aceito pelo MySQL ('YYYY-MM-DD HH:MM:SS').
+    bruto = json.dumps({"e": escopo, "v": list(valores)},
+                       default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(bruto.encode()).decode().rstrip("=")
+
+
+def decode_cursor(escopo: str, cursor: Optional[str], tamanho: int) -> Optional[List[Any]]:
+    if not cursor:
+        return None
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        dados = json.loads(base64.urlsafe_b64decode(preenchido.encode()))
+        valores = dados["v"]
+        if dados["e"] != escopo or not isinstance(valores, list) or len(valores) != tamanho:
+            raise ValueError
+        return valores
+    except (ValueError, KeyError, TypeError, binascii.Error, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor de paginação inválido."
+        )
+
+
+def keyset_condition(coluna_id: str, valor_id: Any, direcao: str = "ASC",
+                     coluna: Optional[str] = None, valor: Any = None,
+                     anulavel: bool = False) -> Tuple[str, List[Any]]:
+    """
+    Monta o filtro "depois do cursor" para `ORDER BY coluna <dir>, coluna_id <dir>`.
+
+    Com `anulavel=True` respeita a ordenação do MySQL, em que NULL vem antes
+    de qualquer valor em ASC e depois de todos em DESC.
+    """
+    op = ">" if direcao.upper() == "ASC" else "<"
+    if coluna is None:
+        return f"{coluna_id} {op} %s", [valor_id]
+
+    if not anulavel:
+        return (f"({coluna} {op} %s OR ({coluna} = %s AND {coluna_id} {op} %s))",
+                [valor, valor, valor_id])
+
+    if direcao.upper() == "ASC":
+        if valor is None:
+            return (f"(({coluna} IS NULL AND {coluna_id} > %s) OR {coluna} IS NOT NULL)",
+                    [valor_id])
+        return (f"({coluna} > %s OR ({coluna} = %s AND {coluna_id} > %s))",
+                [valor, valor, valor_id])
+
+    if valor is None:
+        return f"({coluna} IS NULL AND {coluna_id} < %s)", [valor_id]
+    return (f"({coluna} < %s OR ({coluna} = %s AND {coluna_id} < %s) OR {coluna} IS NULL)",
+            [valor, valor, valor_id])
+
+
+def montar_pagina(escopo: str, rows: List[Any], limit: int,
+                  chave: Callable[[Any], Sequence[Any]]) -> Tuple[List[Any], Optional[str]]:
+    """Recebe até `limit + 1` linhas e devolve a página e o cursor da próxima, se houver."""
+    if len(rows) <= limit:
+        return rows, None
+    pagina = rows[:limit]
+    return pagina, encode_cursor(escopo, chave(pagina[-1]))
+
+
+def aplicar_cursor(response: Response, proximo_cursor: Optional[str]) -> None:
+    if proximo_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = proximo_cursor
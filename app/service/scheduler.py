@@ -0,0 +1,84 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from apscheduler.schedulers.background import BackgroundScheduler
+
+from app.repository.expiracao_selos_repository import repo_processar_expiracao_selos
+
+logger = logging.getLogger("scheduler")
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "true").lower() == "true"
+EXPIRACAO_INTERVALO = int(os.getenv("SELO_EXPIRACAO_INTERVALO", 3600))
+ALERTA_DIAS_PADRAO = int(os.getenv("SELO_ALERTA_DIAS_PADRAO", 30))
+ALERTA_JANELA_MAXIMA = int(os.getenv("SELO_ALERTA_JANELA_MAXIMA", 90))
+EXPIRACAO_LOTE = int(os.getenv("SELO_EXPIRACAO_LOTE", 500))
+
+# Com vários workers do gunicorn, cada um agenda o job no próprio horário. Sob
+# o lock nomeado do MySQL, o worker consulta o início do último ciclo
+# concluído na tabela scheduler_execucao e só executa se ele começou há pelo
+# menos um intervalo (menos uma folga para o atraso do disparo); os demais
+# pulam o tick. Um ciclo que falha não é registrado e o próximo tick o refaz.
+EXPIRACAO_LOCK_NAME = "ibdn_expiracao_selos"
+EXPIRACAO_FOLGA = min(5.0, EXPIRACAO_INTERVALO * 0.1)
+
+_scheduler: Optional[BackgroundScheduler] = None
+_ultimo_ciclo: Dict[str, Any] = {}
+
+
+def executar_ciclo_expiracao() -> Optional[Dict[str, list]]:
+    inicio = datetime.now()
+    try:
+        resultado = repo_processar_expiracao_selos(
+            EXPIRACAO_LOCK_NAME, ALERTA_DIAS_PADRAO, ALERTA_JANELA_MAXIMA, EXPIRACAO_LOTE,
+            intervalo_minimo=EXPIRACAO_INTERVALO - EXPIRACAO_FOLGA)
+    except Exception as e:
+        logger.error(f"Erro no ciclo de expiração de selos: {e}")
+        _ultimo_ciclo.update({"inicio": inicio, "erro": str(e)})
+        return None
+
+    if resultado is None:
+        logger.debug("Ciclo de expiração já executado ou em execução por outro processo; ignorando.")
+        return None
+
+    logger.info(
+        f"Ciclo de expiração concluído: {len(resultado['expirados'])} selo(s) expirado(s), "
+        f"{len(resultado['alertados'])} alerta(s) enviado(s).")
+    _ultimo_ciclo.clear()
+    _ultimo_ciclo.update({
+        "inicio": inicio,
+        "duracao_segundos": (datetime.now() - inicio).total_seconds(),
+        "expirados": len(resultado["expirados"]),
+        "alertados": len(resultado["alertados"]),
+    })
+    return resultado
+
+
+def start_scheduler() -> None:
+    global _scheduler
+    if not SCHEDULER_ENABLED or _scheduler is not None:
+        return
+    _scheduler = BackgroundScheduler()
+    _scheduler.add_job(
+        executar_ciclo_expiracao, "interval", seconds=EXPIRACAO_INTERVALO,
+        id="expiracao_selos", next_run_time=datetime.now(),
+        max_instances=1, coalesce=True)
+    _scheduler.start()
+    logger.info(f"Scheduler iniciado (expiração de selos a cada {EXPIRACAO_INTERVALO}s).")
+
+
+def shutdown_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+
+
+def get_scheduler_stats() -> Dict[str, Any]:
+    return {
+        "enabled": SCHEDULER_ENABLED,
+        "running": _scheduler is not None,
+        "interval_seconds": EXPIRACAO_INTERVALO,
+        "last_cycle": dict(_ultimo_ciclo),
+    }
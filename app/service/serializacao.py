@@ -0,0 +1,37 @@
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+# Cabeçalhos que pertencem ao corpo da resposta final, não ao `Response`
+# injetado na rota (que só carrega ETag, X-Next-Cursor etc.).
+_CABECALHOS_DO_CORPO = {"content-length", "content-type"}
+
+
+@lru_cache(maxsize=None)
+def adapter_lista(modelo: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[modelo])
+
+
+def validar_lista(modelo: Type[BaseModel], linhas: Iterable[Any]) -> List[BaseModel]:
+    # Uma única chamada ao validador (em Rust) para a lista inteira, em vez de
+    # construir um modelo por linha em Python.
+    return adapter_lista(modelo).validate_python(linhas)
+
+
+def resposta_lista(modelo: Type[BaseModel], itens: List[BaseModel],
+                   response: Optional[Response] = None, status_code: int = 200) -> Response:
+    """
+    Serializa direto para JSON itens já validados por `validar_lista`.
+
+    Devolver um `Response` faz o FastAPI pular a revalidação contra o
+    `response_model` da rota, que continua declarado só para o OpenAPI. Os
+    cabeçalhos definidos no `response` injetado são copiados, já que o FastAPI
+    não os mescla quando a rota devolve uma resposta pronta.
+    """
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k not in _CABECALHOS_DO_CORPO}
+    return Response(content=adapter_lista(modelo).dump_json(itens), status_code=status_code,
+                    media_type="application/json", headers=headers)
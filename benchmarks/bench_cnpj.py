@@ -0,0 +1,79 @@
+"""
+Benchmark de geração e validação de CNPJs (app/service/cnpj.py).
+
+Compara o cálculo antigo (laço por caractere, um CNPJ por chamada, e regex
+por valor no validador do modelo) com a API em lote vetorizada.
+
+    python -m benchmarks.bench_cnpj [quantidade] [repeticoes]
+"""
+import random
+import re
+import sys
+
+import numpy as np
+
+from app.service.cnpj import gerar_cnpjs, validar_cnpjs
+from benchmarks.bench_serializacao_json import cronometrar
+
+
+def gerar_cnpj_laco() -> str:
+    # Implementação anterior de seed_base.gerar_cnpj.
+    raiz = ''.join([str(random.randint(0, 9)) for _ in range(8)])
+    estabelecimento = ''.join([str(random.randint(0, 9)) for _ in range(4)])
+    cnpj_base = raiz + estabelecimento
+    pesos_1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    resto_1 = sum(int(c) * p for c, p in zip(cnpj_base[:12], pesos_1)) % 11
+    dv1 = 0 if resto_1 < 2 else 11 - resto_1
+    pesos_2 = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    resto_2 = sum(int(c) * p for c, p in zip(cnpj_base + str(dv1), pesos_2)) % 11
+    dv2 = 0 if resto_2 < 2 else 11 - resto_2
+    return f"{raiz[:2]}.{raiz[2:5]}.{raiz[5:8]}/{estabelecimento}-{dv1}{dv2}"
+
+
+def validar_laco(valor: str) -> bool:
+    digitos = re.sub(r'\D', '', valor)
+    if len(digitos) != 14 or len(set(digitos)) == 1:
+        return False
+    pesos = [6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
+    for posicao in (12, 13):
+        resto = sum(int(c) * p for c, p in zip(digitos[:posicao], pesos[13 - posicao:])) % 11
+        if int(digitos[posicao]) != (0 if resto < 2 else 11 - resto):
+            return False
+    return True
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    quantidade = int(argv[0]) if argv else 100_000
+    repeticoes = int(argv[1]) if len(argv) > 1 else 3
+
+    def unicos_laco():
+        vistos = set()
+        while len(vistos) < quantidade:
+            vistos.add(gerar_cnpj_laco())
+        return vistos
+
+    rng = np.random.default_rng(0)
+    cnpjs = gerar_cnpjs(quantidade, rng=rng)
+    invalidos = [c[:-1] + str((int(c[-1]) + 1) % 10) for c in cnpjs[: quantidade // 10]]
+    amostra = cnpjs + invalidos
+
+    print(f"{quantidade} CNPJs, média de {repeticoes} repetições (ms)\n")
+    print(f"{'etapa':<22}{'antes':>10}{'depois':>10}{'ganho':>8}")
+    for etapa, antes, depois in (
+        ("gerar únicos", unicos_laco, lambda: gerar_cnpjs(quantidade, rng=rng)),
+        ("validar", lambda: [validar_laco(c) for c in amostra], lambda: validar_cnpjs(amostra)),
+    ):
+        t_antes = cronometrar(antes, repeticoes)
+        t_depois = cronometrar(depois, repeticoes)
+        print(f"{etapa:<22}{t_antes:>10.1f}{t_depois:>10.1f}{t_antes / t_depois:>7.1f}x")
+
+    esperado = [validar_laco(c) for c in amostra]
+    iguais = esperado == validar_cnpjs(amostra).tolist()
+    distintos = len(set(cnpjs)) == quantidade
+    print(f"\nresultados de validação iguais: {iguais} | gerados distintos: {distintos}")
+    return 0 if iguais and distintos else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
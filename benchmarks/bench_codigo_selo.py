@@ -0,0 +1,55 @@
+"""
+Benchmark do gerador de códigos de selo (app/service/codigo_selo.py).
+
+Mede a vazão em uma thread e com várias threads concorrentes, e confere que
+todos os códigos são únicos e que a sequência de cada thread é crescente.
+
+    python -m benchmarks.bench_codigo_selo [quantidade] [threads]
+"""
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.service.codigo_selo import gerar_codigo_selo, novo_ulid
+
+
+def gerar_lote(quantidade: int):
+    return [gerar_codigo_selo("EPN", 1234) for _ in range(quantidade)]
+
+
+def medir(descricao: str, func, total: int):
+    inicio = time.perf_counter()
+    resultado = func()
+    duracao = time.perf_counter() - inicio
+    print(f"{descricao:<34} {total:>9} códigos em {duracao:6.3f}s "
+          f"({total / duracao:>12,.0f}/s)")
+    return resultado
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    quantidade = int(argv[0]) if argv else 200_000
+    threads = int(argv[1]) if len(argv) > 1 else 8
+
+    medir("ULID puro (1 thread)", lambda: [novo_ulid() for _ in range(quantidade)], quantidade)
+    sequencial = medir("codigo_selo (1 thread)", lambda: gerar_lote(quantidade), quantidade)
+
+    por_thread = quantidade // threads
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        lotes = medir(f"codigo_selo ({threads} threads)",
+                      lambda: list(executor.map(gerar_lote, [por_thread] * threads)),
+                      por_thread * threads)
+
+    todos = sequencial + [codigo for lote in lotes for codigo in lote]
+    duplicados = len(todos) - len(set(todos))
+    fora_de_ordem = sum(1 for lote in [sequencial] + lotes
+                        for a, b in zip(lote, lote[1:]) if a >= b)
+    maior = max(len(c) for c in todos)
+
+    print(f"duplicados: {duplicados} | fora de ordem: {fora_de_ordem} | "
+          f"maior código: {maior} caracteres")
+    return 0 if duplicados == 0 and fora_de_ordem == 0 and maior <= 50 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Benchmark do caminho de resposta das listas (app/service/serializacao.py).
+
+Compara, para 10k linhas por padrão:
+  - antes: um modelo pydantic por linha no controller e revalidação +
+    serialização pelo `response_model` da rota (ORJSONResponse);
+  - depois: `validar_lista` (uma validação da lista inteira) e
+    `resposta_lista` (dump_json direto, sem revalidar).
+
+    python -m benchmarks.bench_resposta_lista [linhas] [repeticoes]
+"""
+import sys
+from typing import List
+
+from fastapi import FastAPI, Response
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.service.serializacao import resposta_lista, validar_lista
+from benchmarks.bench_serializacao_json import CONJUNTOS, cronometrar, rota_lista
+
+
+def rota_validada_uma_vez(modelo, linhas):
+    def rota(response: Response):
+        return resposta_lista(modelo, validar_lista(modelo, linhas), response)
+    return rota
+
+
+def montar_app(dados) -> FastAPI:
+    app = FastAPI(default_response_class=ORJSONResponse)
+    for nome, modelo, _ in CONJUNTOS:
+        app.add_api_route(f"/antes/{nome}", rota_lista(modelo, dados[nome]), response_model=List[modelo])
+        app.add_api_route(f"/depois/{nome}", rota_validada_uma_vez(modelo, dados[nome]),
+                          response_model=List[modelo])
+    return app
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    linhas = int(argv[0]) if argv else 10_000
+    repeticoes = int(argv[1]) if len(argv) > 1 else 10
+
+    dados = {nome: gerar(linhas) for nome, _, gerar in CONJUNTOS}
+    cliente = TestClient(montar_app(dados))
+
+    print(f"{linhas} linhas, média de {repeticoes} repetições (ms)\n")
+    print(f"{'lista':<14}{'etapa':<14}{'antes':>10}{'depois':>10}{'ganho':>8}")
+    iguais = True
+    for nome, modelo, _ in CONJUNTOS:
+        linhas_db = dados[nome]
+        construir_antes = cronometrar(lambda: [modelo(**l) for l in linhas_db], repeticoes)
+        construir_depois = cronometrar(lambda: validar_lista(modelo, linhas_db), repeticoes)
+        print(f"{nome:<14}{'controller':<14}{construir_antes:>10.2f}{construir_depois:>10.2f}"
+              f"{construir_antes / construir_depois:>7.1f}x")
+
+        rota_antes = cronometrar(lambda: cliente.get(f"/antes/{nome}"), repeticoes)
+        rota_depois = cronometrar(lambda: cliente.get(f"/depois/{nome}"), repeticoes)
+        print(f"{'':<14}{'rota completa':<14}{rota_antes:>10.2f}{rota_depois:>10.2f}"
+              f"{rota_antes / rota_depois:>7.1f}x")
+
+        iguais &= cliente.get(f"/antes/{nome}").json() == cliente.get(f"/depois/{nome}").json()
+
+    print(f"\ncorpos equivalentes: {iguais}")
+    return 0 if iguais else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+"""
+Benchmark da serialização JSON das listas grandes da API.
+
+Compara a resposta padrão do FastAPI (JSONResponse: json.dumps da biblioteca
+padrão) com ORJSONResponse, que é a classe padrão da aplicação. Mede só a
+renderização do corpo e também o caminho completo de uma rota com
+`response_model` (validação + serialização + renderização), usando os
+modelos reais Empresa, SeloConcedido e Notificacao.
+
+    python -m benchmarks.bench_serializacao_json [linhas] [repeticoes]
+"""
+import sys
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, ORJSONResponse
+from fastapi.testclient import TestClient
+
+from app.models.empresas_model import Empresa
+from app.models.notificacao_model import Notificacao
+from app.models.selo_model import SeloConcedido
+
+
+def gerar_empresas(n: int) -> List[dict]:
+    base = datetime(2025, 1, 1, 8, 30)
+    return [{
+        "id": i, "cnpj": "12.345.678/0001-90", "razao_social": f"Empresa Exemplo {i} LTDA",
+        "nome_fantasia": f"Exemplo {i}", "usuario_id": f"{i:040d}", "telefone": "(11) 99999-0000",
+        "responsavel": "Maria da Silva", "cargo_responsavel": "Diretora", "site": f"https://exemplo{i}.com.br",
+        "data_cadastro": base + timedelta(minutes=i), "ativo": True,
+    } for i in range(1, n + 1)]
+
+
+def gerar_selos(n: int) -> List[dict]:
+    return [{
+        "id": i, "id_empresa": i % 500 + 1, "id_selo": i % 6 + 1, "status": "Ativo",
+        "data_emissao": date(2025, 1, 1) + timedelta(days=i % 365),
+        "data_expiracao": date(2026, 1, 1) + timedelta(days=i % 365),
+        "codigo_selo": f"EPN-2025-{i}-01JABCDEFGHJKMNPQRSTVWXYZ0", "nome_selo": "Empresa Parceira da Natureza",
+        "sigla_selo": "EPN", "razao_social_empresa": f"Empresa Exemplo {i} LTDA",
+    } for i in range(1, n + 1)]
+
+
+def gerar_notificacoes(n: int) -> List[dict]:
+    base = datetime(2025, 6, 1, 10, 0)
+    return [{
+        "id": i, "id_empresa": i % 500 + 1, "mensagem": f"Atenção! O selo EPN expira em {i % 60} dia(s).",
+        "tipo": "alerta_expiracao", "lida": bool(i % 2), "data_envio": base + timedelta(seconds=i),
+    } for i in range(1, n + 1)]
+
+
+CONJUNTOS = [
+    ("empresas", Empresa, gerar_empresas),
+    ("selos", SeloConcedido, gerar_selos),
+    ("notificacoes", Notificacao, gerar_notificacoes),
+]
+
+
+def cronometrar(func, repeticoes: int) -> float:
+    func()  # aquecimento
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        func()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def rota_lista(modelo, linhas):
+    # Closure em vez de argumentos com valor padrão: o FastAPI trataria esses
+    # argumentos como parâmetros de query (e copiaria a lista a cada chamada).
+    def rota():
+        return [modelo(**l) for l in linhas]
+    return rota
+
+
+def montar_app(response_class, dados) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    for nome, modelo, _ in CONJUNTOS:
+        app.add_api_route(f"/{nome}", rota_lista(modelo, dados[nome]), response_model=List[modelo])
+    return app
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    linhas = int(argv[0]) if argv else 10_000
+    repeticoes = int(argv[1]) if len(argv) > 1 else 10
+
+    dados = {nome: gerar(linhas) for nome, _, gerar in CONJUNTOS}
+    clientes = {
+        "json": TestClient(montar_app(JSONResponse, dados)),
+        "orjson": TestClient(montar_app(ORJSONResponse, dados)),
+    }
+
+    print(f"{linhas} linhas, média de {repeticoes} repetições (ms)\n")
+    print(f"{'lista':<14}{'etapa':<12}{'JSONResponse':>14}{'ORJSONResponse':>16}{'ganho':>8}")
+    for nome, modelo, _ in CONJUNTOS:
+        conteudo = [modelo(**l).model_dump(mode="json") for l in dados[nome]]
+        render_json = cronometrar(lambda: JSONResponse(conteudo), repeticoes)
+        render_orjson = cronometrar(lambda: ORJSONResponse(conteudo), repeticoes)
+        print(f"{nome:<14}{'render':<12}{render_json:>14.2f}{render_orjson:>16.2f}"
+              f"{render_json / render_orjson:>7.1f}x")
+
+        rota_json = cronometrar(lambda: clientes["json"].get(f"/{nome}"), repeticoes)
+        rota_orjson = cronometrar(lambda: clientes["orjson"].get(f"/{nome}"), repeticoes)
+        print(f"{'':<14}{'rota':<12}{rota_json:>14.2f}{rota_orjson:>16.2f}"
+              f"{rota_json / rota_orjson:>7.1f}x")
+
+    iguais = all(
+        clientes["json"].get(f"/{nome}").json() == clientes["orjson"].get(f"/{nome}").json()
+        for nome, _, _ in CONJUNTOS)
+    print(f"\ncorpos equivalentes: {iguais}")
+    return 0 if iguais else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
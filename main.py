@@ -9,25 +9,37 @@ from app.routers import (
     ibdn_profiles_routes,
     ibdn_permissions_routes,
     routes_selo,             
-    routes_selo_catalogo 
+    routes_selo_catalogo,
+    routes_exportacao,
+    routes_metricas
 )
+from app.controllers.controller_importacao_empresas import IMPORTACAO_MAX_BYTES
 from app.service.cors import add_cors
-from app.database.tables import create_database_if_not_exists, create_tables, create_initial_data
+from app.service.limite_corpo import add_limite_corpo
+from app.service.metricas import add_metricas
+from app.database.migrations import check_schema_version, migrate
+from app.database.config import close_pool
+from app.database.async_config import close_async_pool
+from app.security.password import shutdown_password_hasher
+from app.service.scheduler import start_scheduler, shutdown_scheduler
+from app.service.notificacoes_hub import iniciar_broker_notificacoes, parar_broker_notificacoes
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
+import os
 
 load_dotenv()
 
 
 try:
     print("Iniciando a aplicação...")
-    print("Verificando e criando banco de dados, se necessário...")
-    create_database_if_not_exists()
-    print("Verificando e criando tabelas, se necessário...")
-    create_tables()
-    print("Verificando e populando dados iniciais, se necessário...")
-    create_initial_data()
+    if os.getenv("DB_AUTO_MIGRATE", "false").lower() == "true":
+        print("DB_AUTO_MIGRATE ativo: aplicando migrações pendentes...")
+        migrate()
+    else:
+        print("Verificando a versão do schema do banco de dados...")
+        check_schema_version()
     print("Inicialização do banco de dados concluída com sucesso.")
 except Exception as e:
     print(
@@ -36,9 +48,15 @@ except Exception as e:
 app = FastAPI(
     title="API IBDN",
     version="1.0.0",
-    description="API para o sistema de gestão de selos e empresas do IBDN."
+    description="API para o sistema de gestão de selos e empresas do IBDN.",
+    default_response_class=ORJSONResponse
 )
 
+# O último middleware registrado é o mais externo: o CORS envolve tudo (até o
+# 413 do limite de corpo leva Access-Control-Allow-Origin) e as métricas
+# também contam as requisições recusadas pelo limite.
+add_limite_corpo(app, {"/empresas/importacao": IMPORTACAO_MAX_BYTES})
+add_metricas(app)
 add_cors(app)
 
 print("Incluindo routers na aplicação...")
@@ -53,9 +71,26 @@ app.include_router(routes_endereco.router)
 app.include_router(routes_notificacao.router)
 app.include_router(routes_selo_catalogo.router) 
 app.include_router(routes_selo.router)
+app.include_router(routes_exportacao.router)
+app.include_router(routes_metricas.router)
 print("Routers incluídos com sucesso.")
 
 
+@app.on_event("startup")
+def start_background_jobs():
+    iniciar_broker_notificacoes()
+    start_scheduler()
+
+
+@app.on_event("shutdown")
+async def shutdown_db_pool():
+    shutdown_scheduler()
+    parar_broker_notificacoes()
+    close_pool()
+    await close_async_pool()
+    shutdown_password_hasher()
+
+
 @app.get("/", tags=["Root"])
 def read_root():
     return {"message": "Bem-vindo à API do IBDN!"}